@@ -3,14 +3,107 @@ AI Service for Ingredient Substitutions
 Flask microservice that provides AI-powered ingredient substitution suggestions
 Powered by OpenAI API
 """
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, has_request_context, Response, stream_with_context
 from flask_cors import CORS
-from openai_client import openai_client
+from openai_client import openai_client, RequestCancelled
+from rate_limiter import RateLimiter, RateLimitTimeout
+from prometheus_client import (generate_latest, CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+                               multiprocess)
+from llm_cache import LLMResponseCache
+from ingredient_normalizer import normalize_name, normalize_names
+from logging_config import PAYLOAD_LOGGER, configure_logging, new_request_id
 import json
+import logging
+import math
+import os
+import select
+import socket
+import time
+
+configure_logging()
+logger = logging.getLogger(__name__)
+payload_log = logging.getLogger(PAYLOAD_LOGGER)
+
+REQUESTS = Counter(
+    "ai_service_requests_total", "HTTP requests handled by the AI service", ["route", "method", "status"])
+REQUEST_LATENCY = Histogram(
+    "ai_service_request_duration_seconds", "Request duration until the response (or stream) is finished",
+    ["route"], buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120))
+REQUESTS_IN_FLIGHT = Gauge(
+    "ai_service_requests_in_flight", "Requests currently being handled", multiprocess_mode="livesum")
 
 app = Flask(__name__)
 CORS(app)  # Allow requests from Spring Boot backend
 
+
+@app.before_request
+def bind_request_id():
+    """Tag every log line of this request with the caller's X-Request-ID (or a new one)"""
+    request.environ['smartfridge.request_id'] = new_request_id(request.headers.get('X-Request-ID'))
+    request.environ['smartfridge.started'] = time.monotonic()
+    REQUESTS_IN_FLIGHT.inc()
+
+
+@app.after_request
+def echo_request_id(response):
+    response.headers['X-Request-ID'] = request.environ.get('smartfridge.request_id', '-')
+    request.environ['smartfridge.status'] = response.status_code
+    return response
+
+
+@app.teardown_request
+def record_request_metrics(error=None):
+    """Runs once the response is fully sent (for streams, after the last event)"""
+    started = request.environ.pop('smartfridge.started', None)
+    if started is None:
+        return
+    REQUESTS_IN_FLIGHT.dec()
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    status = 500 if error is not None else request.environ.get('smartfridge.status', 500)
+    REQUESTS.labels(route, request.method, str(status)).inc()
+    REQUEST_LATENCY.labels(route).observe(time.monotonic() - started)
+
+# Substitution answers are cached on disk, keyed on the normalized inputs
+substitution_cache = LLMResponseCache(
+    path=os.environ.get(
+        "AI_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_cache.sqlite3")
+    ),
+    ttl=float(os.environ.get("AI_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    max_entries=int(os.environ.get("AI_CACHE_MAX_ENTRIES", 10000))
+)
+
+
+def client_disconnected():
+    """
+    Whether the HTTP client of the current request has hung up
+
+    WSGI gives no disconnect callback, so peek at the raw socket (exposed by
+    gunicorn and the Werkzeug dev server): readable with no data means EOF.
+    """
+    if not has_request_context():
+        return False
+    sock = request.environ.get('gunicorn.socket') or request.environ.get('werkzeug.socket')
+    if sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b''
+    except ValueError:
+        # e.g. TLS sockets do not support MSG_PEEK; assume still connected
+        return False
+    except OSError:
+        return True
+
+
+def rate_limited_response(error, **body):
+    """429 with Retry-After for calls that could not get OpenAI capacity in time"""
+    logger.warning("%s", error)
+    response = jsonify({"error": str(error), **body})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+    return response
+
 @app.route('/ai/substitutions', methods=['POST'])
 def get_substitutions():
     """
@@ -37,38 +130,36 @@ def get_substitutions():
         ]
     }
     """
-    print("\n" + "="*60)
-    print("[AI SERVICE] Received substitution request")
-    print("="*60)
+    logger.info("Received substitution request")
     
     try:
         data = request.get_json()
-        print(f"[DEBUG] Request data: {data}")
+        payload_log.debug("Request data: %s", data)
         
         ingredient = data.get('ingredient', '')
         cuisine = data.get('cuisine', 'OTHER')
         recipe_ingredients = data.get('recipeIngredients', [])
         fridge_supplies = data.get('fridgeSupplies', [])
         
-        print(f"[DEBUG] Ingredient: {ingredient}")
-        print(f"[DEBUG] Cuisine: {cuisine}")
-        print(f"[DEBUG] Recipe ingredients: {recipe_ingredients}")
-        print(f"[DEBUG] Fridge supplies: {fridge_supplies}")
+        logger.debug("Ingredient: %s", ingredient)
+        logger.debug("Cuisine: %s", cuisine)
+        payload_log.debug("Recipe ingredients: %s", recipe_ingredients)
+        payload_log.debug("Fridge supplies: %s", fridge_supplies)
         
         if not ingredient:
-            print("[ERROR] Missing ingredient parameter")
+            logger.error("Missing ingredient parameter")
             return jsonify({"error": "Missing ingredient parameter"}), 400
         
         # Check if OpenAI is available
-        print("[DEBUG] Checking if OpenAI is available...")
+        logger.debug("Checking if OpenAI is available...")
         if not openai_client.is_available():
-            print("[ERROR] AI service (OpenAI) is not available")
+            logger.error("AI service (OpenAI) is not available")
             return jsonify({
                 "error": "AI service (OpenAI) is not available",
                 "substitutes": []
             }), 503
         
-        print("[DEBUG] OpenAI is available, generating substitutions...")
+        logger.debug("OpenAI is available, generating substitutions...")
         
         # Generate substitution suggestions using AI
         substitutes = generate_substitution_suggestions(
@@ -78,25 +169,48 @@ def get_substitutions():
             fridge_supplies
         )
         
-        print(f"[SUCCESS] Generated {len(substitutes)} substitution suggestions")
-        print(f"[DEBUG] Response: {substitutes}")
+        logger.info("Generated %s substitution suggestions", len(substitutes))
+        payload_log.debug("Response: %s", substitutes)
         
         return jsonify({"substitutes": substitutes})
         
+    except RateLimitTimeout as e:
+        return rate_limited_response(e, substitutes=[])
     except Exception as e:
-        print(f"[ERROR] Failed to generate substitutions: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to generate substitutions: %s", e)
         return jsonify({
             "error": str(e),
             "substitutes": []
         }), 500
 
 
+def _normalize_names(names):
+    """Lowercase, de-duplicate and sort ingredient names for cache keys"""
+    return sorted(normalize_names(names))
+
+
+def _substitution_cache_key(ingredient, cuisine, recipe_ingredients, fridge_supplies):
+    """Cache key shared by the single and batch substitution paths"""
+    return LLMResponseCache.make_key(
+        "substitution",
+        openai_client.chat_model,
+        ingredient=normalize_name(ingredient),
+        cuisine=str(cuisine or 'OTHER').strip().upper(),
+        recipe_ingredients=_normalize_names(recipe_ingredients),
+        fridge_supplies=_normalize_names(fridge_supplies)
+    )
+
+
 def generate_substitution_suggestions(ingredient, cuisine, recipe_ingredients, fridge_supplies):
     """
     Use OpenAI to generate ingredient substitution suggestions
     """
+    cache_key = _substitution_cache_key(ingredient, cuisine, recipe_ingredients, fridge_supplies)
+    cached = substitution_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Cache hit for '%s' substitutions", ingredient)
+        return cached
+    
     # Build context-aware prompt - STRICT: ONLY suggest items from fridge
     fridge_list = ', '.join(fridge_supplies[:20]) if fridge_supplies else 'EMPTY FRIDGE'
     
@@ -134,91 +248,290 @@ RULES:
 
 Return ONLY valid JSON, no markdown."""
 
-    print(f"[DEBUG] Requesting substitutions for '{ingredient}' from OpenAI...")
-    print(f"[DEBUG] Fridge has {len(fridge_supplies)} items: {fridge_supplies}")
+    logger.debug("Requesting substitutions for '%s' from OpenAI...", ingredient)
+    payload_log.debug("Fridge has %s items: %s", len(fridge_supplies), fridge_supplies)
     
     try:
-        response = openai_client.generate(prompt, format_json=True)
+        response = openai_client.generate_async(prompt, format_json=True, should_cancel=client_disconnected,
+                                                priority=RateLimiter.INTERACTIVE)
         
-        print(f"[DEBUG] OpenAI raw response: {response}")
+        payload_log.debug("OpenAI raw response: %s", response)
         
         if not response:
-            print(f"[ERROR] OpenAI returned empty response")
+            logger.error("OpenAI returned empty response")
             return []
         
         # Parse JSON response
         try:
             parsed = json.loads(response)
-            print(f"[DEBUG] Parsed JSON: {parsed}")
+            payload_log.debug("Parsed JSON: %s", parsed)
             
             substitutes = parsed.get('substitutes', [])
-            print(f"[DEBUG] Found {len(substitutes)} substitutes in response")
-            
-            # Validate and clean each substitute
-            cleaned_substitutes = []
-            for idx, sub in enumerate(substitutes):
-                print(f"[DEBUG] Processing substitute {idx + 1}: {sub}")
-                
-                if not isinstance(sub, dict):
-                    print(f"[WARNING] Substitute {idx + 1} is not a dict, skipping")
-                    continue
-                
-                ingredient_name = sub.get('ingredient', '').strip()
-                if not ingredient_name:
-                    print(f"[WARNING] Substitute {idx + 1} has no ingredient name, skipping")
-                    continue
-                
-                print(f"[DEBUG] Ingredient name: '{ingredient_name}'")
-                
-                # Validate confidence
-                confidence = sub.get('confidence', 0.5)
-                if isinstance(confidence, str):
-                    try:
-                        confidence = float(confidence)
-                    except:
-                        confidence = 0.5
-                confidence = max(0.0, min(1.0, confidence))  # Clamp to [0, 1]
-                
-                # Check if actually in fridge (case-insensitive)
-                fridge_lower = [item.lower() for item in fridge_supplies]
-                in_fridge = ingredient_name.lower() in fridge_lower
-                
-                print(f"[DEBUG] Is '{ingredient_name}' in fridge? {in_fridge}")
-                
-                # STRICT FILTER: Only include if it's actually in the fridge
-                if not in_fridge:
-                    print(f"[WARNING] '{ingredient_name}' is NOT in fridge, skipping!")
-                    continue
-                
-                reasoning = sub.get('reasoning', 'Suitable alternative')[:200]  # Limit length
-                
-                cleaned_substitutes.append({
-                    "ingredient": ingredient_name,
-                    "inFridge": True,  # Always true now since we filtered
-                    "confidence": round(confidence, 2),
-                    "reasoning": reasoning
-                })
-                
-                print(f"[SUCCESS] Added substitute: {ingredient_name} (confidence: {confidence})")
+            logger.debug("Found %s substitutes in response", len(substitutes))
             
-            # Sort by confidence (highest first)
-            cleaned_substitutes.sort(key=lambda x: x['confidence'], reverse=True)
-            
-            print(f"[SUCCESS] Returning {len(cleaned_substitutes)} substitution suggestions")
-            return cleaned_substitutes[:3]  # Return top 3 from fridge only
+            cleaned = clean_substitutes(substitutes, fridge_supplies)
+            # Only well-formed answers are cached; failures are retried next time
+            substitution_cache.set(cache_key, cleaned)
+            return cleaned
             
         except json.JSONDecodeError as e:
-            print(f"[ERROR] Failed to parse JSON: {e}")
-            print(f"[DEBUG] Raw response: {response[:500]}")
+            logger.error("Failed to parse JSON: %s", e)
+            payload_log.debug("Raw response: %s", response[:500])
             return []
             
+    except RequestCancelled:
+        logger.debug("Client disconnected, cancelled substitution request for '%s'", ingredient)
+        return []
+    except RateLimitTimeout:
+        raise
     except Exception as e:
-        print(f"[ERROR] OpenAI request failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("OpenAI request failed: %s", e)
         return []
 
 
+@app.route('/ai/substitutions/batch', methods=['POST'])
+def get_batch_substitutions():
+    """
+    Generate substitution suggestions for ALL missing ingredients of a recipe
+    with a single completion
+    
+    Request JSON:
+    {
+        "recipeName": "spaghetti carbonara",
+        "cuisine": "ITALIAN",
+        "missingIngredients": ["pancetta", "parmesan"],
+        "recipeIngredients": ["spaghetti", "pancetta", "eggs", "parmesan"],
+        "fridgeSupplies": ["spaghetti", "eggs", "bacon", "cheddar"]
+    }
+    
+    Response JSON:
+    {
+        "substitutions": {
+            "pancetta": [{"ingredient": "bacon", "inFridge": true, ...}],
+            "parmesan": [...]
+        }
+    }
+    """
+    logger.info("Received batch substitution request")
+    
+    try:
+        data = request.get_json()
+        payload_log.debug("Request data: %s", data)
+        
+        recipe_name = data.get('recipeName', '')
+        cuisine = data.get('cuisine', 'OTHER')
+        missing_ingredients = [i for i in data.get('missingIngredients', []) if i]
+        recipe_ingredients = data.get('recipeIngredients', [])
+        fridge_supplies = data.get('fridgeSupplies', [])
+        
+        if not missing_ingredients:
+            logger.error("Missing missingIngredients parameter")
+            return jsonify({"error": "Missing missingIngredients parameter"}), 400
+        
+        if not openai_client.is_available():
+            logger.error("AI service (OpenAI) is not available")
+            return jsonify({
+                "error": "AI service (OpenAI) is not available",
+                "substitutions": {}
+            }), 503
+        
+        substitutions = generate_batch_substitution_suggestions(
+            recipe_name,
+            missing_ingredients,
+            cuisine,
+            recipe_ingredients,
+            fridge_supplies
+        )
+        
+        logger.info("Generated substitutions for %s ingredients", len(substitutions))
+        return jsonify({"substitutions": substitutions})
+        
+    except RateLimitTimeout as e:
+        return rate_limited_response(e, substitutions={})
+    except Exception as e:
+        logger.exception("Failed to generate batch substitutions: %s", e)
+        return jsonify({
+            "error": str(e),
+            "substitutions": {}
+        }), 500
+
+
+def generate_batch_substitution_suggestions(recipe_name, missing_ingredients, cuisine,
+                                            recipe_ingredients, fridge_supplies):
+    """
+    Use one OpenAI completion to suggest substitutes for every missing ingredient.
+    Each ingredient's suggestions go through the same fridge-only validation
+    as the single-ingredient endpoint, and share its cache: only ingredients
+    without a cached answer are sent to the model.
+    """
+    # Every requested ingredient gets a key, even if the model skips it
+    results = {ing: [] for ing in missing_ingredients}
+    
+    cache_keys = {}
+    uncached = []
+    for ing in missing_ingredients:
+        cache_keys[ing] = _substitution_cache_key(ing, cuisine, recipe_ingredients, fridge_supplies)
+        cached = substitution_cache.get(cache_keys[ing])
+        if cached is None:
+            uncached.append(ing)
+        else:
+            results[ing] = cached
+    
+    if not uncached:
+        logger.debug("All %s batch substitutions served from cache", len(results))
+        return results
+    
+    fridge_list = ', '.join(fridge_supplies[:20]) if fridge_supplies else 'EMPTY FRIDGE'
+    missing_list = '\n'.join(f'- "{ing}"' for ing in uncached)
+    
+    prompt = f"""You are a professional chef. A user wants to cook the {cuisine} recipe "{recipe_name}" but is missing several ingredients.
+
+CRITICAL RULE: You can ONLY suggest substitutes from the user's fridge. Do NOT suggest items not listed below!
+
+User's Fridge (ONLY suggest from these):
+{fridge_list}
+
+Recipe Context:
+- Cuisine: {cuisine}
+- Other ingredients: {', '.join(recipe_ingredients[:10])}
+
+Missing ingredients:
+{missing_list}
+
+Task: For EACH missing ingredient, find 1-3 items from the fridge above that can substitute for it.
+
+Return ONLY valid JSON in this exact format, with one key per missing ingredient (spelled exactly as above):
+{{
+  "substitutions": {{
+    "<missing ingredient>": [
+      {{
+        "ingredient": "exact name from fridge list",
+        "inFridge": true,
+        "confidence": 0.0 to 1.0,
+        "reasoning": "why this fridge item works"
+      }}
+    ]
+  }}
+}}
+
+RULES:
+- ONLY use ingredients from the fridge list above
+- If no good substitutes exist in fridge for an ingredient, use an empty array []
+- Confidence: 1.0 = perfect, 0.7 = good, 0.5 = acceptable
+- Keep reasoning under 40 words
+- Return 1-3 substitutes max per ingredient
+
+Return ONLY valid JSON, no markdown."""
+
+    logger.debug("Requesting batch substitutions for %s from OpenAI (%s cached)...",
+                 uncached, len(missing_ingredients) - len(uncached))
+    
+    try:
+        response = openai_client.generate_async(prompt, format_json=True, should_cancel=client_disconnected,
+                                                priority=RateLimiter.INTERACTIVE)
+        
+        payload_log.debug("OpenAI raw response: %s", response)
+        
+        if not response:
+            logger.error("OpenAI returned empty response")
+            return results
+        
+        try:
+            parsed = json.loads(response)
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse JSON: %s", e)
+            payload_log.debug("Raw response: %s", response[:500])
+            return results
+        
+        raw_substitutions = parsed.get('substitutions', {})
+        if not isinstance(raw_substitutions, dict):
+            logger.warning("substitutions is not an object, ignoring")
+            return results
+        
+        # Match the model's keys back to the requested names case-insensitively
+        raw_by_lower = {normalize_name(key): value for key, value in raw_substitutions.items()}
+        for ing in uncached:
+            logger.debug("Validating substitutes for '%s'", ing)
+            results[ing] = clean_substitutes(raw_by_lower.get(normalize_name(ing), []), fridge_supplies)
+            substitution_cache.set(cache_keys[ing], results[ing])
+        
+        return results
+        
+    except RequestCancelled:
+        logger.debug("Client disconnected, cancelled batch substitution request")
+        return results
+    except RateLimitTimeout:
+        raise
+    except Exception as e:
+        logger.exception("OpenAI request failed: %s", e)
+        return results
+
+
+def clean_substitutes(substitutes, fridge_supplies):
+    """
+    Validate raw substitutes from the model: keep only fridge items, clamp
+    confidence, sort by confidence and return the top 3
+    """
+    if not isinstance(substitutes, list):
+        logger.warning("Substitutes is not a list, ignoring")
+        return []
+
+    # Case-insensitive fridge lookup
+    fridge_lower = set(normalize_names(fridge_supplies))
+
+    # Validate and clean each substitute
+    cleaned_substitutes = []
+    for idx, sub in enumerate(substitutes):
+        payload_log.debug("Processing substitute %s: %s", idx + 1, sub)
+
+        if not isinstance(sub, dict):
+            logger.warning("Substitute %s is not a dict, skipping", idx + 1)
+            continue
+
+        ingredient_name = str(sub.get('ingredient', '')).strip()
+        if not ingredient_name:
+            logger.warning("Substitute %s has no ingredient name, skipping", idx + 1)
+            continue
+
+        logger.debug("Ingredient name: '%s'", ingredient_name)
+
+        # Validate confidence
+        confidence = sub.get('confidence', 0.5)
+        if isinstance(confidence, str):
+            try:
+                confidence = float(confidence)
+            except:
+                confidence = 0.5
+        confidence = max(0.0, min(1.0, confidence))  # Clamp to [0, 1]
+
+        # Check if actually in fridge (case-insensitive)
+        in_fridge = normalize_name(ingredient_name) in fridge_lower
+
+        logger.debug("Is '%s' in fridge? %s", ingredient_name, in_fridge)
+
+        # STRICT FILTER: Only include if it's actually in the fridge
+        if not in_fridge:
+            logger.debug("'%s' is NOT in fridge, skipping!", ingredient_name)
+            continue
+
+        reasoning = sub.get('reasoning', 'Suitable alternative')[:200]  # Limit length
+
+        cleaned_substitutes.append({
+            "ingredient": ingredient_name,
+            "inFridge": True,  # Always true now since we filtered
+            "confidence": round(confidence, 2),
+            "reasoning": reasoning
+        })
+
+        logger.debug("Added substitute: %s (confidence: %s)", ingredient_name, confidence)
+
+    # Sort by confidence (highest first)
+    cleaned_substitutes.sort(key=lambda x: x['confidence'], reverse=True)
+
+    logger.debug("Returning %s substitution suggestions", len(cleaned_substitutes))
+    return cleaned_substitutes[:3]  # Return top 3 from fridge only
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -226,10 +539,29 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "ai_available": ai_available,
+        "circuit": openai_client.breaker.state,
+        "cache": substitution_cache.stats(),
+        "queueDepth": openai_client.limiter.queue_depth(),
         "model": openai_client.chat_model
     })
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus metrics: requests per route, OpenAI latency/tokens/errors,
+    rate-limiter queue, cache lookups and recipe-parse paths
+
+    Under gunicorn with PROMETHEUS_MULTIPROC_DIR set, the numbers of all
+    worker processes are aggregated.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
+
 @app.route('/ai/parse-recipe', methods=['POST'])
 def parse_recipe():
     """
@@ -251,61 +583,147 @@ def parse_recipe():
         }
     }
     """
-    print("\n" + "="*60)
-    print("[AI SERVICE] Received recipe parsing request")
-    print("="*60)
+    logger.info("Received recipe parsing request")
     
     try:
         data = request.get_json()
         recipe_text = data.get('recipeText', '')
         
-        print(f"[DEBUG] Recipe text length: {len(recipe_text)} characters")
+        logger.debug("Recipe text length: %s characters", len(recipe_text))
         
         if not recipe_text or not recipe_text.strip():
-            print("[ERROR] Missing recipe text")
+            logger.error("Missing recipe text")
             return jsonify({
                 "success": False,
                 "error": "Recipe text is required"
             }), 400
         
+        # Well-structured recipes never need the model
+        parsed_recipe = openai_client.parse_recipe_locally(recipe_text)
+        if parsed_recipe:
+            logger.info("Parsed recipe locally: %s", parsed_recipe.get('name', 'Unknown'))
+            return jsonify({
+                "success": True,
+                "recipe": parsed_recipe
+            })
+        
         # Check if OpenAI is available
-        print("[DEBUG] Checking if OpenAI is available...")
+        logger.debug("Checking if OpenAI is available...")
         if not openai_client.is_available():
-            print("[ERROR] OpenAI is not available")
+            logger.error("OpenAI is not available")
             return jsonify({
                 "success": False,
                 "error": "AI service (OpenAI) is not available"
             }), 503
         
-        print("[DEBUG] OpenAI is available, parsing recipe...")
+        logger.debug("OpenAI is available, parsing recipe...")
         
         # Parse recipe using OpenAI
-        parsed_recipe = openai_client.parse_recipe(recipe_text)
+        try:
+            parsed_recipe = openai_client.run_async(
+                openai_client.aparse_recipe(recipe_text, try_local=False),
+                should_cancel=client_disconnected
+            )
+        except RequestCancelled:
+            logger.debug("Client disconnected, cancelled recipe parsing")
+            return jsonify({"success": False, "error": "Client disconnected"}), 499
         
         if parsed_recipe:
-            print(f"[SUCCESS] Successfully parsed recipe: {parsed_recipe.get('name', 'Unknown')}")
-            print(f"[DEBUG] Ingredients count: {len(parsed_recipe.get('ingredients', []))}")
+            logger.info("Successfully parsed recipe: %s", parsed_recipe.get('name', 'Unknown'))
+            logger.debug("Ingredients count: %s", len(parsed_recipe.get('ingredients', [])))
             return jsonify({
                 "success": True,
                 "recipe": parsed_recipe
             })
         else:
-            print("[ERROR] Failed to parse recipe")
+            logger.error("Failed to parse recipe")
             return jsonify({
                 "success": False,
                 "error": "Failed to parse recipe. Please check the format."
             }), 400
         
+    except RateLimitTimeout as e:
+        return rate_limited_response(e, success=False)
     except Exception as e:
-        print(f"[ERROR] Exception while parsing recipe: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Exception while parsing recipe: %s", e)
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
 
+@app.route('/ai/parse-recipe/stream', methods=['POST'])
+def parse_recipe_stream():
+    """
+    Streaming variant of /ai/parse-recipe (server-sent events)
+    
+    Request JSON: same as /ai/parse-recipe
+    
+    Events, each as "event: <type>" + "data: <json>":
+        name         "Pancakes"
+        cuisine      "AMERICAN"
+        ingredient   {"name": "milk", "quantity": "1", "isSeasoning": false}  (one per ingredient)
+        instruction  "Mix the batter"                                          (one per step)
+        done         {"success": true, "recipe": {...}}  - final, fully processed recipe
+        error        {"success": false, "error": "...", "retryAfter": 12}
+    """
+    logger.info("Received streaming recipe parsing request")
+    
+    data = request.get_json(silent=True) or {}
+    recipe_text = data.get('recipeText', '')
+    
+    if not recipe_text or not recipe_text.strip():
+        logger.error("Missing recipe text")
+        return jsonify({
+            "success": False,
+            "error": "Recipe text is required"
+        }), 400
+    
+    local_recipe = openai_client.parse_recipe_locally(recipe_text)
+    if local_recipe is None and not openai_client.is_available():
+        logger.error("OpenAI is not available")
+        return jsonify({
+            "success": False,
+            "error": "AI service (OpenAI) is not available"
+        }), 503
+    
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    def generate():
+        # Closing this generator (client gone) cancels the OpenAI stream
+        try:
+            if local_recipe is not None:
+                events = openai_client.recipe_events(local_recipe)
+            else:
+                events = openai_client.parse_recipe_stream(recipe_text, should_cancel=client_disconnected,
+                                                           try_local=False)
+            for event, value in events:
+                if event != "done":
+                    yield sse(event, value)
+                elif value:
+                    logger.info("Streamed recipe: %s", value.get('name', 'Unknown'))
+                    yield sse("done", {"success": True, "recipe": value})
+                else:
+                    logger.error("Failed to parse streamed recipe")
+                    yield sse("error", {"success": False,
+                                        "error": "Failed to parse recipe. Please check the format."})
+        except RequestCancelled:
+            logger.debug("Client disconnected, cancelled recipe streaming")
+        except RateLimitTimeout as e:
+            logger.warning("%s", e)
+            yield sse("error", {"success": False, "error": str(e), "retryAfter": math.ceil(e.retry_after)})
+        except Exception as e:
+            logger.exception("Exception while streaming recipe: %s", e)
+            yield sse("error", {"success": False, "error": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("Starting AI Substitution Service on http://localhost:5001")
@@ -316,8 +734,13 @@ if __name__ == '__main__':
     print()
     print("Available endpoints:")
     print("  POST /ai/substitutions - Get ingredient substitutions")
+    print("  POST /ai/substitutions/batch - Get substitutions for all missing ingredients")
     print("  POST /ai/parse-recipe - Parse recipe text")
+    print("  POST /ai/parse-recipe/stream - Parse recipe text (server-sent events)")
     print("  GET  /health - Health check")
+    print("  GET  /metrics - Prometheus metrics")
     print()
     
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    debug = os.environ.get("AI_SERVICE_DEBUG", "false").lower() in ("1", "true", "yes")
+    app.run(host='0.0.0.0', port=5001, debug=debug, threaded=True)
@@ -1,14 +1,77 @@
 """API client functions for SmartFridge backend"""
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import requests
-import time
-from config import API_URL
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from config import API_URL, AI_SERVICE_URL, RECIPE_CACHE_TTL, RECIPE_CACHE_MAXSIZE, FRIDGE_COUNT_DEBOUNCE_SECONDS, PAGE_LOAD_WORKERS
+from http_client import http_client, REQUEST_ERRORS
+from cache import TTLCache
+from cookability import cookability_engine
+from write_behind import CountUpdateQueue
+from timing import timed
+
+logger = logging.getLogger(__name__)
+
+# Recipes and cuisines change rarely, so one cache is shared by every session.
+# Cached values are shared objects - treat them as read-only.
+recipe_cache = TTLCache(maxsize=RECIPE_CACHE_MAXSIZE, ttl=RECIPE_CACHE_TTL)
+
+# Bounded pool shared by every session; sized well below HTTP_POOL_MAXSIZE so
+# concurrent page loads never queue for a backend connection
+page_loader = ThreadPoolExecutor(max_workers=PAGE_LOAD_WORKERS, thread_name_prefix="page-load")
 
 
+def _run_in_script_context(script_ctx, loader):
+    """Run a loader on a pool thread as if it were the script thread
+
+    Attaching the ScriptRunContext lets loaders read and write st.session_state
+    and show st.error; pool threads are reused, so it is attached per call.
+    """
+    add_script_run_ctx(threading.current_thread(), script_ctx)
+    return loader()
+
+
+@timed
+def load_page_data(loaders):
+    """Run a page's data loaders concurrently and wait for all of them
+
+    Args:
+        loaders: Dict of key -> zero-argument callable (use functools.partial
+                 or a lambda for arguments)
+
+    Returns:
+        Dict of key -> loader result, so a page costs its slowest call rather
+        than the sum of them. A loader's exception is re-raised here.
+    """
+    if len(loaders) <= 1:
+        return {key: loader() for key, loader in loaders.items()}
+
+    script_ctx = get_script_run_ctx(suppress_warning=True)
+    # Each task runs in its own copy of our context so the developer timeline
+    # (and anything else kept in contextvars) follows the call to the pool
+    futures = {
+        key: page_loader.submit(contextvars.copy_context().run, _run_in_script_context, script_ctx, loader)
+        for key, loader in loaders.items()
+    }
+    return {key: future.result() for key, future in futures.items()}
+
+
+@timed
 def fetch_fridge():
-    """Fetch current fridge contents from backend"""
+    """Fetch current fridge contents from backend
+
+    Sends the last seen ETag so an unchanged fridge costs a 304 with no body.
+    """
+    headers = {}
+    if st.session_state.get('fridge_etag'):
+        headers['If-None-Match'] = st.session_state.fridge_etag
     try:
-        response = requests.get(f"{API_URL}/fridge")
+        response = http_client.get(f"{API_URL}/fridge", headers=headers)
+        if response.status_code == 304:
+            return
         if response.status_code == 200:
             data = response.json()
             supplies_list = data.get('supplies', [])
@@ -17,103 +80,229 @@ def fetch_fridge():
                 for item in supplies_list
             }
             st.session_state.fridge_order = [item['name'] for item in supplies_list]
-    except requests.exceptions.ConnectionError:
+            cookability_engine.set_fridge(st.session_state.fridge_items)
+            st.session_state.fridge_etag = response.headers.get('ETag')
+            # Queued edits haven't reached the backend yet - keep showing them
+            for item, count in count_updates.pending().items():
+                if item in st.session_state.fridge_items:
+                    st.session_state.fridge_items[item] = count
+    except REQUEST_ERRORS:
         st.error(f"⚠️ Could not connect to backend at {API_URL}. Make sure the Spring Boot server is running.")
 
 
+def _adopt_fridge_etag(response):
+    """Advance our fridge ETag after a local mutation was applied optimistically
+
+    Only valid when the mutation was the sole change since the state we hold;
+    otherwise drop the ETag so the next fetch_fridge() reloads in full.
+    """
+    try:
+        data = response.json()
+    except ValueError:
+        data = {}
+    previous = data.get('previousEtag')
+    if previous and previous == st.session_state.get('fridge_etag'):
+        st.session_state.fridge_etag = data.get('etag')
+    else:
+        st.session_state.fridge_etag = None
+
+
+@timed
 def update_fridge_order(ordered_items):
     """Sync new order to backend"""
     try:
-        response = requests.put(f"{API_URL}/fridge/order", json={"items": ordered_items})
+        response = http_client.put(f"{API_URL}/fridge/order", json={"items": ordered_items})
         if response.status_code == 200:
             st.session_state.fridge_order = ordered_items
+            _adopt_fridge_etag(response)
             return True
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return False
 
 
+@timed
 def add_to_fridge(item, count=1):
-    """Add item to fridge with count"""
+    """Add item to fridge with count (optimistic local update)"""
+    fridge_items = st.session_state.fridge_items
+    existed = item in fridge_items
+    previous_count = fridge_items.get(item, 0)
+
+    fridge_items[item] = previous_count + count
+    # The engine is shared by every session: only undo what this call changed
+    engine_added = False
+    if not existed:
+        st.session_state.fridge_order.append(item)
+        engine_added = cookability_engine.add_item(item)
+
     try:
-        response = requests.post(f"{API_URL}/fridge/{item}", params={"count": count})
+        response = http_client.post(f"{API_URL}/fridge/{item}", params={"count": count})
         if response.status_code == 200:
-            fetch_fridge()
-            if item in st.session_state.fridge_items:
-                return "exists" if st.session_state.fridge_items[item] > count else "added"
-            return "added"
-    except requests.exceptions.ConnectionError:
+            _adopt_fridge_etag(response)
+            return "exists" if existed else "added"
+    except REQUEST_ERRORS:
         st.error("⚠️ Could not connect to backend.")
+
+    # Roll back the optimistic update
+    if existed:
+        fridge_items[item] = previous_count
+    else:
+        fridge_items.pop(item, None)
+        if item in st.session_state.fridge_order:
+            st.session_state.fridge_order.remove(item)
+    if engine_added:
+        cookability_engine.remove_item(item)
     return False
 
 
+@timed
 def remove_from_fridge(item):
-    """Remove item from fridge"""
+    """Remove item from fridge (optimistic local update)"""
+    fridge_items = st.session_state.fridge_items
+    previous_count = fridge_items.pop(item, None)
+    count_updates.discard(item)
+    # The engine is shared by every session: only undo what this call changed
+    engine_removed = cookability_engine.remove_item(item)
+
     try:
-        response = requests.delete(f"{API_URL}/fridge/{item}")
+        response = http_client.delete(f"{API_URL}/fridge/{item}")
         if response.status_code == 200:
-            if item in st.session_state.fridge_items:
-                del st.session_state.fridge_items[item]
-            if item in st.session_state.pending_count_updates:
-                del st.session_state.pending_count_updates[item]
+            _adopt_fridge_etag(response)
             return True
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         st.error("⚠️ Could not connect to backend.")
+
+    # Roll back the optimistic update
+    if previous_count is not None:
+        fridge_items[item] = previous_count
+    if engine_removed:
+        cookability_engine.add_item(item)
     return False
 
 
+def _send_count_updates(counts):
+    """Flush callback for the write-behind queue: one bulk PUT for all counts"""
+    response = http_client.put(f"{API_URL}/fridge", json={"counts": counts})
+    if response.status_code != 200:
+        return {item: f"Backend returned HTTP {response.status_code}" for item in counts}
+    return response.json().get('failed', {})
+
+
+# Shared by all sessions: the fridge itself is global on the backend
+count_updates = CountUpdateQueue(_send_count_updates, delay=FRIDGE_COUNT_DEBOUNCE_SECONDS)
+
+
+@timed
 def update_item_count(item, new_count):
-    """Update item count in session state and sync to backend immediately"""
+    """Update item count in session state and queue it for a coalesced backend write"""
     if item in st.session_state.fridge_items:
         st.session_state.fridge_items[item] = new_count
-        try:
-            response = requests.put(f"{API_URL}/fridge/{item}", json={"count": new_count})
-            if response.status_code != 200:
-                st.error(f"Failed to update count for {item}")
-        except requests.exceptions.ConnectionError:
-            st.error("⚠️ Could not connect to backend.")
+        count_updates.enqueue(item, new_count)
 
 
+@timed
 def sync_pending_counts():
-    """Sync pending count updates to backend (debounced)"""
-    current_time = time.time()
-    items_to_sync = []
-    
-    for item, (count, timestamp) in list(st.session_state.pending_count_updates.items()):
-        if current_time - timestamp >= st.session_state.debounce_delay:
-            items_to_sync.append((item, count))
-    
-    for item, count in items_to_sync:
-        try:
-            response = requests.put(f"{API_URL}/fridge/{item}", json={"count": count})
-            if response.status_code == 200:
-                del st.session_state.pending_count_updates[item]
-        except requests.exceptions.ConnectionError:
-            pass
+    """Flush queued count updates whose debounce window has closed and report failures"""
+    count_updates.flush_due()
+    for item, error in count_updates.pop_failures().items():
+        st.warning(f"Failed to update count for {item}: {error}")
+
+
+def invalidate_recipe_cache(recipe_name=None):
+    """Drop cached recipe listings, plus the details of one recipe if given"""
+    recipe_cache.invalidate(("recipes_by_cuisine",))
+    recipe_cache.invalidate(("recipe_counts",))
+    recipe_cache.invalidate_prefix(("recipes_page",))
+    cookability_engine.invalidate()
+    if recipe_name is not None:
+        recipe_cache.invalidate(("details", recipe_name))
 
 
+@timed
 def fetch_recipes_by_cuisine():
     """Fetch all recipes grouped by cuisine"""
+    cached = recipe_cache.get(("recipes_by_cuisine",))
+    if cached is not None:
+        return cached
     try:
-        response = requests.get(f"{API_URL}/recipes")
+        response = http_client.get(f"{API_URL}/recipes")
         if response.status_code == 200:
-            return response.json()
-    except requests.exceptions.ConnectionError:
+            recipes = response.json()
+            recipe_cache.set(("recipes_by_cuisine",), recipes)
+            return recipes
+    except REQUEST_ERRORS:
+        pass
+    return {}
+
+
+@timed
+def fetch_recipe_counts():
+    """Fetch the number of recipes per cuisine (without the recipes themselves)"""
+    cached = recipe_cache.get(("recipe_counts",))
+    if cached is not None:
+        return cached
+    try:
+        response = http_client.get(f"{API_URL}/recipes/counts")
+        if response.status_code == 200:
+            counts = response.json()
+            recipe_cache.set(("recipe_counts",), counts)
+            return counts
+    except REQUEST_ERRORS:
         pass
     return {}
 
 
+@timed
+def fetch_recipes_page(cuisine=None, after=None, limit=50):
+    """Fetch one page of recipes ordered by name
+
+    Args:
+        cuisine: Only recipes of this cuisine type (None for all)
+        after: Cursor - the nextCursor of the previous page (None for the first)
+        limit: Page size (backend allows 1-200)
+
+    Returns:
+        (recipes, next_cursor); next_cursor is None on the last page
+    """
+    key = ("recipes_page", cuisine, after, limit)
+    cached = recipe_cache.get(key)
+    if cached is not None:
+        return cached
+    params = {"limit": limit}
+    if cuisine:
+        params["cuisine"] = cuisine
+    if after:
+        params["after"] = after
+    try:
+        response = http_client.get(f"{API_URL}/recipes/page", params=params)
+        if response.status_code == 200:
+            data = response.json()
+            page = (data.get('recipes', []), data.get('nextCursor'))
+            recipe_cache.set(key, page)
+            return page
+    except REQUEST_ERRORS:
+        pass
+    return [], None
+
+
+@timed
 def fetch_cuisines():
     """Fetch all cuisine types"""
+    cached = recipe_cache.get(("cuisines",))
+    if cached is not None:
+        return cached
     try:
-        response = requests.get(f"{API_URL}/cuisines")
+        response = http_client.get(f"{API_URL}/cuisines")
         if response.status_code == 200:
-            return response.json()
-    except requests.exceptions.ConnectionError:
+            cuisines = response.json()
+            recipe_cache.set(("cuisines",), cuisines)
+            return cuisines
+    except REQUEST_ERRORS:
         pass
     return []
 
 
+@timed
 def add_recipe(name, ingredients, cuisine_type, instructions, seasonings=None):
     """Add a new recipe"""
     try:
@@ -125,63 +314,198 @@ def add_recipe(name, ingredients, cuisine_type, instructions, seasonings=None):
         }
         if seasonings:
             data["seasonings"] = seasonings
-        response = requests.post(f"{API_URL}/recipes", json=data)
+        response = http_client.post(f"{API_URL}/recipes", json=data)
         if response.status_code == 200:
+            invalidate_recipe_cache(name)
             return True
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         st.error("⚠️ Could not connect to backend.")
     return False
 
 
+@timed
+def add_recipes_batch(recipes):
+    """
+    Save many recipes in one request (POST /recipes/batch, at most 100)
+
+    Each recipe is a dict with name, ingredients, seasonings, cuisineType and
+    instructions. Existing names are skipped by the backend.
+
+    Returns:
+        {"saved": [...], "skipped": [...], "failed": {name: error}}, or None
+        if the backend could not be reached or rejected the whole batch
+    """
+    try:
+        response = http_client.post(f"{API_URL}/recipes/batch", json={"recipes": recipes}, retry=False)
+        if response.status_code == 200:
+            result = response.json()
+            invalidate_recipe_cache()
+            for name in result.get("saved", []):
+                recipe_cache.invalidate(("details", name))
+            return result
+        logger.error("Batch save returned status %s: %s", response.status_code, response.text[:200])
+    except REQUEST_ERRORS as e:
+        logger.error("Could not connect to backend: %s", e)
+    return None
+
+
+@timed
+def parse_recipe_via_ai_service(recipe_text):
+    """
+    Parse recipe text with the Flask AI service (POST /ai/parse-recipe)
+
+    The AI service owns the OpenAI rate budget, cache and circuit breaker;
+    it queues these parses at bulk priority.
+
+    Returns:
+        The parsed recipe dict, or None if the service failed or is busy
+    """
+    try:
+        response = http_client.post(
+            f"{AI_SERVICE_URL}/ai/parse-recipe",
+            json={"recipeText": recipe_text},
+            timeout=180,  # 3 minutes for first run
+            retry=False
+        )
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("success"):
+                return data.get("recipe")
+            return None
+        try:
+            error = response.json().get("error", "Unknown error")
+        except ValueError:
+            error = response.text[:200]
+        logger.error("AI service returned status %s: %s", response.status_code, error)
+    except (*REQUEST_ERRORS, ValueError) as e:
+        logger.error("Failed to call AI service: %s", e)
+    return None
+
+
+@timed
 def delete_recipe(name):
     """Delete a recipe"""
     try:
-        response = requests.delete(f"{API_URL}/recipes/{name}")
+        response = http_client.delete(f"{API_URL}/recipes/{name}")
         if response.status_code == 200:
+            invalidate_recipe_cache(name)
             return True
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         st.error("⚠️ Could not connect to backend.")
     return False
 
 
-def generate_cookable_recipes():
-    """Generate list of cookable recipes from fridge contents"""
+@timed
+def fetch_cookability_snapshot():
+    """Fetch the recipe graph and alias table the local cookability engine is built from"""
+    try:
+        response = http_client.get(f"{API_URL}/cookability/snapshot")
+        if response.status_code == 200:
+            return response.json()
+    except REQUEST_ERRORS:
+        pass
+    return None
+
+
+@timed
+def ensure_cookability_engine(refresh=False):
+    """(Re)build the shared cookability engine if its snapshot is stale
+
+    Returns:
+        True if the engine is loaded and can answer without the backend
+    """
+    if refresh or cookability_engine.stale:
+        snapshot = fetch_cookability_snapshot()
+        if snapshot is not None:
+            cookability_engine.load(snapshot.get('recipes', {}), snapshot.get('aliases', {}))
+    return cookability_engine.loaded
+
+
+@timed
+def generate_cookable_recipes(refresh=False):
+    """Generate list of cookable recipes from fridge contents
+
+    Answered by the local cookability engine; GET /generate is the fallback
+    when its snapshot can't be loaded.
+    """
+    if ensure_cookability_engine(refresh=refresh):
+        st.session_state.cookable_recipes = cookability_engine.cookable()
+        return True
     try:
-        response = requests.get(f"{API_URL}/generate")
+        response = http_client.get(f"{API_URL}/generate")
         if response.status_code == 200:
             data = response.json()
             st.session_state.cookable_recipes = data.get('made', [])
             return True
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         st.error("⚠️ Could not connect to backend.")
     return False
 
 
+@timed
 def fetch_recipe_details(recipe_name):
     """Fetch detailed recipe information"""
+    cached = recipe_cache.get(("details", recipe_name))
+    if cached is not None:
+        return cached
     try:
-        response = requests.get(f"{API_URL}/recipes/{recipe_name}")
+        response = http_client.get(f"{API_URL}/recipes/{recipe_name}")
         if response.status_code == 200:
-            return response.json()
-    except requests.exceptions.ConnectionError:
+            details = response.json()
+            recipe_cache.set(("details", recipe_name), details)
+            return details
+    except REQUEST_ERRORS:
         pass
     return None
 
 
+@timed
+def fetch_recipe_details_many(recipe_names):
+    """Fetch detailed recipe information for several recipes in one round trip
+
+    Returns:
+        Dict of recipe name -> details; names the backend doesn't know are omitted
+    """
+    details = {}
+    missing = []
+    for name in dict.fromkeys(name for name in recipe_names if name):
+        cached = recipe_cache.get(("details", name))
+        if cached is not None:
+            details[name] = cached
+        else:
+            missing.append(name)
+
+    # Backend caps each batch at 200 names
+    for start in range(0, len(missing), 200):
+        chunk = missing[start:start + 200]
+        try:
+            response = http_client.post(f"{API_URL}/recipes/details", json={"names": chunk})
+            if response.status_code == 200:
+                fetched = response.json().get('recipes', {})
+                for name, recipe_details in fetched.items():
+                    recipe_cache.set(("details", name), recipe_details)
+                details.update(fetched)
+        except REQUEST_ERRORS:
+            pass
+    return details
+
+
 # ==================== Semantic Search Functions ====================
 
+@timed
 def search_recipes_semantic(query, limit=10):
     """Search recipes using semantic similarity"""
     try:
-        response = requests.get(f"{API_URL}/recipes/search", params={"query": query, "limit": limit})
+        response = http_client.get(f"{API_URL}/recipes/search", params={"query": query, "limit": limit})
         if response.status_code == 200:
             data = response.json()
             return data.get('results', []), data.get('warning')
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return [], "Could not connect to backend"
 
 
+@timed
 def hybrid_search_recipes(ingredients=None, query=None, limit=10, score_threshold=0.0):
     """Search recipes using hybrid (exact + semantic) matching
     
@@ -197,129 +521,142 @@ def hybrid_search_recipes(ingredients=None, query=None, limit=10, score_threshol
             data["ingredients"] = ingredients
         if query:
             data["query"] = query
-        response = requests.post(f"{API_URL}/recipes/hybrid-search", json=data)
+        response = http_client.post(f"{API_URL}/recipes/hybrid-search", json=data)
         if response.status_code == 200:
             result = response.json()
             return result.get('results', []), result.get('warning')
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return [], "Could not connect to backend"
 
 
+@timed
 def index_all_recipes():
     """Index all recipes for semantic search"""
     try:
-        response = requests.post(f"{API_URL}/search/index-all")
+        response = http_client.post(f"{API_URL}/search/index-all", timeout=300, retry=False)
         if response.status_code == 200:
             return response.json()
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return {"error": "Could not connect to backend"}
 
 
+@timed
 def get_search_stats():
     """Get vector search statistics"""
     try:
-        response = requests.get(f"{API_URL}/search/stats")
+        response = http_client.get(f"{API_URL}/search/stats")
         if response.status_code == 200:
             return response.json()
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return {"initialized": False, "error": "Could not connect to backend"}
 
 
 # ==================== Ingredient Alias Functions ====================
 
+@timed
 def get_ingredient_aliases(ingredient_name):
     """Get aliases for an ingredient"""
     try:
-        response = requests.get(f"{API_URL}/ingredients/{ingredient_name}/aliases")
+        response = http_client.get(f"{API_URL}/ingredients/{ingredient_name}/aliases")
         if response.status_code == 200:
             return response.json()
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return {"aliases": [], "canonical": ingredient_name}
 
 
+@timed
 def resolve_ingredient(ingredient_name):
     """Resolve an ingredient to its canonical form"""
     try:
-        response = requests.get(f"{API_URL}/ingredients/{ingredient_name}/resolve")
+        response = http_client.get(f"{API_URL}/ingredients/{ingredient_name}/resolve")
         if response.status_code == 200:
             return response.json()
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return {"original": ingredient_name, "canonical": ingredient_name, "resolved": False}
 
 
+@timed
 def generate_ingredient_aliases(ingredient_name):
     """Generate AI-powered aliases for an ingredient"""
     try:
-        response = requests.post(f"{API_URL}/ingredients/{ingredient_name}/generate-aliases")
+        response = http_client.post(f"{API_URL}/ingredients/{ingredient_name}/generate-aliases", timeout=60, retry=False)
         if response.status_code == 200:
+            cookability_engine.invalidate()
             return response.json()
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return {"generated": [], "count": 0}
 
 
+@timed
 def add_ingredient_alias(canonical, alias):
     """Add an alias for an ingredient"""
     try:
-        response = requests.post(f"{API_URL}/ingredients/{canonical}/aliases", json={"alias": alias})
+        response = http_client.post(f"{API_URL}/ingredients/{canonical}/aliases", json={"alias": alias})
         if response.status_code == 200:
+            cookability_engine.invalidate()
             return True
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return False
 
 
+@timed
 def seed_ingredient_aliases():
     """Seed common ingredient aliases"""
     try:
-        response = requests.post(f"{API_URL}/ingredients/seed-aliases")
+        response = http_client.post(f"{API_URL}/ingredients/seed-aliases")
         if response.status_code == 200:
+            cookability_engine.invalidate()
             return response.json()
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return {"error": "Could not connect to backend"}
 
 
 # ==================== Substitution Functions ====================
 
+@timed
 def get_missing_ingredients(recipe_name):
     """Get missing ingredients for a recipe"""
     try:
-        response = requests.get(f"{API_URL}/recipes/{recipe_name}/missing")
+        response = http_client.get(f"{API_URL}/recipes/{recipe_name}/missing")
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
             return None
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return None
 
 
+@timed
 def get_substitution_suggestions(recipe_name):
     """Get AI-powered substitution suggestions for missing ingredients"""
     try:
-        response = requests.get(f"{API_URL}/recipes/{recipe_name}/substitutions")
+        response = http_client.get(f"{API_URL}/recipes/{recipe_name}/substitutions", timeout=120, retry=False)
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
             return None
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return None
 
 
+@timed
 def get_almost_cookable_recipes(max_missing=2):
     """Get recipes that are almost cookable (missing only a few ingredients)"""
     try:
-        response = requests.get(f"{API_URL}/recipes/almost-cookable", params={"maxMissing": max_missing})
+        response = http_client.get(f"{API_URL}/recipes/almost-cookable", params={"maxMissing": max_missing})
         if response.status_code == 200:
             return response.json()
-    except requests.exceptions.ConnectionError:
+    except REQUEST_ERRORS:
         pass
     return {"recipes": {}, "count": 0, "maxMissing": max_missing}
 
@@ -8,9 +8,14 @@ import streamlit as st
 
 # Import modules
 from styles import apply_styles
-from api import fetch_fridge, sync_pending_counts
+from api import fetch_fridge, sync_pending_counts, load_page_data
+from http_client import http_client
+from logging_config import configure_logging
+from timing import start_timeline, stop_timeline, render_sidebar_waterfall, render_coalescing_stats
 from views import fridge, recipes, generate, recipe_parser
 
+configure_logging()  # once per process; later reruns are a no-op
+
 # Page config
 st.set_page_config(
     page_title="SmartFridge",
@@ -18,6 +23,11 @@ st.set_page_config(
     layout="wide"
 )
 
+# Developer timings: record this rerun's backend calls if the sidebar toggle is on
+timeline = start_timeline() if st.session_state.get('dev_timings') else None
+if timeline is None:
+    stop_timeline()
+
 # Apply custom styles
 apply_styles()
 
@@ -30,19 +40,26 @@ if 'current_page' not in st.session_state:
     st.session_state.current_page = 'fridge'
 if 'selected_cuisine' not in st.session_state:
     st.session_state.selected_cuisine = None
-if 'pending_count_updates' not in st.session_state:
-    st.session_state.pending_count_updates = {}
-if 'debounce_delay' not in st.session_state:
-    st.session_state.debounce_delay = 0.5
 if 'fridge_order' not in st.session_state:
     st.session_state.fridge_order = []
+if 'fridge_etag' not in st.session_state:
+    st.session_state.fridge_etag = None
 
 # Main app header
 st.markdown('<p class="main-header">🍽️ SmartFridge</p>', unsafe_allow_html=True)
 st.markdown("*Find out what you can cook with what's in your fridge!*")
 
-# Fetch current fridge contents on load and sync pending updates
-fetch_fridge()
+PAGES = {
+    'fridge': fridge,
+    'recipes': recipes,
+    'parser': recipe_parser,
+    'generate': generate,
+}
+page = PAGES[st.session_state.current_page]
+
+# Refresh fridge contents (conditional GET - cheap when unchanged) together with
+# the data the current page declares, all concurrently, then sync pending updates
+page_data = load_page_data({'fridge': fetch_fridge, **page.PAGE_DATA})
 sync_pending_counts()
 
 # ============== Sidebar Navigation ==============
@@ -65,11 +82,12 @@ if st.sidebar.button("🍳 Generate Recipes", use_container_width=True, type="pr
     st.rerun()
 
 # ============== Page Content ==============
-if st.session_state.current_page == 'fridge':
-    fridge.render()
-elif st.session_state.current_page == 'recipes':
-    recipes.render()
-elif st.session_state.current_page == 'parser':
-    recipe_parser.render()
-elif st.session_state.current_page == 'generate':
-    generate.render()
+page.render(page_data)
+
+# ============== Developer Tools ==============
+st.sidebar.markdown("---")
+st.sidebar.checkbox("🛠️ Developer timings", key="dev_timings",
+                    help="Show a waterfall of this rerun's backend calls and the total render time")
+if timeline is not None:
+    render_sidebar_waterfall(timeline)
+    render_coalescing_stats(http_client.coalescing_stats())
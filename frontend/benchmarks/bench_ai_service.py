@@ -0,0 +1,106 @@
+"""
+ai_service.py over real HTTP (threaded Werkzeug server) against the stub
+OpenAI: single-request latency per route and concurrent throughput with
+latency percentiles
+"""
+import itertools
+import threading
+
+import pytest
+import requests
+from werkzeug.serving import make_server
+
+import ai_service
+from load import run_burst
+
+FRIDGE = ["butter", "flour", "milk", "egg", "onion", "garlic"]
+STRUCTURED_RECIPE = """Pancakes
+Ingredients:
+- 2 cups flour
+- 1 cup milk
+- 2 eggs
+- 1 tsp salt
+Instructions:
+1. Mix
+2. Fry"""
+# No section headers, so the local parser declines and the model is called
+FREEFORM_RECIPE = ("My grandmother made these pancakes every Sunday with flour, milk, a couple of eggs and a "
+                   "pinch of salt; you mix everything, rest the batter and fry them in butter.")
+
+_unique = itertools.count()
+
+
+@pytest.fixture(scope="module")
+def service_url():
+    server = make_server("127.0.0.1", 0, ai_service.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def session():
+    with requests.Session() as s:
+        yield s
+
+
+def substitution(session, url, ingredient):
+    response = session.post(f"{url}/ai/substitutions", json={
+        "ingredient": ingredient, "cuisine": "AMERICAN",
+        "recipeIngredients": ["flour", "milk", ingredient], "fridgeSupplies": FRIDGE})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bench_health(benchmark, session, service_url):
+    benchmark(lambda: session.get(f"{service_url}/health").raise_for_status())
+
+
+def bench_substitution_uncached(benchmark, session, service_url):
+    # A new ingredient every round, so each one reaches the (stub) model
+    result = benchmark.pedantic(lambda: substitution(session, service_url, f"oil {next(_unique)}"), rounds=30)
+    assert result["substitutes"]
+
+
+def bench_substitution_cached(benchmark, session, service_url):
+    substitution(session, service_url, "cream")
+    result = benchmark(substitution, session, service_url, "cream")
+    assert result["substitutes"]
+
+
+def bench_parse_recipe_local(benchmark, session, service_url):
+    def parse():
+        return session.post(f"{service_url}/ai/parse-recipe", json={"recipeText": STRUCTURED_RECIPE}).json()
+
+    assert benchmark(parse)["success"]
+
+
+def bench_parse_recipe_llm(benchmark, session, service_url):
+    def parse():
+        return session.post(f"{service_url}/ai/parse-recipe", json={"recipeText": FREEFORM_RECIPE}).json()
+
+    assert benchmark.pedantic(parse, rounds=30)["success"]
+
+
+def bench_parse_recipe_stream(benchmark, session, service_url):
+    def parse():
+        with session.post(f"{service_url}/ai/parse-recipe/stream", json={"recipeText": FREEFORM_RECIPE},
+                          stream=True) as response:
+            return [line for line in response.iter_lines() if line.startswith(b"event:")]
+
+    events = benchmark.pedantic(parse, rounds=30)
+    assert events[-1] == b"event: done"
+
+
+@pytest.mark.parametrize("concurrency", [4, 16])
+def bench_substitution_throughput(benchmark, service_url, concurrency):
+    local = threading.local()
+
+    def call(i):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        substitution(local.session, service_url, f"stock {next(_unique)}")
+
+    stats = benchmark.pedantic(lambda: run_burst(call, requests=64, concurrency=concurrency), rounds=3)
+    benchmark.extra_info.update(stats)
@@ -0,0 +1,93 @@
+"""
+api.py client cost against the stub backend: cold vs cached lookups, batch
+vs per-item fetches, sequential vs concurrent page loads, conditional fridge
+refreshes, concurrent throughput and coalescing of identical reads
+"""
+import pytest
+import streamlit as st
+
+import api
+from http_client import http_client
+from load import run_burst
+
+NAMES = [f"recipe {i:04d}" for i in range(50)]
+
+
+@pytest.fixture(autouse=True)
+def empty_recipe_cache():
+    api.recipe_cache.clear()
+    yield
+    api.recipe_cache.clear()
+
+
+def bench_fetch_recipe_details_cold(benchmark):
+    result = benchmark.pedantic(api.fetch_recipe_details, args=("recipe 0001",),
+                                setup=api.recipe_cache.clear, rounds=200, warmup_rounds=5)
+    assert result["name"] == "recipe 0001"
+
+
+def bench_fetch_recipe_details_cached(benchmark):
+    api.fetch_recipe_details("recipe 0001")
+    assert benchmark(api.fetch_recipe_details, "recipe 0001") is not None
+
+
+def bench_details_for_50_recipes_one_by_one(benchmark):
+    def one_by_one():
+        return [api.fetch_recipe_details(name) for name in NAMES]
+
+    result = benchmark.pedantic(one_by_one, setup=api.recipe_cache.clear, rounds=20)
+    assert len(result) == len(NAMES)
+
+
+def bench_details_for_50_recipes_batched(benchmark):
+    result = benchmark.pedantic(api.fetch_recipe_details_many, args=(NAMES,),
+                                setup=api.recipe_cache.clear, rounds=20)
+    assert len(result) == len(NAMES)
+
+
+def bench_recipe_book_data_sequential(benchmark):
+    def sequential():
+        return {"recipes_by_cuisine": api.fetch_recipes_by_cuisine(), "cuisines": api.fetch_cuisines()}
+
+    result = benchmark.pedantic(sequential, setup=api.recipe_cache.clear, rounds=50)
+    assert result["cuisines"]
+
+
+def bench_recipe_book_data_concurrent(benchmark):
+    from views import recipes
+
+    result = benchmark.pedantic(api.load_page_data, args=(recipes.PAGE_DATA,),
+                                setup=api.recipe_cache.clear, rounds=50)
+    assert result["cuisines"]
+
+
+def bench_fetch_fridge_not_modified(benchmark):
+    st.session_state.fridge_etag = None
+    api.fetch_fridge()
+    assert st.session_state.fridge_etag
+    benchmark(api.fetch_fridge)
+
+
+def bench_recipe_details_throughput(benchmark, stub_backend):
+    names = list(stub_backend.recipes)
+
+    def burst():
+        return run_burst(lambda i: api.fetch_recipe_details(names[i % len(names)]), requests=200, concurrency=8)
+
+    stats = benchmark.pedantic(burst, setup=api.recipe_cache.clear, rounds=3)
+    benchmark.extra_info.update(stats)
+
+
+@pytest.mark.parametrize("coalesce", [False, True], ids=["separate", "coalesced"])
+def bench_identical_reads_throughput(benchmark, stub_backend, coalesce):
+    """Every session's rerun asking for the recipe list at the same moment"""
+    url = f"{stub_backend.url}/api/recipes"
+
+    def burst():
+        before = stub_backend.requests
+        stats = run_burst(lambda i: http_client.get(url, coalesce=coalesce), requests=200, concurrency=16)
+        stats["backend_requests"] = stub_backend.requests - before
+        return stats
+
+    stats = benchmark.pedantic(burst, rounds=3)
+    benchmark.extra_info.update(stats)
@@ -0,0 +1,73 @@
+"""
+Local cookability engine: snapshot load, incremental fridge updates and the
+reads the Generate page does each rerun
+"""
+import random
+
+import pytest
+
+from cookability import CookabilityEngine
+from stub_servers import PANTRY, make_recipes
+
+RECIPES = {name: details["ingredients"] for name, details in make_recipes(5000).items()}
+
+
+def _large_recipe_book(count: int = 100_000, vocabulary: int = 2000):
+    """Recipes of 4-12 ingredients drawn Zipf-like from a large vocabulary, as real books are"""
+    rng = random.Random(25)
+    ingredients = [f"ingredient {i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return {f"recipe {i:06d}": rng.choices(ingredients, weights, k=rng.randint(4, 12)) for i in range(count)}
+
+
+@pytest.fixture(scope="module")
+def large_engine():
+    engine = CookabilityEngine()
+    engine.set_fridge([f"ingredient {i}" for i in range(30)])
+    engine.load(_large_recipe_book(), {})
+    return engine
+
+
+@pytest.fixture
+def engine():
+    engine = CookabilityEngine()
+    engine.set_fridge(PANTRY[:12])
+    engine.load(RECIPES, {})
+    return engine
+
+
+def bench_load_snapshot(benchmark):
+    engine = CookabilityEngine()
+    engine.set_fridge(PANTRY[:12])
+    benchmark(engine.load, RECIPES, {})
+    assert engine.cookable()
+
+
+def bench_add_remove_item(benchmark, engine):
+    def toggle():
+        engine.add_item("tofu")
+        engine.remove_item("tofu")
+
+    before = engine.cookable()
+    benchmark(toggle)
+    assert engine.cookable() == before
+
+
+def bench_cookable_list(benchmark, engine):
+    assert benchmark(engine.cookable)
+
+
+def bench_almost_cookable_100k(benchmark, large_engine):
+    # A slider move: missing counts are cached per fridge state
+    groups = benchmark(large_engine.recipes_by_missing, 3, 20)
+    assert set(groups) == {1, 2, 3}
+
+
+def bench_almost_cookable_100k_after_fridge_change(benchmark, large_engine):
+    # Fridge edit then read: one vectorized AND + popcount pass over all recipes
+    def toggle_and_read():
+        large_engine.add_item("ingredient 1500")
+        large_engine.remove_item("ingredient 1500")
+        return large_engine.recipes_by_missing(3, 20)
+
+    assert benchmark(toggle_and_read)
@@ -0,0 +1,75 @@
+"""
+CPU cost of turning model output into a recipe: JSON post-processing (direct
+and markdown-fallback paths), incremental stream scanning, the local parser
+and ingredient-name cleanup
+"""
+import json
+
+import pytest
+
+from ingredient_normalizer import clean_ingredient_name, clear_caches, is_seasoning
+from json_stream import IncrementalJSONScanner
+from local_recipe_parser import parse_recipe_text
+from openai_client import OpenAIClient, openai_client
+from stub_servers import CANNED_RECIPE, PANTRY
+
+LARGE_RECIPE = dict(CANNED_RECIPE, ingredients=[
+    {"name": f"{i % 7 + 1} tbsp {PANTRY[i % len(PANTRY)]} {i}", "quantity": "1", "isSeasoning": i % 4 == 0}
+    for i in range(60)
+], instructions=[f"Step {i}: keep stirring" for i in range(20)])
+
+RESPONSES = {
+    "direct": json.dumps(CANNED_RECIPE),
+    "markdown_block": "Here you go:\n```json\n" + json.dumps(CANNED_RECIPE) + "\n```",
+    "large": json.dumps(LARGE_RECIPE),
+}
+
+STRUCTURED_TEXT = "\n".join(
+    ["Big Batch Stew", "Ingredients:"]
+    + [f"- {i % 3 + 1} cups {PANTRY[i % len(PANTRY)]}" for i in range(30)]
+    + ["Instructions:"] + [f"{i}. Stir and simmer" for i in range(1, 11)])
+
+RAW_NAMES = [ing["name"] for ing in LARGE_RECIPE["ingredients"]]
+
+
+def _clear_normalizer_caches():
+    clear_caches()
+
+
+@pytest.mark.parametrize("shape", list(RESPONSES))
+def bench_postprocess_parse_response(benchmark, shape):
+    response = RESPONSES[shape]
+    assert benchmark(openai_client.postprocess_parse_response, response) is not None
+
+
+def bench_stream_scanner_token_by_token(benchmark):
+    text = RESPONSES["large"]
+    pieces = [text[i:i + 4] for i in range(0, len(text), 4)]  # ~1 token per piece
+
+    def scan():
+        scanner = IncrementalJSONScanner()
+        events = 0
+        for piece in pieces:
+            events += len(scanner.feed(piece))
+        return events
+
+    assert benchmark(scan) >= len(LARGE_RECIPE["ingredients"])
+
+
+def bench_local_parser(benchmark):
+    recipe, confidence = benchmark(parse_recipe_text, STRUCTURED_TEXT)
+    assert recipe is not None and confidence > 0
+
+
+def bench_clean_60_ingredients_uncached(benchmark):
+    benchmark.pedantic(lambda: [OpenAIClient.clean_ingredient(name) for name in RAW_NAMES],
+                       setup=_clear_normalizer_caches, rounds=500)
+
+
+def bench_clean_60_ingredients_cached(benchmark):
+    [OpenAIClient.clean_ingredient(name) for name in RAW_NAMES]
+    benchmark(lambda: [OpenAIClient.clean_ingredient(name) for name in RAW_NAMES])
+
+
+def bench_is_seasoning(benchmark):
+    benchmark(lambda: [is_seasoning(name) for name in RAW_NAMES])
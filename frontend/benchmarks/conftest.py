@@ -0,0 +1,61 @@
+"""
+Benchmark fixtures: stub servers are started and the environment is pointed
+at them before any frontend module is imported, so nothing leaves the machine.
+
+    BENCH_BACKEND_LATENCY_MS   Delay the stub backend adds to each request (default 2)
+    BENCH_OPENAI_LATENCY_MS    Delay the stub OpenAI adds to each completion (default 50)
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, FRONTEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from stub_servers import StubBackend, StubOpenAI  # noqa: E402
+
+_state = {}
+
+
+def pytest_configure(config):
+    backend = StubBackend(latency=float(os.environ.get("BENCH_BACKEND_LATENCY_MS", "2")) / 1000).__enter__()
+    stub_openai = StubOpenAI(latency=float(os.environ.get("BENCH_OPENAI_LATENCY_MS", "50")) / 1000).__enter__()
+    scratch = tempfile.mkdtemp(prefix="smartfridge-bench-")
+    _state.update(backend=backend, openai=stub_openai, scratch=scratch)
+
+    os.environ.update({
+        "SMARTFRIDGE_API_URL": f"{backend.url}/api",
+        "OPENAI_API_KEY": "sk-benchmark",
+        "OPENAI_BASE_URL": f"{stub_openai.url}/v1",
+        "AI_CACHE_PATH": os.path.join(scratch, "llm_cache.sqlite3"),
+        # Measure the service, not our own throttling or log output
+        "OPENAI_REQUESTS_PER_MINUTE": "1000000",
+        "OPENAI_TOKENS_PER_MINUTE": "1000000000",
+        "LOG_LEVEL": "WARNING",
+        "LOG_ASYNC": "false",
+    })
+    os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+
+def pytest_unconfigure(config):
+    for key in ("backend", "openai"):
+        if key in _state:
+            _state.pop(key).__exit__(None, None, None)
+    if "scratch" in _state:
+        shutil.rmtree(_state.pop("scratch"), ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def stub_backend():
+    return _state["backend"]
+
+
+@pytest.fixture(scope="session")
+def stub_openai():
+    return _state["openai"]
+
@@ -0,0 +1,35 @@
+"""
+Load helpers - Run a call concurrently and summarize its latency distribution
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+
+def percentiles(samples: List[float], points=(50, 95, 99)) -> Dict[str, float]:
+    """{"p50_ms": ..., "p95_ms": ..., "p99_ms": ...} from durations in seconds"""
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        index = min(len(ordered) - 1, int(round(point / 100.0 * (len(ordered) - 1))))
+        result[f"p{point}_ms"] = round(ordered[index] * 1000, 2)
+    return result
+
+
+def run_burst(call: Callable[[int], None], requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Issue `requests` calls (call(i)) from `concurrency` threads
+
+    Returns throughput and latency percentiles, ready for benchmark.extra_info
+    """
+    def timed_call(i):
+        started = time.perf_counter()
+        call(i)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        durations = list(executor.map(timed_call, range(requests)))
+    wall = time.perf_counter() - started
+    return {"requests": requests, "concurrency": concurrency,
+            "throughput_rps": round(requests / wall, 1), **percentiles(durations)}
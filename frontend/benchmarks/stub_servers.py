@@ -0,0 +1,252 @@
+"""
+Stub Servers - Local stand-ins for the Spring backend and the OpenAI API
+
+Both run on 127.0.0.1 with an ephemeral port in a background thread, answer
+with canned data after a configurable delay, and need no network access.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+CUISINES = ["ITALIAN", "CHINESE", "JAPANESE", "MEXICAN", "AMERICAN",
+            "FRENCH", "INDIAN", "THAI", "MEDITERRANEAN", "KOREAN", "OTHER"]
+PANTRY = ["flour", "milk", "egg", "butter", "tomato", "onion", "garlic", "rice", "chicken", "pasta",
+          "cheese", "potato", "carrot", "pepper", "basil", "beef", "tofu", "spinach", "mushroom", "lemon"]
+
+
+def make_recipes(count: int = 200):
+    """Deterministic recipe book: name -> details (same shape as GET /api/recipes/{name})"""
+    recipes = {}
+    for i in range(count):
+        name = f"recipe {i:04d}"
+        recipes[name] = {
+            "name": name,
+            "cuisineType": CUISINES[i % len(CUISINES)],
+            "ingredients": [PANTRY[(i + k) % len(PANTRY)] for k in range(3 + i % 5)],
+            "seasonings": ["salt", "black pepper"],
+            "instructions": "\n".join(f"Step {s + 1} for {name}" for s in range(4)),
+        }
+    return recipes
+
+
+class _StubServer:
+    """ThreadingHTTPServer on an ephemeral port; use as a context manager"""
+
+    handler_class = None
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler_class)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real servers
+    # Headers and body are written separately; without this, Nagle + delayed
+    # ACK add ~40ms to every response and swamp what we want to measure
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def stub(self):
+        return self.server.stub
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, payload, status: int = 200, headers: dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def begin(self):
+        self.stub.requests += 1
+        if self.stub.latency:
+            time.sleep(self.stub.latency)
+
+
+class StubBackend(_StubServer):
+    """
+    The read endpoints api.py uses most, backed by make_recipes()
+
+    GET /api/fridge (with ETag / 304), /api/recipes, /api/recipes/page,
+    /api/recipes/counts, /api/recipes/{name}, /api/cuisines, /api/generate,
+    /api/cookability/snapshot; POST /api/recipes/details
+    """
+
+    ETAG = '"fridge-v1"'
+
+    def __init__(self, latency: float = 0.0, recipe_count: int = 200):
+        self.recipes = make_recipes(recipe_count)
+        super().__init__(latency)
+
+    class handler_class(_JSONHandler):
+        def do_GET(self):
+            self.begin()
+            url = urlsplit(self.path)
+            path = unquote(url.path)
+            recipes = self.stub.recipes
+            if path == "/api/fridge":
+                if self.headers.get("If-None-Match") == StubBackend.ETAG:
+                    self.send_response(304)
+                    self.send_header("ETag", StubBackend.ETAG)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                supplies = [{"name": item, "quantity": 1 + i % 3} for i, item in enumerate(PANTRY)]
+                self.send_json({"supplies": supplies}, headers={"ETag": StubBackend.ETAG})
+            elif path == "/api/recipes":
+                by_cuisine = {}
+                for details in recipes.values():
+                    by_cuisine.setdefault(details["cuisineType"], []).append(
+                        {"name": details["name"], "ingredients": details["ingredients"]})
+                self.send_json(by_cuisine)
+            elif path == "/api/recipes/counts":
+                counts = {}
+                for details in recipes.values():
+                    counts[details["cuisineType"]] = counts.get(details["cuisineType"], 0) + 1
+                self.send_json(counts)
+            elif path == "/api/recipes/page":
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                limit = int(query.get("limit", 50))
+                names = sorted(name for name, details in recipes.items()
+                               if name > query.get("after", "")
+                               and query.get("cuisine") in (None, details["cuisineType"]))
+                page = [{"name": name, "ingredients": recipes[name]["ingredients"],
+                         "seasonings": recipes[name]["seasonings"]} for name in names[:limit]]
+                self.send_json({"recipes": page, "nextCursor": page[-1]["name"] if len(names) > limit else None})
+            elif path == "/api/cookability/snapshot":
+                self.send_json({"recipes": {name: details["ingredients"] for name, details in recipes.items()},
+                                "aliases": {"scallion": "green onion", "green onion": "green onion"}})
+            elif path == "/api/cuisines":
+                self.send_json([{"name": c, "displayName": c.title()} for c in CUISINES])
+            elif path == "/api/generate":
+                self.send_json({"made": list(recipes)[:25]})
+            elif path.startswith("/api/recipes/") and path[len("/api/recipes/"):] in recipes:
+                self.send_json(recipes[path[len("/api/recipes/"):]])
+            else:
+                self.send_json({"error": "not found"}, status=404)
+
+        def do_POST(self):
+            self.begin()
+            path = urlsplit(self.path).path
+            if path == "/api/recipes/details":
+                names = self.read_json().get("names", [])
+                recipes = self.stub.recipes
+                self.send_json({"recipes": {name: recipes[name] for name in names if name in recipes}})
+            else:
+                self.send_json({"error": "not found"}, status=404)
+
+
+CANNED_RECIPE = {
+    "name": "Benchmark Pancakes",
+    "cuisine": "AMERICAN",
+    "ingredients": [{"name": "500g flour", "quantity": "1", "isSeasoning": False},
+                    {"name": "2 cups milk", "quantity": "1", "isSeasoning": False},
+                    {"name": "3 eggs", "quantity": "1", "isSeasoning": False},
+                    {"name": "1 tsp salt", "quantity": "1", "isSeasoning": True},
+                    {"name": "Spices", "quantity": "1", "isSeasoning": True},
+                    {"name": "2 tbsp sugar", "quantity": "1", "isSeasoning": False}],
+    "instructions": ["Mix the dry ingredients", "Whisk in milk and eggs", "Fry in a hot pan"],
+}
+
+
+class StubOpenAI(_StubServer):
+    """
+    OpenAI-compatible POST /v1/chat/completions (and GET /v1/models) with
+    canned JSON answers
+
+    Substitution prompts always suggest "butter" (so keep it in the fridge you
+    send); everything else gets CANNED_RECIPE. "stream": true is
+    answered as server-sent events, one chunk per few characters.
+    """
+
+    class handler_class(_JSONHandler):
+        def do_GET(self):
+            # Availability probe (models.list)
+            if urlsplit(self.path).path == "/v1/models":
+                self.send_json({"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "stub"}]})
+            else:
+                self.send_json({"error": {"message": "not found"}}, status=404)
+
+        def do_POST(self):
+            self.begin()
+            if urlsplit(self.path).path != "/v1/chat/completions":
+                self.send_json({"error": {"message": "not found"}}, status=404)
+                return
+            body = self.read_json()
+            prompt = body["messages"][-1]["content"]
+            content = json.dumps(self._answer(prompt))
+            if body.get("stream"):
+                self._stream(body, content)
+                return
+            self.send_json({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": self._usage(prompt, content),
+            })
+
+        @staticmethod
+        def _usage(prompt: str, content: str):
+            prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+            return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens}
+
+        @staticmethod
+        def _answer(prompt: str):
+            substitute = {"ingredient": "butter", "inFridge": True, "confidence": 0.8,
+                          "reasoning": "Similar fat content"}
+            if '"substitutions"' in prompt:
+                missing = [line.strip()[3:-1] for line in prompt.splitlines() if line.startswith('- "')]
+                return {"substitutions": {name: [substitute] for name in missing}}
+            if '"substitutes"' in prompt:
+                return {"substitutes": [substitute]}
+            return CANNED_RECIPE
+
+        def _stream(self, body, content: str):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for start in range(0, len(content), 16):
+                chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": body.get("model", "stub"),
+                         "choices": [{"index": 0, "delta": {"content": content[start:start + 16]},
+                                      "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            usage = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": body.get("model", "stub"), "choices": [],
+                     "usage": self._usage(body["messages"][-1]["content"], content)}
+            self.wfile.write(f"data: {json.dumps(usage)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+            self.close_connection = True
@@ -0,0 +1,305 @@
+"""
+Bulk Recipe Import - Parse and save many recipes at once
+
+Usage:
+    python bulk_import.py recipes/             # directory of .txt / .md files (one recipe each)
+    python bulk_import.py recipes.jsonl        # one {"text": "..."} or parsed recipe per line
+    python bulk_import.py dump.txt             # many recipes, separated by --- lines or titles
+
+Recipes are parsed concurrently by the AI service (POST /ai/parse-recipe:
+local fast path, then the LLM under the service's shared rate budget),
+de-duplicated against the recipe book and saved in batches.
+Progress is appended to a checkpoint file so an interrupted import resumes
+where it stopped.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ingredient_normalizer import normalize_name
+from logging_config import configure_logging
+from local_recipe_parser import CUISINES, INGREDIENT_HEADER
+
+RECIPE_FILE_EXTENSIONS = ('.txt', '.md')
+SEPARATOR_LINE = re.compile(r'^\s*(?:-{3,}|={3,}|\*{3,}|#{3,})\s*$')
+
+
+class InvalidSource(ValueError):
+    """A source that could not be read (e.g. a malformed JSONL line); imported as failed"""
+
+
+# (source id, raw recipe text, an already parsed recipe dict, or the reason it is unreadable)
+Source = Tuple[str, Union[str, Dict, InvalidSource]]
+
+
+def split_text_dump(text: str) -> List[str]:
+    """
+    Split a multi-recipe text dump into one text per recipe
+
+    Explicit separator lines (---, ===, ***) win; otherwise every
+    "Ingredients:" header starts a new recipe at the title line just above it.
+    """
+    lines = text.splitlines()
+    if any(SEPARATOR_LINE.match(line) for line in lines):
+        chunks, current = [], []
+        for line in lines:
+            if SEPARATOR_LINE.match(line):
+                chunks.append("\n".join(current))
+                current = []
+            else:
+                current.append(line)
+        chunks.append("\n".join(current))
+        return [chunk.strip() for chunk in chunks if chunk.strip()]
+
+    starts = []
+    for i, line in enumerate(lines):
+        if INGREDIENT_HEADER.match(line):
+            title = i - 1
+            while title >= 0 and not lines[title].strip():
+                title -= 1
+            starts.append(max(title, 0))
+    if len(starts) <= 1:
+        return [text.strip()] if text.strip() else []
+
+    starts[0] = 0  # keep anything before the first recipe with it
+    bounds = starts + [len(lines)]
+    return ["\n".join(lines[bounds[i]:bounds[i + 1]]).strip() for i in range(len(starts))]
+
+
+def sources_from_text(text: str, source_name: str) -> List[Source]:
+    """Sources from one file's content (JSONL if the name says so, else a text dump)"""
+    if source_name.endswith('.jsonl'):
+        sources = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                sources.append((f"{source_name}:{line_no}", InvalidSource(f"line {line_no}: invalid JSON ({e})")))
+                continue
+            if not isinstance(record, dict):
+                sources.append((f"{source_name}:{line_no}", InvalidSource(
+                    f"line {line_no}: expected a JSON object, got {type(record).__name__}")))
+                continue
+            source_id = str(record.get("id") or f"{source_name}:{line_no}")
+            if record.get("name") and record.get("ingredients"):
+                sources.append((source_id, record))  # already structured
+            else:
+                sources.append((source_id, record.get("text") or record.get("recipeText") or ""))
+        return sources
+
+    recipes = split_text_dump(text)
+    if len(recipes) == 1:
+        return [(source_name, recipes[0])]
+    return [(f"{source_name}#{i + 1}", recipe) for i, recipe in enumerate(recipes)]
+
+
+def load_sources(path: str) -> List[Source]:
+    """Sources from a directory, a JSONL file or a text dump"""
+    if os.path.isdir(path):
+        sources = []
+        for filename in sorted(os.listdir(path)):
+            full_path = os.path.join(path, filename)
+            if os.path.isfile(full_path) and filename.endswith(RECIPE_FILE_EXTENSIONS + ('.jsonl',)):
+                with open(full_path, encoding='utf-8') as f:
+                    sources.extend(sources_from_text(f.read(), filename))
+        return sources
+
+    with open(path, encoding='utf-8') as f:
+        return sources_from_text(f.read(), os.path.basename(path))
+
+
+def recipe_to_payload(parsed: Dict) -> Optional[Dict]:
+    """Convert a parsed recipe to the /recipes/batch format (same rules as the parser page)"""
+    name = normalize_name(parsed.get("name", ""))
+    ingredients = parsed.get("ingredients", [])
+    main, seasonings = [], []
+    for ing in ingredients:
+        if isinstance(ing, str):
+            ing = {"name": ing, "isSeasoning": False}
+        ing_name = normalize_name(ing.get("name", ""))
+        if not ing_name:
+            continue
+        target = seasonings if ing.get("isSeasoning", False) else main
+        if ing_name not in target:
+            target.append(ing_name)
+    if not name or not main:
+        return None
+
+    instructions = parsed.get("instructions", [])
+    if isinstance(instructions, list):
+        instructions = "\n".join(str(step).strip() for step in instructions if str(step).strip())
+
+    cuisine = str(parsed.get("cuisine") or parsed.get("cuisineType") or "OTHER").upper()
+    return {
+        "name": name,
+        "ingredients": main,
+        "seasonings": seasonings,
+        "cuisineType": cuisine if cuisine in CUISINES else "OTHER",
+        "instructions": instructions or "",
+    }
+
+
+def default_parse_fn(text: str) -> Optional[Dict]:
+    from api import parse_recipe_via_ai_service
+    return parse_recipe_via_ai_service(text)
+
+
+def default_save_fn(recipes: List[Dict]) -> Optional[Dict]:
+    from api import add_recipes_batch
+    return add_recipes_batch(recipes)
+
+
+def default_existing_names_fn() -> Iterable[str]:
+    from api import fetch_recipes_by_cuisine, invalidate_recipe_cache
+    invalidate_recipe_cache()
+    return [recipe["name"] for recipes in fetch_recipes_by_cuisine().values() for recipe in recipes]
+
+
+class BulkImporter:
+    """
+    Parse sources with bounded parallelism and save them in batches
+
+    Every finished source gets one checkpoint line:
+        {"id": "...", "status": "saved" | "duplicate" | "failed", "name": "...", "error": "..."}
+    Sources already recorded as saved or duplicate are skipped on the next
+    run; failed ones are retried.
+    """
+
+    def __init__(self, parse_fn: Callable = default_parse_fn, save_fn: Callable = default_save_fn,
+                 existing_names_fn: Callable = default_existing_names_fn, checkpoint_path: str = None,
+                 max_workers: int = 4, batch_size: int = 50, progress: Callable = None):
+        self.parse_fn = parse_fn
+        self.save_fn = save_fn
+        self.existing_names_fn = existing_names_fn
+        self.checkpoint_path = checkpoint_path
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.progress = progress
+        self.stats = {"total": 0, "done": 0, "saved": 0, "duplicate": 0, "failed": 0, "resumed": 0}
+        self._checkpoint_lock = threading.Lock()
+
+    def load_checkpoint(self) -> Dict[str, Dict]:
+        """Latest checkpoint entry per source id"""
+        entries = {}
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line after a crash
+                    entries[entry["id"]] = entry
+        return entries
+
+    def run(self, sources: List[Source]) -> Dict:
+        finished = {source_id for source_id, entry in self.load_checkpoint().items()
+                    if entry.get("status") in ("saved", "duplicate")}
+        todo = [(source_id, item) for source_id, item in sources if source_id not in finished]
+        self.stats["total"] = len(sources)
+        self.stats["resumed"] = len(sources) - len(todo)
+        self.stats["done"] = self.stats["resumed"]
+        self._report()
+
+        seen_names = {normalize_name(name) for name in self.existing_names_fn()}
+        pending = []  # (source id, payload) waiting to be saved
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._parse, item): source_id for source_id, item in todo}
+            for future in as_completed(futures):
+                source_id = futures[future]
+                try:
+                    payload = future.result()
+                except Exception as e:
+                    self._finish(source_id, "failed", error=str(e))
+                    continue
+                if payload is None:
+                    self._finish(source_id, "failed", error="Could not parse recipe")
+                elif payload["name"] in seen_names:
+                    self._finish(source_id, "duplicate", name=payload["name"])
+                else:
+                    seen_names.add(payload["name"])
+                    pending.append((source_id, payload))
+                    if len(pending) >= self.batch_size:
+                        self._save(pending)
+                        pending = []
+
+        if pending:
+            self._save(pending)
+        return self.stats
+
+    def _parse(self, item: Union[str, Dict, InvalidSource]) -> Optional[Dict]:
+        if isinstance(item, InvalidSource):
+            raise item
+        parsed = item if isinstance(item, dict) else self.parse_fn(item)
+        return recipe_to_payload(parsed) if parsed else None
+
+    def _save(self, pending: List[Tuple[str, Dict]]):
+        result = self.save_fn([payload for _, payload in pending])
+        if result is None:
+            for source_id, payload in pending:
+                self._finish(source_id, "failed", name=payload["name"], error="Batch save failed")
+            return
+
+        saved = set(result.get("saved", []))
+        failed = result.get("failed", {})
+        for source_id, payload in pending:
+            name = payload["name"]
+            if name in saved:
+                self._finish(source_id, "saved", name=name)
+            elif name in failed:
+                self._finish(source_id, "failed", name=name, error=failed[name])
+            else:
+                self._finish(source_id, "duplicate", name=name)
+
+    def _finish(self, source_id: str, status: str, name: str = None, error: str = None):
+        self.stats[status] += 1
+        self.stats["done"] += 1
+        if self.checkpoint_path:
+            entry = {"id": source_id, "status": status, "name": name}
+            if error:
+                entry["error"] = error
+            with self._checkpoint_lock, open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        self._report()
+
+    def _report(self):
+        if self.progress is not None:
+            self.progress(dict(self.stats))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import recipes into SmartFridge")
+    parser.add_argument("path", help="Directory of recipe files, a .jsonl file, or a multi-recipe text file")
+    parser.add_argument("--workers", type=int, default=4, help="Recipes parsed in parallel (default 4)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Recipes saved per request (max 100)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.import-checkpoint.jsonl)")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    checkpoint = args.checkpoint or os.path.abspath(args.path).rstrip(os.sep) + ".import-checkpoint.jsonl"
+    sources = load_sources(args.path)
+    print(f"Found {len(sources)} recipes in {args.path} (checkpoint: {checkpoint})")
+
+    def progress(stats):
+        print(f"\r[{stats['done']}/{stats['total']}] saved {stats['saved']}, "
+              f"duplicates {stats['duplicate']}, failed {stats['failed']}, resumed {stats['resumed']}",
+              end="", flush=True)
+
+    importer = BulkImporter(checkpoint_path=checkpoint, max_workers=args.workers,
+                            batch_size=min(args.batch_size, 100), progress=progress)
+    stats = importer.run(sources)
+    print()
+    if stats["failed"]:
+        print(f"{stats['failed']} recipes failed; re-run the same command to retry them.")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
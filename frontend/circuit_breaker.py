@@ -0,0 +1,73 @@
+"""
+Circuit Breaker - Tracks health of a remote dependency (used for OpenAI)
+"""
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker
+
+    - closed:    calls flow normally; consecutive failures are counted
+    - open:      after failure_threshold consecutive failures, calls are refused
+    - half_open: once reset_timeout has passed, a single probe is let through;
+                 success closes the circuit, failure re-opens it
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state_locked()
+
+    def allow_request(self) -> bool:
+        """Whether a call may go out now (claims the probe slot when half-open)"""
+        with self._lock:
+            state = self._current_state_locked()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open_locked()
+            self._probe_in_flight = False
+
+    def trip(self):
+        """Force the circuit open (e.g. the very first health probe failed)"""
+        with self._lock:
+            self._open_locked()
+
+    def _open_locked(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+
+    def _current_state_locked(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
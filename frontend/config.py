@@ -2,3 +2,31 @@ import os
 
 # Backend API URL - configurable via environment variable
 API_URL = os.environ.get("SMARTFRIDGE_API_URL", "http://localhost:8080/api")
+
+# Flask AI service (recipe parsing, substitutions)
+AI_SERVICE_URL = os.environ.get("AI_SERVICE_URL", "http://localhost:5001")
+
+# HTTP connection pool settings for the shared backend session
+HTTP_POOL_CONNECTIONS = int(os.environ.get("SMARTFRIDGE_HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("SMARTFRIDGE_HTTP_POOL_MAXSIZE", "32"))
+
+# Default (connect, read) timeouts in seconds for backend calls
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("SMARTFRIDGE_HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("SMARTFRIDGE_HTTP_READ_TIMEOUT", "30"))
+
+# Retry policy for idempotent requests (GET/PUT/DELETE/HEAD/OPTIONS)
+HTTP_MAX_RETRIES = int(os.environ.get("SMARTFRIDGE_HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = float(os.environ.get("SMARTFRIDGE_HTTP_BACKOFF_FACTOR", "0.3"))
+
+# Identical GETs in flight at the same time (from any session) share one backend call
+HTTP_COALESCE_GETS = os.environ.get("SMARTFRIDGE_HTTP_COALESCE_GETS", "true").lower() in ("1", "true", "yes")
+
+# Shared cache for recipe details and cuisine metadata
+RECIPE_CACHE_TTL = float(os.environ.get("SMARTFRIDGE_RECIPE_CACHE_TTL", "300"))
+RECIPE_CACHE_MAXSIZE = int(os.environ.get("SMARTFRIDGE_RECIPE_CACHE_MAXSIZE", "2048"))
+
+# Fridge count edits made within this window are sent as one bulk update
+FRIDGE_COUNT_DEBOUNCE_SECONDS = float(os.environ.get("SMARTFRIDGE_COUNT_DEBOUNCE_SECONDS", "0.5"))
+
+# Worker threads shared by all sessions for loading a page's data concurrently
+PAGE_LOAD_WORKERS = int(os.environ.get("SMARTFRIDGE_PAGE_LOAD_WORKERS", "8"))
@@ -0,0 +1,301 @@
+"""
+Cookability - In-process "what can I cook" engine kept in sync with the fridge
+
+Built from the backend's cookability snapshot (recipe -> canonical main
+ingredients, plus the alias table), it holds an inverted index
+(ingredient -> recipes needing it) and a missing-ingredient counter per
+recipe. Adding or removing a fridge item only touches the recipes that use
+it, so the cookable set is always current without a round trip. Like the
+backend's Kahn's algorithm, a cookable recipe counts as available for
+recipes that use it as an ingredient.
+
+"Almost cookable" (how many ingredients each recipe lacks from the fridge)
+is answered by IngredientBitMatrix, a packed recipes x ingredients bit
+matrix, for all recipes at once.
+"""
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import RECIPE_CACHE_TTL
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return _POPCOUNT_TABLE[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+class IngredientBitMatrix:
+    """
+    Recipes x ingredient vocabulary as packed bits, one uint64 per 64 ingredients
+
+    Stored word-major (bits[word] is one contiguous row over all recipes) and
+    with the vocabulary ordered by how many recipes use each ingredient, so
+    common fridge items share the first few words. missing_counts() then
+    touches only the words the fridge has bits in:
+    missing = degree - popcount(recipe & fridge), summed over those words.
+    """
+
+    def __init__(self, requires: Dict[str, frozenset]):
+        frequency = Counter(ingredient for ingredients in requires.values() for ingredient in ingredients)
+        self.vocabulary = [ingredient for ingredient, _ in frequency.most_common()]
+        self.column = {ingredient: i for i, ingredient in enumerate(self.vocabulary)}
+        self.names = np.array(sorted(requires), dtype=object)
+        self.row = {name: i for i, name in enumerate(self.names)}
+        self.words = max(1, (len(self.vocabulary) + 63) // 64)
+
+        rows, columns = [], []
+        for name in self.names:
+            for ingredient in requires[name]:
+                rows.append(self.row[name])
+                columns.append(self.column[ingredient])
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        self.bits = np.zeros((self.words, len(self.names)), dtype=np.uint64)
+        np.bitwise_or.at(self.bits, (columns >> 6, rows), np.left_shift(np.uint64(1), (columns & 63).astype(np.uint64)))
+        self.degree = np.bincount(rows, minlength=len(self.names)).astype(np.int32)
+
+    def empty_vector(self) -> np.ndarray:
+        return np.zeros(self.words, dtype=np.uint64)
+
+    def set_bit(self, vector: np.ndarray, ingredient: str, present: bool) -> bool:
+        """Set or clear an ingredient in a fridge vector; False if it's not in the vocabulary"""
+        column = self.column.get(ingredient)
+        if column is None:
+            return False
+        mask = np.uint64(1) << np.uint64(column & 63)
+        if present:
+            vector[column >> 6] |= mask
+        else:
+            vector[column >> 6] &= ~mask
+        return True
+
+    def missing_counts(self, vector: np.ndarray) -> np.ndarray:
+        """Ingredients each recipe lacks from the fridge vector (int32, one per row)"""
+        have = np.zeros(len(self.names), dtype=np.int32)
+        for word in np.flatnonzero(vector):
+            have += _popcount(self.bits[word] & vector[word])
+        return self.degree - have
+
+
+class CookabilityEngine:
+    """Thread-safe incremental cookability over one (global) fridge"""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._requires: Dict[str, frozenset] = {}   # recipe -> canonical ingredients
+        self._used_by: Dict[str, List[str]] = {}    # ingredient -> recipes that need it
+        self._aliases: Dict[str, str] = {}          # lower-case name -> canonical name
+        self._missing: Dict[str, int] = {}          # recipe -> ingredients not available
+        self._cookable = set()
+        self._fridge = set()                        # fridge item names as stored
+        self._supply_refs = Counter()               # ingredient -> fridge items providing it
+        self._matrix: Optional[IngredientBitMatrix] = None
+        self._fridge_vector = None                  # supplied ingredients as bits over the matrix vocabulary
+        self._cookable_rows = None                  # cookable recipes as a bool mask over matrix rows
+        self._missing_counts = None                 # cached IngredientBitMatrix.missing_counts() result
+
+    # ---------- snapshot ----------
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def stale(self) -> bool:
+        """Never loaded, invalidated, or older than ttl"""
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at > self.ttl
+
+    def load(self, recipes: Dict[str, Iterable[str]], aliases: Dict[str, str]):
+        """Rebuild the index from a snapshot, keeping the current fridge"""
+        requires = {name: frozenset(ingredients) for name, ingredients in recipes.items() if ingredients}
+        used_by = {}
+        for name, ingredients in requires.items():
+            for ingredient in ingredients:
+                used_by.setdefault(ingredient, []).append(name)
+        matrix = IngredientBitMatrix(requires)
+
+        with self._lock:
+            self._requires = requires
+            self._used_by = used_by
+            self._aliases = dict(aliases)
+            self._missing = {name: len(ingredients) for name, ingredients in requires.items()}
+            self._cookable = set()
+            self._supply_refs = Counter()
+            self._matrix = matrix
+            self._fridge_vector = matrix.empty_vector()
+            self._cookable_rows = np.zeros(len(matrix.names), dtype=bool)
+            self._missing_counts = None
+            for item in self._fridge:
+                for token in self._tokens(item):
+                    self._add_supply(token)
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Mark the snapshot stale (recipes or aliases changed); the fridge is kept"""
+        self._loaded_at = None
+
+    # ---------- fridge updates ----------
+
+    def set_fridge(self, items: Iterable[str]):
+        """Apply a full fridge listing as the difference to the current one"""
+        items = set(items)
+        with self._lock:
+            for item in self._fridge - items:
+                self.remove_item(item)
+            for item in items - self._fridge:
+                self.add_item(item)
+
+    def add_item(self, item: str) -> bool:
+        """Add one fridge item; False if the engine already had it"""
+        with self._lock:
+            if item in self._fridge:
+                return False
+            self._fridge.add(item)
+            if self.loaded:
+                for token in self._tokens(item):
+                    self._add_supply(token)
+            return True
+
+    def remove_item(self, item: str) -> bool:
+        """Remove one fridge item; False if the engine did not have it"""
+        with self._lock:
+            if item not in self._fridge:
+                return False
+            self._fridge.discard(item)
+            if self.loaded:
+                for token in self._tokens(item):
+                    self._remove_supply(token)
+            return True
+
+    # ---------- queries ----------
+
+    def cookable(self) -> List[str]:
+        """Cookable recipes, by name; like GET /api/generate, ones already in the fridge are left out"""
+        with self._lock:
+            return sorted(r for r in self._cookable if not self._supply_refs[r])
+
+    def is_cookable(self, recipe: str) -> bool:
+        return recipe in self._cookable
+
+    def missing_ingredients(self, recipe: str) -> List[str]:
+        """Main ingredients of recipe that are neither in the fridge nor cookable"""
+        with self._lock:
+            return sorted(i for i in self._requires.get(recipe, ()) if not self._available(i))
+
+    def missing_from_fridge(self, recipe: str) -> List[str]:
+        """Main ingredients of recipe not in the fridge (the almost-cookable view)"""
+        with self._lock:
+            return sorted(i for i in self._requires.get(recipe, ()) if not self._supply_refs[i])
+
+    def recipes_by_missing(self, max_missing: int, limit: Optional[int] = None) -> Dict[int, Tuple[int, List[str]]]:
+        """
+        Recipes that lack 1..max_missing fridge ingredients, grouped by that number
+
+        Cookable recipes (even via other recipes) are left out, as in
+        GET /api/recipes/almost-cookable. Missing counts are computed once per
+        fridge change; a call is then a few vectorized comparisons.
+
+        Returns:
+            missing -> (recipes in the group, first `limit` names in name order);
+            empty groups are omitted
+        """
+        with self._lock:
+            if self._matrix is None:
+                return {}
+            if self._missing_counts is None:
+                self._missing_counts = self._matrix.missing_counts(self._fridge_vector)
+            counts = self._missing_counts
+            rows = np.flatnonzero((counts >= 1) & (counts <= max_missing) & ~self._cookable_rows)
+            row_counts = counts[rows]
+            groups = {}
+            for missing in range(1, max_missing + 1):
+                group = rows[row_counts == missing]
+                if len(group):
+                    groups[missing] = (len(group), self._matrix.names[group[:limit]].tolist())
+            return groups
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"recipes": len(self._requires), "ingredients": len(self._used_by),
+                    "fridge_items": len(self._fridge), "cookable": len(self._cookable),
+                    "loaded": self.loaded}
+
+    # ---------- internals (lock held) ----------
+
+    def _tokens(self, item: str):
+        """Names a fridge item supplies: itself and its canonical form (as the backend matches)"""
+        canonical = self._aliases.get(item.strip().lower(), item.strip())
+        return {item, canonical}
+
+    def _available(self, ingredient: str) -> bool:
+        return self._supply_refs[ingredient] > 0 or ingredient in self._cookable
+
+    def _add_supply(self, token: str):
+        was_available = self._available(token)
+        self._supply_refs[token] += 1
+        if self._supply_refs[token] == 1 and self._matrix.set_bit(self._fridge_vector, token, True):
+            self._missing_counts = None
+        if not was_available:
+            self._became_available(token)
+
+    def _remove_supply(self, token: str):
+        self._supply_refs[token] -= 1
+        if self._supply_refs[token] > 0:
+            return
+        del self._supply_refs[token]
+        if self._matrix.set_bit(self._fridge_vector, token, False):
+            self._missing_counts = None
+        if token in self._cookable:
+            # A recipe taken out of the fridge may only have been cookable through
+            # itself (a cycle of recipes closed by the fridge copy). Withdraw it,
+            # let that settle, then restore it if its ingredients still hold.
+            self._set_cookable(token, False)
+            self._became_unavailable(token)
+            if self._missing[token] == 0:
+                self._set_cookable(token, True)
+                self._became_available(token)
+        else:
+            self._became_unavailable(token)
+
+    def _set_cookable(self, recipe: str, cookable: bool):
+        if cookable:
+            self._cookable.add(recipe)
+        else:
+            self._cookable.discard(recipe)
+        self._cookable_rows[self._matrix.row[recipe]] = cookable
+
+    def _became_available(self, ingredient: str):
+        # Iterative so long chains of recipes-as-ingredients can't hit the recursion limit
+        stack = [ingredient]
+        while stack:
+            for recipe in self._used_by.get(stack.pop(), ()):
+                self._missing[recipe] -= 1
+                if self._missing[recipe] == 0 and recipe not in self._cookable:
+                    was_available = self._available(recipe)
+                    self._set_cookable(recipe, True)
+                    if not was_available:
+                        stack.append(recipe)
+
+    def _became_unavailable(self, ingredient: str):
+        stack = [ingredient]
+        while stack:
+            for recipe in self._used_by.get(stack.pop(), ()):
+                self._missing[recipe] += 1
+                if self._missing[recipe] == 1 and recipe in self._cookable:
+                    self._set_cookable(recipe, False)
+                    if not self._available(recipe):
+                        stack.append(recipe)
+
+
+# Global instance: the fridge is global on the backend, so one engine serves every session
+cookability_engine = CookabilityEngine(ttl=RECIPE_CACHE_TTL)
@@ -0,0 +1,54 @@
+"""
+Gunicorn configuration for the Flask AI service
+
+    gunicorn -c gunicorn.conf.py ai_service:app
+
+Every setting can be overridden through the AI_SERVICE_* environment variables.
+OpenAI calls are I/O bound, so each worker process runs a pool of threads
+(gthread): a slow completion only occupies one thread instead of the whole
+server.
+"""
+import os
+import shutil
+
+bind = os.environ.get("AI_SERVICE_BIND", "0.0.0.0:5001")
+
+workers = int(os.environ.get("AI_SERVICE_WORKERS", 2))
+worker_class = os.environ.get("AI_SERVICE_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("AI_SERVICE_THREADS", 8))
+
+# With gthread workers this is only a heartbeat: the arbiter restarts a worker
+# whose main loop stops responding, but it does not bound how long a single
+# request runs. The per-request deadline is OPENAI_REQUEST_TIMEOUT, enforced by
+# the OpenAI client around every completion (the frontend gives up at 120s)
+timeout = int(os.environ.get("AI_SERVICE_TIMEOUT", 150))
+# On SIGTERM, in-flight requests get this long to finish before workers are killed
+graceful_timeout = int(os.environ.get("AI_SERVICE_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("AI_SERVICE_KEEPALIVE", 5))
+
+# Recycle workers now and then to cap slow memory growth
+max_requests = int(os.environ.get("AI_SERVICE_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("AI_SERVICE_MAX_REQUESTS_JITTER", 100))
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("AI_SERVICE_LOG_LEVEL", "info")
+
+
+# Prometheus: with PROMETHEUS_MULTIPROC_DIR set, every worker writes its
+# metrics to that directory and /metrics aggregates them
+def on_starting(server):
+    # Workers split the OpenAI request/token budgets between them (see openai_client.py);
+    # an explicit OPENAI_RATE_LIMIT_PROCESSES (e.g. for several replicas) wins
+    os.environ.setdefault("OPENAI_RATE_LIMIT_PROCESSES", str(server.cfg.workers))
+
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)  # stale files from a previous run
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,172 @@
+"""
+HTTP Client - Shared, pooled session for calls to the SmartFridge backend
+"""
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_COALESCE_GETS,
+)
+from singleflight import SingleFlight
+from timing import record_request
+
+# Exceptions that mean "backend unreachable or too slow" rather than a bug
+REQUEST_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+# GET keyword arguments that can be part of a coalescing key; anything else
+# (stream, auth, cookies, ...) opts the call out
+_COALESCIBLE_KWARGS = frozenset(["params", "headers"])
+
+
+class HttpClient:
+    """
+    Process-wide HTTP client with connection pooling, keep-alive and retries
+
+    Identical GETs that overlap in time - typically every session's rerun
+    asking for the fridge or the recipe list at once - are coalesced: one goes
+    to the backend and its response is handed to all callers. Callers must
+    treat the shared Response as read-only.
+    """
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR,
+                 coalesce_gets: bool = HTTP_COALESCE_GETS):
+        self.timeout = timeout
+        self.singleflight = SingleFlight() if coalesce_gets else None
+        # Bumped after every write; part of the coalescing key so a GET issued
+        # after a write never joins one that was sent before it
+        self._write_generation = 0
+        self._generation_lock = threading.Lock()
+        self.session = requests.Session()
+        self.no_retry_session = requests.Session()
+
+        # Only idempotent methods are retried; POSTs are never replayed
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"]),
+            raise_on_status=False,
+        )
+        for session, session_retry in ((self.session, retry), (self.no_retry_session, 0)):
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=session_retry,
+                pool_block=False,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, timeout=None, retry: bool = True, coalesce: bool = True,
+                **kwargs) -> requests.Response:
+        """
+        Send a request over the pooled session
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            timeout: Per-call timeout in seconds (or a (connect, read) tuple);
+                     falls back to the client default
+            retry: Set False for slow or expensive calls that must not be replayed
+            coalesce: Set False to force a GET of its own even if an identical
+                      one is in flight
+
+        Returns:
+            The requests.Response
+        """
+        if method != "GET":
+            try:
+                return self._send(method, url, timeout, retry, **kwargs)
+            finally:
+                with self._generation_lock:
+                    self._write_generation += 1
+
+        key = self._coalescing_key(url, timeout, retry, kwargs) if coalesce else None
+        if key is None:
+            return self._send(method, url, timeout, retry, **kwargs)
+
+        def send():
+            # Failures are returned rather than raised so followers can tell
+            # them apart from their own bugs and record them
+            try:
+                return self._send(method, url, timeout, retry, **kwargs)
+            except requests.exceptions.RequestException as e:
+                return e
+
+        started = time.perf_counter()
+        result, shared = self.singleflight.do(key, send, label=f"GET {urlsplit(url).path}")
+        failed = isinstance(result, Exception)
+        if shared:
+            # The leader recorded the request itself; followers record their wait
+            record_request(method, url, started, type(result).__name__ if failed else result.status_code,
+                           None if failed else len(result.content))
+        if failed:
+            raise result
+        return result
+
+    def _coalescing_key(self, url: str, timeout, retry: bool, kwargs):
+        """Hashable identity of a GET, or None if it must not be coalesced"""
+        if self.singleflight is None or not _COALESCIBLE_KWARGS.issuperset(kwargs):
+            return None
+        params = kwargs.get("params") or {}
+        headers = kwargs.get("headers") or {}
+        if not isinstance(params, dict) or not isinstance(headers, dict):
+            return None
+        return (url, urlencode(sorted(params.items()), doseq=True), tuple(sorted(headers.items())),
+                timeout, retry, self._write_generation)
+
+    def _send(self, method: str, url: str, timeout, retry: bool, **kwargs) -> requests.Response:
+        session = self.session if retry else self.no_retry_session
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            record_request(method, url, started, type(e).__name__, None)
+            raise
+        # Streamed bodies have not been read yet; don't force them in just to measure
+        size = None if kwargs.get("stream") else len(response.content)
+        record_request(method, url, started, response.status_code, size)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def coalescing_stats(self) -> dict:
+        """Per-endpoint GET coalescing counts: calls, executions, saved, max_waiters"""
+        return self.singleflight.stats() if self.singleflight is not None else {}
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+        self.no_retry_session.close()
+
+
+# Global instance
+http_client = HttpClient()
@@ -0,0 +1,183 @@
+"""
+Ingredient Normalizer - Shared ingredient-name cleanup for the parsers and the UI
+
+Patterns are compiled once at import, seasoning keywords are matched with an
+Aho-Corasick automaton (one pass over the name for all keywords) and results
+are memoized, so bulk imports pay microseconds per repeated ingredient.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set
+
+# Ingredient names that imply a seasoning
+SEASONING_KEYWORDS = ['salt', 'pepper', 'sugar', 'oil', 'sauce', 'vinegar',
+                      'spice', 'cumin', 'paprika', 'oregano', 'basil', 'thyme',
+                      'bay leaf', 'star anise', 'cinnamon', 'clove', 'ginger',
+                      'peppercorn', 'fennel', 'paste', 'fermented', 'peanut butter']
+
+# Category headers the model sometimes emits as ingredients
+CATEGORY_HEADERS = frozenset(['spices', 'aromatics', 'spices and aromatics'])
+
+# Measure words dropped from the front of a written ingredient ("2 cups of flour")
+MEASURE_WORDS = frozenset([
+    'cup', 'cups', 'tbsp', 'tbsps', 'tsp', 'tsps', 'tablespoon', 'tablespoons', 'teaspoon', 'teaspoons',
+    'clove', 'cloves', 'can', 'cans', 'slice', 'slices', 'pinch', 'pinches', 'dash', 'dashes',
+    'bunch', 'bunches', 'sprig', 'sprigs', 'stalk', 'stalks', 'head', 'heads', 'package', 'packages',
+    'stick', 'sticks', 'gram', 'grams', 'g', 'kg', 'ml', 'l', 'oz', 'lb', 'lbs', 'pound', 'pounds',
+    'ounce', 'ounces'])
+
+NORMALIZER_CACHE_SIZE = 8192
+
+# Quantities/units glued to or following a number ("500g", "2 tbsp")
+UNIT_QUANTITY = re.compile(
+    r'\s*\d+\.?\d*\s*(g|kg|ml|l|cup|cups|tbsp|tsp|oz|lb|gram|liter|ounce|pound|tablespoon|teaspoon|piece|pieces|small|large|handful)s?\b',
+    re.IGNORECASE)
+TRAILING_NUMBER = re.compile(r'\s*\d+\.?\d*/?\d*\s*$')
+LEADING_NUMBER = re.compile(r'^\d+\.?\d*\s*')
+TRAILING_CLAUSE = re.compile(r'\s*,.*$')
+WHITESPACE = re.compile(r'\s+')
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list
+
+    Finds every keyword occurring anywhere in a text (same semantics as
+    `kw in text` for each keyword) in a single left-to-right pass.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[str]] = [set()]
+        for keyword in keywords:
+            self._add(keyword.lower())
+        self._build_failure_links()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            state = next_state
+        self._output[state].add(keyword)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        for state in queue:  # breadth-first; the list grows while iterating
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """All keywords that occur in text (text is expected to be lower-case)"""
+        found = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+    def contains_any(self, text: str) -> bool:
+        """Whether any keyword occurs in text; stops at the first hit"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return True
+        return False
+
+
+SEASONING_MATCHER = KeywordMatcher(SEASONING_KEYWORDS)
+
+
+# The cached helpers only ever see strings: names come from model output and
+# imported files, where a list or dict would make the cache lookup raise TypeError
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _normalize_name(name: str) -> str:
+    return WHITESPACE.sub(' ', name).strip().lower()
+
+
+def normalize_name(name) -> str:
+    """Canonical form used for storage and comparisons: trimmed, lower-case, single spaces"""
+    return _normalize_name(str(name))
+
+
+def normalize_names(names: Iterable) -> List[str]:
+    """Normalize names, dropping blanks and duplicates (first occurrence wins)"""
+    result, seen = [], set()
+    for name in names or []:
+        if name is None:
+            continue
+        normalized = normalize_name(name)
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            result.append(normalized)
+    return result
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _clean_ingredient_name(name: str) -> str:
+    name = name.strip()
+    # Remove patterns like "500g", "2 tbsp", numbers at end
+    name = UNIT_QUANTITY.sub('', name)
+    name = TRAILING_NUMBER.sub('', name)  # Remove trailing fractions/numbers
+    name = LEADING_NUMBER.sub('', name)  # Remove leading numbers
+    name = TRAILING_CLAUSE.sub('', name)  # Remove trailing commas and text after
+    return name.strip()
+
+
+def clean_ingredient_name(name) -> str:
+    """Strip quantities and units from an ingredient name ("500g flour" -> "flour")"""
+    return _clean_ingredient_name(str(name))
+
+
+def clear_caches():
+    """Drop memoized names (benchmarks measure the uncached cost)"""
+    _normalize_name.cache_clear()
+    _clean_ingredient_name.cache_clear()
+
+
+def strip_leading_measure(text: str) -> str:
+    """Drop a leading measure word and an optional "of" ("cups of flour" -> "flour")"""
+    parts = text.split(None, 1)
+    if len(parts) == 2 and parts[0].lower().rstrip('.') in MEASURE_WORDS:
+        rest = parts[1]
+        if rest[:3].lower() == 'of ':
+            rest = rest[3:].lstrip()
+        return rest
+    return text
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _has_seasoning_keyword(name_lower: str) -> bool:
+    return SEASONING_MATCHER.contains_any(name_lower)
+
+
+def is_seasoning(name: str, declared=False) -> bool:
+    """Seasoning if declared so (bool or "true"/"yes"/"1") or the name contains a seasoning keyword"""
+    if isinstance(declared, str):
+        declared = declared.lower() in ['true', '1', 'yes']
+    return bool(declared) or _has_seasoning_keyword(normalize_name(name))
+
+
+def is_category_header(name: str) -> bool:
+    """Whether a parsed "ingredient" is really a section header like "Spices" """
+    return normalize_name(name) in CATEGORY_HEADERS
@@ -0,0 +1,104 @@
+"""
+Incremental JSON scanner for streamed LLM output
+"""
+import json
+
+
+class IncrementalJSONScanner:
+    """
+    Feed a JSON object piece by piece and get its parts as soon as they are complete
+
+    Only the shapes used by the recipe parser are reported:
+    - ("field", key, value) for a top-level string value, e.g. "name"
+    - ("item", key, value)  for each element of a top-level array, e.g. one
+                            ingredient object or one instruction string
+
+    Nothing is re-parsed: every character is looked at once, so feeding the
+    whole completion token by token costs O(n) overall.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack = []  # open containers: '{' or '['
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._expect_key = False
+        self._top_key = None      # key whose value is being read at depth 1
+        self._array_key = None    # top-level key of the array we are inside
+        self._element_start = None
+        self.complete = False
+
+    def feed(self, text: str) -> list:
+        """Consume more text; return the events completed by it"""
+        self.buffer += text
+        events = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            c = buffer[i]
+            depth = len(self._stack)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._string_closed(self._string_start, i, events)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                if self._in_tracked_array(depth) and self._element_start is None:
+                    self._element_start = i
+            elif c in '{[':
+                if self._in_tracked_array(depth) and self._element_start is None:
+                    self._element_start = i
+                if depth == 1 and c == '[':
+                    self._array_key = self._top_key
+                self._stack.append(c)
+                if len(self._stack) == 1:
+                    self._expect_key = True
+            elif c in '}]':
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                depth = len(self._stack)
+                if self._in_tracked_array(depth) and self._element_start is not None:
+                    self._emit_item(self._element_start, i, events)
+                elif depth == 1 and c == ']':
+                    self._array_key = None
+                elif depth == 0:
+                    self.complete = True
+            elif depth == 1 and c == ':':
+                self._expect_key = False
+            elif depth == 1 and c == ',':
+                self._expect_key = True
+                self._top_key = None
+
+        self._pos = len(buffer)
+        return events
+
+    def _in_tracked_array(self, depth: int) -> bool:
+        return depth == 2 and self._stack[-1] == '[' and self._array_key is not None
+
+    def _string_closed(self, start: int, end: int, events: list):
+        depth = len(self._stack)
+        literal = self.buffer[start:end + 1]
+        if depth == 1:
+            if self._expect_key:
+                self._top_key = json.loads(literal)
+            elif self._top_key is not None:
+                events.append(("field", self._top_key, json.loads(literal)))
+        elif self._in_tracked_array(depth) and self._element_start == start:
+            self._emit_item(start, end, events)
+
+    def _emit_item(self, start: int, end: int, events: list):
+        self._element_start = None
+        try:
+            events.append(("item", self._array_key, json.loads(self.buffer[start:end + 1])))
+        except json.JSONDecodeError:
+            pass  # malformed element; the final full parse still sees it
@@ -0,0 +1,125 @@
+"""
+LLM Response Cache - Content-addressed, SQLite-backed cache for model answers
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = Counter(
+    "llm_cache_lookups_total", "LLM response cache lookups", ["result"])
+
+
+class LLMResponseCache:
+    """
+    Persistent cache for LLM results keyed on normalized prompt inputs
+
+    Entries expire after ttl seconds; when more than max_entries are stored the
+    least recently used ones are evicted. The store is a local SQLite file so it
+    survives restarts and is shared by all worker processes on the host.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_entries: int = 10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+
+    @staticmethod
+    def make_key(kind: str, model: str, **inputs) -> str:
+        """Hash the (already normalized) inputs into a stable cache key"""
+        payload = json.dumps({"kind": kind, "model": model, "inputs": inputs},
+                             sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None on a miss (expired entries are dropped)"""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[1] > self.ttl:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning("LLM cache read failed: %s", e)
+            row = None
+
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        CACHE_LOOKUPS.labels(result="miss" if row is None else "hit").inc()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value, evicting LRU entries beyond max_entries"""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now))
+                count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM llm_cache WHERE key IN "
+                        "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                        (count - self.max_entries,))
+        except sqlite3.Error as e:
+            logger.warning("LLM cache write failed: %s", e)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / total, 3) if total else 0.0,
+            "entries": entries,
+            "maxEntries": self.max_entries,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets worker processes read concurrently"""
+        conn = getattr(self._local, "conn", None)
+        # SQLite connections must not cross a fork, so key them on the pid too
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
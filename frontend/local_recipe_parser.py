@@ -0,0 +1,164 @@
+"""
+Local Recipe Parser - Rule-based fast path for well-structured recipe text
+
+Recipes pasted with clear "Ingredients:" / "Instructions:" sections are
+parsed here in milliseconds; the LLM is only needed when confidence is low.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ingredient_normalizer import (KeywordMatcher, clean_ingredient_name, is_category_header, is_seasoning,
+                                   normalize_name, strip_leading_measure)
+
+CUISINES = ["ITALIAN", "CHINESE", "JAPANESE", "MEXICAN", "AMERICAN",
+            "FRENCH", "INDIAN", "THAI", "MEDITERRANEAN", "KOREAN", "OTHER"]
+
+# A few strong signals per cuisine; anything ambiguous stays OTHER
+CUISINE_HINTS = {
+    "ITALIAN": ['spaghetti', 'pasta', 'parmesan', 'mozzarella', 'risotto', 'pancetta', 'lasagna', 'penne'],
+    "CHINESE": ['soy sauce', 'bok choy', 'hoisin', 'wok', 'tofu', 'oyster sauce', 'sichuan', 'star anise'],
+    "JAPANESE": ['miso', 'mirin', 'dashi', 'nori', 'sake', 'wasabi', 'udon', 'sushi'],
+    "MEXICAN": ['tortilla', 'jalapeno', 'salsa', 'cilantro', 'taco', 'enchilada', 'chipotle'],
+    "INDIAN": ['garam masala', 'turmeric', 'curry', 'ghee', 'paneer', 'naan', 'cardamom'],
+    "KOREAN": ['gochujang', 'kimchi', 'gochugaru', 'bulgogi'],
+    "THAI": ['fish sauce', 'lemongrass', 'coconut milk', 'thai basil', 'galangal'],
+    "FRENCH": ['gruyere', 'shallot', 'creme fraiche', 'bechamel', 'dijon'],
+}
+CUISINE_MATCHER = KeywordMatcher(hint for hints in CUISINE_HINTS.values() for hint in hints)
+
+# Ceiling for recipes without a title; below any sensible LOCAL_PARSER_MIN_CONFIDENCE
+UNTITLED_MAX_CONFIDENCE = 0.5
+
+INGREDIENT_HEADER = re.compile(r'^\s*(?:ingredients?|what you(?:\'ll)? need)\s*:?\s*(.*)$', re.IGNORECASE)
+INSTRUCTION_HEADER = re.compile(
+    r'^\s*(?:instructions?|directions?|method|steps|preparation)\s*:?\s*(.*)$', re.IGNORECASE)
+OTHER_HEADER = re.compile(r'^\s*(?:notes?|tips?|serves|servings|yield|prep time|cook time|total time)\b.*:',
+                          re.IGNORECASE)
+CUISINE_LINE = re.compile(r'^\s*cuisine\s*:\s*(.+)$', re.IGNORECASE)
+NAME_PREFIX = re.compile(r'^\s*(?:recipe(?:\s+name)?|title|name)\s*:\s*', re.IGNORECASE)
+
+BULLET = re.compile(r'^\s*(?:[-*•·▪◦]|\d+[.)]|step\s*\d+\s*[:.)-]?)\s*', re.IGNORECASE)
+
+# Extra noise that shows up in hand-written ingredient lines
+LEADING_QUANTITY = re.compile(r'^[\d\s./½¼¾⅓⅔-]+')
+PARENTHETICAL = re.compile(r'\s*\([^)]*\)')
+TO_TASTE = re.compile(r'\s*(?:to taste|as needed|for serving|optional)\s*$', re.IGNORECASE)
+CONJUNCTION = re.compile(r'\s+and\s+|\s*&\s*')
+DIGIT = re.compile(r'\d')
+
+
+def _split_ingredient_line(line: str) -> List[str]:
+    """Turn one written ingredient line into zero or more ingredient names"""
+    line = PARENTHETICAL.sub('', line)
+    line = TO_TASTE.sub('', line)
+    line = LEADING_QUANTITY.sub('', line).strip()
+    line = strip_leading_measure(line)
+    name = clean_ingredient_name(line)
+    if not name or is_category_header(name):
+        return []
+    # "Salt and black pepper" is two seasonings; "pancetta or bacon" stays one
+    parts = [part.strip() for part in CONJUNCTION.split(name) if part.strip()]
+    if len(parts) > 1 and all(is_seasoning(part) for part in parts):
+        return parts
+    return [name]
+
+
+def _guess_cuisine(text: str) -> Optional[str]:
+    found = CUISINE_MATCHER.find(text.lower())
+    scores = {cuisine: sum(1 for hint in hints if hint in found)
+              for cuisine, hints in CUISINE_HINTS.items()}
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else None
+
+
+def _split_sections(lines: List[str]) -> Tuple[List[str], List[str], List[str], bool, bool]:
+    """Split lines into (preamble, ingredient lines, instruction lines, saw ingredients, saw instructions)"""
+    preamble, ingredients, instructions = [], [], []
+    saw_ingredients = saw_instructions = False
+    current = preamble
+    for line in lines:
+        match = INGREDIENT_HEADER.match(line)
+        if match:
+            saw_ingredients, current = True, ingredients
+            inline = match.group(1).strip()
+            if inline:
+                # "Ingredients: flour, milk, egg"
+                ingredients.extend(part for part in inline.split(',') if part.strip())
+            continue
+        match = INSTRUCTION_HEADER.match(line)
+        if match:
+            saw_instructions, current = True, instructions
+            if match.group(1).strip():
+                instructions.append(match.group(1))
+            continue
+        if OTHER_HEADER.match(line) and current is not preamble:
+            current = []  # ignore notes/servings blocks
+            continue
+        current.append(line)
+    return preamble, ingredients, instructions, saw_ingredients, saw_instructions
+
+
+def parse_recipe_text(recipe_text: str) -> Tuple[Optional[Dict], float]:
+    """
+    Parse a structured recipe without the LLM
+
+    Returns:
+        (recipe, confidence) where recipe has the same shape as the OpenAI
+        parser's output and confidence is in [0, 1]; (None, 0.0) when the text
+        has no recognizable ingredient section
+    """
+    lines = [line.strip() for line in recipe_text.splitlines() if line.strip()]
+    preamble, ingredient_lines, instruction_lines, saw_ingredients, saw_instructions = _split_sections(lines)
+    if not saw_ingredients or not ingredient_lines:
+        return None, 0.0
+
+    cuisine = None
+    name = ""
+    for line in preamble:
+        match = CUISINE_LINE.match(line)
+        if match:
+            declared = match.group(1).strip().upper()
+            cuisine = declared if declared in CUISINES else "OTHER"
+        elif not name:
+            name = NAME_PREFIX.sub('', line).strip().rstrip(':')
+
+    ingredients = []
+    seen = set()
+    clean_lines = 0
+    for line in ingredient_lines:
+        names = _split_ingredient_line(BULLET.sub('', line))
+        if names and all(len(n.split()) <= 4 and not DIGIT.search(n) for n in names):
+            clean_lines += 1
+        for ingredient in names:
+            if normalize_name(ingredient) in seen:
+                continue
+            seen.add(normalize_name(ingredient))
+            ingredients.append({
+                "name": ingredient,
+                "quantity": "1",
+                "isSeasoning": is_seasoning(ingredient)
+            })
+
+    instructions = [BULLET.sub('', line).strip() for line in instruction_lines]
+    instructions = [step for step in instructions if step]
+
+    # Confidence: structure found + how cleanly ingredient lines reduced to names
+    confidence = 0.0
+    confidence += 0.2 if name and len(name.split()) <= 8 else 0.0
+    confidence += 0.3 if len(ingredients) >= 2 else 0.1
+    confidence += 0.2 if saw_instructions and instructions else 0.0
+    confidence += 0.3 * (clean_lines / len(ingredient_lines))
+    # Long unstructured preamble (stories, multiple candidate titles) lowers trust
+    if len(preamble) > 3:
+        confidence -= 0.1
+    # A recipe cannot be saved without a name, so an untitled one always goes to the LLM
+    if not name:
+        confidence = min(confidence, UNTITLED_MAX_CONFIDENCE)
+
+    recipe = {
+        "name": name,
+        "cuisine": cuisine or _guess_cuisine(recipe_text) or "OTHER",
+        "ingredients": ingredients,
+        "instructions": instructions,
+    }
+    return recipe, round(max(0.0, min(1.0, confidence)), 2)
@@ -0,0 +1,158 @@
+"""
+Logging Config - Leveled, structured logging for the AI service
+
+Environment:
+    LOG_LEVEL              Root level (default INFO)
+    LOG_FORMAT             "text" (default) or "json" (one object per line)
+    LOG_ASYNC              Hand records to a background thread so request
+                           threads never block on stdout (default true)
+    LOG_DEBUG_SAMPLE_RATE  Fraction of requests whose DEBUG lines are kept (default 1.0)
+    LOG_PAYLOADS           Dump request bodies and raw model output (default false)
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+import zlib
+from typing import Optional
+
+# Request bodies and raw model responses go to this logger; it stays silent
+# unless LOG_PAYLOADS is set, whatever LOG_LEVEL says
+PAYLOAD_LOGGER = "smartfridge.payloads"
+
+QUEUE_SIZE = 10000
+
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_listener = None
+_configured_pid = None
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ("1", "true", "yes")
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """Use the caller's X-Request-ID (if sane) or mint one, and bind it to this context"""
+    request_id = incoming if incoming and len(incoming) <= 64 else uuid.uuid4().hex[:16]
+    request_id_var.set(request_id)
+    return request_id
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp every record with the request ID of the context that logged it"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """
+    Keep DEBUG records for a sample of requests only
+
+    The decision is a hash of the request ID, so a sampled request keeps all
+    of its debug lines and an unsampled one keeps none.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.threshold = int(max(0.0, min(1.0, rate)) * 10000)
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.threshold >= 10000:
+            return True
+        request_id = getattr(record, "request_id", "-")
+        if request_id == "-":
+            return random.randrange(10000) < self.threshold
+        return zlib.crc32(request_id.encode()) % 10000 < self.threshold
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, request_id, msg, extras, exc"""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Unlike the base class, do not format here: the message and traceback
+        # are rendered by the listener thread, and exc_info survives for
+        # JsonFormatter's "exc" field. Log arguments are formatted late, so
+        # callers must not mutate them after logging.
+        return copy.copy(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+def configure_logging():
+    """Install the root handler once per process (safe to call repeatedly and after fork)"""
+    global _listener, _configured_pid
+    if _configured_pid == os.getpid():
+        return
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    level = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if os.environ.get("LOG_FORMAT", "text").lower() == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+
+    if _env_flag("LOG_ASYNC", "true"):
+        handler = DroppingQueueHandler(queue.Queue(QUEUE_SIZE))
+        _listener = logging.handlers.QueueListener(handler.queue, stream_handler)
+        _listener.start()
+    else:
+        handler = stream_handler
+    # Handler filters run on the thread that logged, before the record is queued,
+    # so the request context is still current
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSampler(float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "1.0"))))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+    logging.getLogger(PAYLOAD_LOGGER).setLevel(
+        logging.DEBUG if _env_flag("LOG_PAYLOADS", "false") else logging.CRITICAL + 1)
+    _configured_pid = os.getpid()
+
+
+@atexit.register
+def _flush_queue():
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
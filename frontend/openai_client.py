@@ -2,17 +2,63 @@
 OpenAI Client - Interface for OpenAI API (replaces Ollama)
 """
 import os
+import asyncio
+import concurrent.futures
+import contextvars
 import json
-import re
-from typing import Dict, List, Optional
-from openai import OpenAI
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
+from prometheus_client import Counter, Gauge, Histogram
+
+from circuit_breaker import CircuitBreaker
+from ingredient_normalizer import clean_ingredient_name, is_category_header, is_seasoning
+from json_stream import IncrementalJSONScanner
+from logging_config import PAYLOAD_LOGGER, request_id_var
+from local_recipe_parser import parse_recipe_text
+from rate_limiter import RateLimiter, RateLimitTimeout
+from retry_policy import LatencyTracker, RetryPolicy, error_class, is_retryable
+
+logger = logging.getLogger(__name__)
+payload_log = logging.getLogger(PAYLOAD_LOGGER)
+
+OPENAI_LATENCY = Histogram(
+    "openai_request_duration_seconds", "Duration of individual OpenAI requests (each retry/hedge counts)",
+    ["operation", "outcome"], buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 45, 60, 90))
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total", "Tokens reported by OpenAI usage", ["kind"])
+OPENAI_ERRORS = Counter(
+    "openai_errors_total", "Failed OpenAI requests by error class", ["error"])
+OPENAI_IN_FLIGHT = Gauge(
+    "openai_requests_in_flight", "OpenAI requests currently open", multiprocess_mode="livesum")
+RECIPE_PARSE_PATH = Counter(
+    "recipe_parse_total", "Recipe parses by how the result was obtained",
+    ["path"])  # local, json, json_block, code_block, failed
+
+# Per run_async() call: whether a request actually went out, so a deadline that
+# expires while still queued locally is not blamed on OpenAI
+_call_state = contextvars.ContextVar("openai_call_state", default=None)
+
+
+def _mark_sent():
+    state = _call_state.get()
+    if state is not None:
+        state["sent"] = True
+
 
 # Load .env from project root or current dir
 load_dotenv()
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 
+class RequestCancelled(Exception):
+    """Raised when an in-flight OpenAI call is abandoned (e.g. the HTTP client went away)"""
+
+
 class OpenAIClient:
     """Client for interacting with OpenAI API"""
 
@@ -21,53 +67,392 @@ class OpenAIClient:
         self.chat_model = os.environ.get("OPENAI_CHAT_MODEL", "gpt-4o-mini")
         self.client = OpenAI(api_key=self.api_key)
 
+        # Availability is probed in the background; request handlers only read state
+        self.availability_refresh_interval = float(os.environ.get("OPENAI_AVAILABILITY_REFRESH_SECONDS", "30"))
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.environ.get("OPENAI_BREAKER_FAILURE_THRESHOLD", "3")),
+            reset_timeout=float(os.environ.get("OPENAI_BREAKER_RESET_SECONDS", "30")),
+        )
+        self._refresher_pid = None
+        self._refresher_lock = threading.Lock()
+
+        # Async path: one event loop per process multiplexes every in-flight
+        # completion; a semaphore bounds how many are outstanding at once
+        self.max_concurrency = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "32"))
+        self.request_timeout = float(os.environ.get("OPENAI_REQUEST_TIMEOUT", "90"))
+        self._loop = None
+        self._loop_pid = None
+        self._loop_lock = threading.Lock()
+        self.async_client = None
+        self._semaphore = None
+
+        # The configured budgets are for the whole service; each of the
+        # OPENAI_RATE_LIMIT_PROCESSES worker processes (set by gunicorn.conf.py)
+        # gets an equal share. Callers queue (interactive first) instead of hitting 429s
+        processes = max(1, int(os.environ.get("OPENAI_RATE_LIMIT_PROCESSES", "1")))
+        self.limiter = RateLimiter(
+            requests_per_minute=float(os.environ.get("OPENAI_REQUESTS_PER_MINUTE", "500")) / processes,
+            tokens_per_minute=float(os.environ.get("OPENAI_TOKENS_PER_MINUTE", "200000")) / processes,
+            max_wait={
+                RateLimiter.INTERACTIVE: float(os.environ.get("OPENAI_QUEUE_MAX_WAIT_INTERACTIVE", "15")),
+                RateLimiter.BULK: float(os.environ.get("OPENAI_QUEUE_MAX_WAIT_BULK", "60")),
+            },
+        )
+
+        # Transient failures are retried here (the SDK's own retries are off);
+        # hedging duplicates a slow call once it passes the observed p95
+        self.retry_policy = RetryPolicy(
+            max_attempts=int(os.environ.get("OPENAI_MAX_ATTEMPTS", "4")),
+            base_delay=float(os.environ.get("OPENAI_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.environ.get("OPENAI_RETRY_MAX_DELAY", "8")),
+            attempt_timeout=float(os.environ.get("OPENAI_ATTEMPT_TIMEOUT", "45")),
+        )
+        self.hedging_enabled = os.environ.get("OPENAI_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.hedge_percentile = float(os.environ.get("OPENAI_HEDGE_PERCENTILE", "95"))
+        self.latency = {RateLimiter.INTERACTIVE: LatencyTracker(), RateLimiter.BULK: LatencyTracker()}
+
+        # Structured recipes are parsed locally; only low-confidence ones go to the model
+        self.local_parse_min_confidence = float(os.environ.get("LOCAL_PARSER_MIN_CONFIDENCE", "0.8"))
+
     def is_available(self) -> bool:
-        """Check if OpenAI API is reachable"""
+        """
+        Check if OpenAI API is usable (O(1) read of background-refreshed state)
+
+        Half-open counts as unavailable: the background refresher sends the one
+        probe allow_request() admits, and user traffic resumes once it closes
+        the circuit.
+        """
+        self._ensure_refresher()
+        return self.breaker.state == CircuitBreaker.CLOSED
+
+    def _probe(self) -> bool:
+        """One remote health check; feeds the circuit breaker"""
         try:
             self.client.models.list()
-            return True
         except Exception:
+            self.breaker.record_failure()
             return False
-
-    def generate(self, prompt: str, format_json: bool = False) -> str:
+        self.breaker.record_success()
+        return True
+
+    def _ensure_refresher(self):
+        """Start the background availability refresher (again after a fork)"""
+        if self._refresher_pid == os.getpid():
+            return
+        with self._refresher_lock:
+            if self._refresher_pid == os.getpid():
+                return
+            # Probe synchronously once so the first answer is real
+            if not self._probe():
+                self.breaker.trip()
+            thread = threading.Thread(target=self._refresh_loop, name="openai-availability", daemon=True)
+            thread.start()
+            self._refresher_pid = os.getpid()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.availability_refresh_interval)
+            # When open, allow_request() only lets a probe through once the
+            # reset timeout has passed (half-open)
+            if self.breaker.allow_request():
+                self._probe()
+
+    def generate(self, prompt: str, format_json: bool = False, priority: int = RateLimiter.BULK) -> str:
         """
         Generate text using OpenAI Chat Completions API
 
+        Runs on the shared async path so it goes through the same rate limiter.
+
         Args:
             prompt: The prompt to send to the model
             format_json: If True, request JSON formatted response
+            priority: RateLimiter.INTERACTIVE or RateLimiter.BULK
 
         Returns:
-            Generated text response
+            Generated text response (None on failure)
+
+        Raises:
+            RateLimitTimeout: no rate-limit capacity within the allowed wait
         """
-        try:
-            kwargs = {
-                "model": self.chat_model,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 2048,
-            }
+        return self.generate_async(prompt, format_json=format_json, priority=priority)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop and async client (again after a fork)"""
+        if self._loop_pid == os.getpid():
+            return self._loop
+        with self._loop_lock:
+            if self._loop_pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="openai-async", daemon=True)
+                thread.start()
+                self.async_client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._loop = loop
+                self._loop_pid = os.getpid()
+        return self._loop
+
+    def _record_usage(self, usage, reserved: int):
+        """Export token usage and hand the unused part of the reservation back to the limiter"""
+        if usage is None or not usage.total_tokens:
+            return
+        OPENAI_TOKENS.labels("prompt").inc(usage.prompt_tokens or 0)
+        OPENAI_TOKENS.labels("completion").inc(usage.completion_tokens or 0)
+        self.limiter.release_unused(reserved - usage.total_tokens)
+
+    @staticmethod
+    def _estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """Rough token reservation for the rate limiter (~4 chars per token + full completion)"""
+        return len(prompt) // 4 + max_tokens
+
+    async def agenerate(self, prompt: str, format_json: bool = False, priority: int = RateLimiter.BULK,
+                        timeout: float = None, hedge: bool = False) -> str:
+        """
+        Async variant of generate(); must run on the client's event loop (see run_async)
+
+        Args:
+            timeout: Overall deadline including retries (defaults to request_timeout)
+            hedge: Allow a duplicate request once this call is slower than the
+                   usual p95 (only if OPENAI_HEDGE_ENABLED)
 
-            if format_json:
-                kwargs["response_format"] = {"type": "json_object"}
+        Returns:
+            Generated text response, or None on failure
 
-            response = self.client.chat.completions.create(**kwargs)
-            return response.choices[0].message.content or ""
+        Raises:
+            RateLimitTimeout: no rate-limit capacity within the allowed wait
+        """
+        kwargs = {
+            "model": self.chat_model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 2048,
+        }
+        if format_json:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        reserved = self._estimate_tokens(prompt, kwargs["max_tokens"])
+        tracker = self.latency[priority]
+
+        async def attempt():
+            # Every attempt (retry or hedge) is a real request and needs budget
+            await self.limiter.acquire(reserved, priority)
+            async with self._semaphore:
+                _mark_sent()
+                started = time.monotonic()
+                OPENAI_IN_FLIGHT.inc()
+                try:
+                    response = await self.async_client.chat.completions.create(**kwargs)
+                except asyncio.CancelledError:
+                    self.limiter.release_unused(reserved)
+                    OPENAI_LATENCY.labels("completion", "cancelled").observe(time.monotonic() - started)
+                    raise
+                except Exception as e:
+                    self.limiter.release_unused(reserved)
+                    OPENAI_LATENCY.labels("completion", "error").observe(time.monotonic() - started)
+                    OPENAI_ERRORS.labels(error_class(e)).inc()
+                    raise
+                finally:
+                    OPENAI_IN_FLIGHT.dec()
+            elapsed = time.monotonic() - started
+            tracker.record(elapsed)
+            OPENAI_LATENCY.labels("completion", "ok").observe(elapsed)
+            self._record_usage(getattr(response, "usage", None), reserved)
+            return response
+
+        def on_retry(attempt_number, error, delay):
+            logger.warning("OpenAI attempt %s failed (%s); retrying in %.2fs", attempt_number, error, delay)
+
+        hedge_after = tracker.percentile(self.hedge_percentile) if hedge and self.hedging_enabled else None
+        deadline = time.monotonic() + (self.request_timeout if timeout is None else timeout)
 
+        try:
+            response = await self.retry_policy.run(attempt, deadline, hedge_after=hedge_after, on_retry=on_retry)
+        except asyncio.CancelledError:
+            # Abandoned by the caller, not an upstream failure
+            raise
         except Exception as e:
-            print(f"[ERROR] Error calling OpenAI: {e}")
+            logger.error("Error calling OpenAI: %s", e)
+            # Caller errors (bad request, auth, rate-limit queue) say nothing about OpenAI's health
+            if is_retryable(e):
+                self.breaker.record_failure()
+            if isinstance(e, RateLimitTimeout):
+                raise
             return None
 
-    def parse_recipe(self, recipe_text: str) -> Optional[Dict]:
+        self.breaker.record_success()
+        return response.choices[0].message.content or ""
+
+    def run_async(self, coro, timeout: float = None, should_cancel: Callable[[], bool] = None,
+                  poll_interval: float = 0.25):
         """
-        Parse recipe text using OpenAI
+        Run a coroutine on the shared event loop and wait for its result
 
-        Args:
-            recipe_text: Raw recipe text to parse
+        The call is cancelled once the deadline passes (returns None, or raises
+        RateLimitTimeout if it never got past the local rate-limit and
+        concurrency queues) or as soon as should_cancel() returns True (raises
+        RequestCancelled); the caller's thread only waits, the I/O itself
+        happens on the loop.
+        """
+        loop = self._ensure_loop()
+        timeout = self.request_timeout if timeout is None else timeout
+        request_id = request_id_var.get()
+        state = {"sent": False}
 
-        Returns:
-            Dictionary with parsed recipe data or None if parsing failed
+        async def with_deadline():
+            request_id_var.set(request_id)  # tasks run in the loop thread's context
+            _call_state.set(state)
+            return await asyncio.wait_for(coro, timeout)
+
+        future = asyncio.run_coroutine_threadsafe(with_deadline(), loop)
+        try:
+            while not future.done():
+                concurrent.futures.wait([future], timeout=poll_interval)
+                if not future.done() and should_cancel is not None and should_cancel():
+                    raise RequestCancelled("Client disconnected")
+            return future.result()
+        except (asyncio.TimeoutError, TimeoutError):
+            if not state["sent"]:
+                # Throttled locally; OpenAI itself was never asked
+                raise RateLimitTimeout(f"OpenAI rate limit: no capacity within {timeout:.0f}s",
+                                       retry_after=1.0) from None
+            logger.error("OpenAI call exceeded its %ss deadline", timeout)
+            self.breaker.record_failure()
+            return None
+        finally:
+            # Covers deadline, disconnect, and GeneratorExit from a closed response
+            future.cancel()
+
+    def generate_async(self, prompt: str, format_json: bool = False, timeout: float = None,
+                       should_cancel: Callable[[], bool] = None, priority: int = RateLimiter.BULK) -> str:
+        """Blocking wrapper over agenerate() with a deadline and cancellation hook"""
+        return self.run_async(self.agenerate(prompt, format_json=format_json, priority=priority, timeout=timeout),
+                              timeout=timeout, should_cancel=should_cancel)
+
+    async def astream(self, prompt: str, format_json: bool = False, priority: int = RateLimiter.BULK,
+                      timeout: float = None):
         """
-        prompt = f"""You are a recipe ingredient extractor. Parse the recipe below and extract ALL ingredients.
+        Async generator over the completion's text deltas
+
+        Opening the stream is retried like agenerate(); once tokens have been
+        delivered a failure is raised to the caller instead of starting over.
+        """
+        kwargs = {
+            "model": self.chat_model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 2048,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        if format_json:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        reserved = self._estimate_tokens(prompt, kwargs["max_tokens"])
+        deadline = time.monotonic() + (self.request_timeout if timeout is None else timeout)
+
+        started = None
+
+        async def open_stream():
+            # Wait for rate-limit budget before taking a concurrency slot, like
+            # agenerate(); a successfully opened stream keeps its slot (and stays
+            # counted in flight) until closed
+            nonlocal started
+            await self.limiter.acquire(reserved, priority)
+            await self._semaphore.acquire()
+            _mark_sent()
+            started = time.monotonic()
+            OPENAI_IN_FLIGHT.inc()
+            try:
+                return await self.async_client.chat.completions.create(**kwargs)
+            except asyncio.CancelledError:
+                self._semaphore.release()
+                self.limiter.release_unused(reserved)
+                OPENAI_IN_FLIGHT.dec()
+                OPENAI_LATENCY.labels("stream", "cancelled").observe(time.monotonic() - started)
+                raise
+            except Exception as e:
+                self._semaphore.release()
+                self.limiter.release_unused(reserved)
+                OPENAI_IN_FLIGHT.dec()
+                OPENAI_LATENCY.labels("stream", "error").observe(time.monotonic() - started)
+                OPENAI_ERRORS.labels(error_class(e)).inc()
+                raise
+
+        stream = None
+        outcome = "error"
+        try:
+            stream = await self.retry_policy.run(open_stream, deadline)
+            async for chunk in stream:
+                self._record_usage(getattr(chunk, "usage", None), reserved)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            outcome = "ok"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            logger.error("Error streaming from OpenAI: %s", e)
+            if stream is not None:
+                OPENAI_ERRORS.labels(error_class(e)).inc()  # failures while opening are counted above
+            if is_retryable(e):
+                self.breaker.record_failure()
+            raise
+        finally:
+            # Failed opens are measured and released inside open_stream()
+            if stream is not None:
+                OPENAI_IN_FLIGHT.dec()
+                OPENAI_LATENCY.labels("stream", outcome).observe(time.monotonic() - started)
+                try:
+                    await stream.close()
+                finally:
+                    self._semaphore.release()
+        self.breaker.record_success()
+
+    def stream_async(self, agen, timeout: float = None, should_cancel: Callable[[], bool] = None,
+                     poll_interval: float = 0.25) -> Iterator:
+        """
+        Iterate an async generator running on the shared loop from a sync thread
+
+        Closing this generator early (e.g. the WSGI server closing a streamed
+        response after a disconnect raises GeneratorExit here) cancels the
+        upstream call, as do the deadline and should_cancel().
+        """
+        loop = self._ensure_loop()
+        timeout = self.request_timeout if timeout is None else timeout
+        items = queue.Queue()
+        end = object()
+        request_id = request_id_var.get()
+
+        async def pump():
+            request_id_var.set(request_id)
+            try:
+                async for item in agen:
+                    items.put(item)
+            finally:
+                items.put(end)  # wake the consumer now rather than at its next poll
+
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(pump(), timeout), loop)
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=poll_interval)
+                except queue.Empty:
+                    if future.done():
+                        if items.empty():
+                            future.result()  # re-raise the pump's error, if any
+                            return
+                        continue
+                    if should_cancel is not None and should_cancel():
+                        raise RequestCancelled("Client disconnected")
+                    continue
+                if item is end:
+                    concurrent.futures.wait([future])
+                    future.result()  # re-raise the pump's error, if any
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    def build_parse_prompt(self, recipe_text: str) -> str:
+        """Prompt used to turn free-form recipe text into structured JSON"""
+        return f"""You are a recipe ingredient extractor. Parse the recipe below and extract ALL ingredients.
 
 RECIPE TEXT:
 \"\"\"
@@ -96,20 +481,135 @@ RULES:
 
 Return ONLY valid JSON."""
 
-        print(f"[DEBUG] Sending recipe to OpenAI...")
-        response = self.generate(prompt, format_json=True)
+    def parse_recipe_locally(self, recipe_text: str) -> Optional[Dict]:
+        """Rule-based parse; returns the recipe only if confident enough to skip the LLM"""
+        recipe, confidence = parse_recipe_text(recipe_text)
+        if recipe is not None and recipe["name"] and confidence >= self.local_parse_min_confidence:
+            logger.debug("Parsed recipe locally (confidence %s)", confidence)
+            RECIPE_PARSE_PATH.labels("local").inc()
+            return recipe
+        logger.debug("Local parse confidence %s below %s, using OpenAI", confidence, self.local_parse_min_confidence)
+        return None
 
+    def parse_recipe(self, recipe_text: str) -> Optional[Dict]:
+        """
+        Parse recipe text (locally when it is well structured, otherwise with OpenAI)
+
+        Args:
+            recipe_text: Raw recipe text to parse
+
+        Returns:
+            Dictionary with parsed recipe data or None if parsing failed
+        """
+        local = self.parse_recipe_locally(recipe_text)
+        if local is not None:
+            return local
+
+        logger.debug("Sending recipe to OpenAI...")
+        response = self.generate(self.build_parse_prompt(recipe_text), format_json=True)
+        return self.postprocess_parse_response(response)
+
+    async def aparse_recipe(self, recipe_text: str, timeout: float = None, try_local: bool = True) -> Optional[Dict]:
+        """Async variant of parse_recipe(); run it with run_async()"""
+        if try_local:
+            local = self.parse_recipe_locally(recipe_text)
+            if local is not None:
+                return local
+
+        logger.debug("Sending recipe to OpenAI (async)...")
+        response = await self.agenerate(self.build_parse_prompt(recipe_text), format_json=True,
+                                        priority=RateLimiter.BULK, timeout=timeout, hedge=True)
+        return self.postprocess_parse_response(response)
+
+    @staticmethod
+    def clean_ingredient(ing) -> Optional[Dict]:
+        """Normalize one parsed ingredient; None for category headers and junk"""
+        # Handle plain string ingredients
+        if isinstance(ing, str):
+            ing = {"name": ing, "quantity": "1", "isSeasoning": False}
+        elif not isinstance(ing, dict):
+            return None
+
+        # 1. Clean ingredient name - remove quantities/units
+        name = clean_ingredient_name(ing.get("name", ""))
+
+        if not name or is_category_header(name):
+            return None  # Skip category headers
+
+        # 2. Set quantity to "1" always (simplified), 3. determine if seasoning
+        return {
+            "name": name,
+            "quantity": "1",
+            "isSeasoning": is_seasoning(name, ing.get("isSeasoning", False))
+        }
+
+    @staticmethod
+    def recipe_events(recipe: Dict) -> Iterator:
+        """Replay an already parsed recipe as parse_recipe_stream() events"""
+        yield "name", recipe.get("name", "")
+        yield "cuisine", recipe.get("cuisine", "OTHER")
+        for ing in recipe.get("ingredients", []):
+            yield "ingredient", ing
+        for step in recipe.get("instructions", []):
+            yield "instruction", step
+        yield "done", recipe
+
+    def parse_recipe_stream(self, recipe_text: str, should_cancel: Callable[[], bool] = None,
+                            try_local: bool = True) -> Iterator:
+        """
+        Parse recipe text while the completion streams in
+
+        Yields (event, value) pairs: "name" and "cuisine" once their strings are
+        complete, one "ingredient" (cleaned) or "instruction" per array element,
+        and finally ("done", recipe) with the fully post-processed recipe (None
+        if the final answer could not be parsed).
+        """
+        if try_local:
+            local = self.parse_recipe_locally(recipe_text)
+            if local is not None:
+                yield from self.recipe_events(local)
+                return
+
+        scanner = IncrementalJSONScanner()
+        deltas = self.stream_async(
+            self.astream(self.build_parse_prompt(recipe_text), format_json=True, priority=RateLimiter.BULK),
+            should_cancel=should_cancel)
+
+        for delta in deltas:
+            for kind, key, value in scanner.feed(delta):
+                if kind == "field" and key in ("name", "recipe name"):
+                    yield "name", value
+                elif kind == "field" and key == "cuisine":
+                    yield "cuisine", value
+                elif kind == "item" and key == "ingredients":
+                    # Handle nested "ingredients" arrays (malformed response)
+                    if isinstance(value, dict) and isinstance(value.get("ingredients"), list):
+                        nested = value["ingredients"]
+                    else:
+                        nested = [value]
+                    for ing in nested:
+                        cleaned = self.clean_ingredient(ing)
+                        if cleaned is not None:
+                            yield "ingredient", cleaned
+                elif kind == "item" and key == "instructions":
+                    yield "instruction", value
+
+        yield "done", self.postprocess_parse_response(scanner.buffer)
+
+    def postprocess_parse_response(self, response: Optional[str]) -> Optional[Dict]:
+        """Turn the model's raw answer into a cleaned recipe dict (None if unusable)"""
         if not response:
-            print(f"[ERROR] OpenAI returned no response")
+            logger.error("OpenAI returned no response")
+            RECIPE_PARSE_PATH.labels("failed").inc()
             return None
 
-        print(f"[DEBUG] Received response: {response}")
+        payload_log.debug("Received response: %s", response)
 
         if response:
             try:
                 # Try to parse JSON directly
                 parsed = json.loads(response)
-                print(f"[SUCCESS] Parsed JSON successfully")
+                logger.debug("Parsed JSON successfully")
 
                 # Fix recipe name field (handle both "name" and "recipe name")
                 if "recipe name" in parsed and "name" not in parsed:
@@ -127,85 +627,44 @@ Return ONLY valid JSON."""
                             flat_ingredients.append(ing)
 
                     # Now clean each ingredient
-                    cleaned = []
-                    for ing in flat_ingredients:
-                        # Handle plain string ingredients
-                        if isinstance(ing, str):
-                            ing = {"name": ing, "quantity": "1", "isSeasoning": False}
-                        elif not isinstance(ing, dict):
-                            continue
-
-                        # 1. Clean ingredient name - remove quantities/units
-                        name = str(ing.get("name", "")).strip()
-
-                        # Remove patterns like "500g", "2 tbsp", numbers at end
-                        name = re.sub(
-                            r'\s*\d+\.?\d*\s*(g|kg|ml|l|cup|cups|tbsp|tsp|oz|lb|gram|liter|ounce|pound|tablespoon|teaspoon|piece|pieces|small|large|handful)s?\b',
-                            '', name, flags=re.IGNORECASE)
-                        name = re.sub(r'\s*\d+\.?\d*/?\d*\s*$', '', name)  # Remove trailing fractions/numbers
-                        name = re.sub(r'^\d+\.?\d*\s*', '', name)  # Remove leading numbers
-                        name = re.sub(r'\s*,.*$', '', name)  # Remove trailing commas and text after
-                        name = name.strip()
-
-                        if not name or name.lower() in ['spices', 'aromatics', 'spices and aromatics']:
-                            continue  # Skip category headers
-
-                        # 2. Set quantity to "1" always (simplified)
-                        qty = "1"
-
-                        # 3. Determine if seasoning
-                        seasoning_keywords = ['salt', 'pepper', 'sugar', 'oil', 'sauce', 'vinegar',
-                                              'spice', 'cumin', 'paprika', 'oregano', 'basil', 'thyme',
-                                              'bay leaf', 'star anise', 'cinnamon', 'clove', 'ginger',
-                                              'peppercorn', 'fennel', 'paste', 'fermented', 'peanut butter']
-                        is_seas = ing.get("isSeasoning", False)
-                        if isinstance(is_seas, str):
-                            is_seas = is_seas.lower() in ['true', '1', 'yes']
-
-                        # Auto-detect seasonings from name
-                        name_lower = name.lower()
-                        if any(kw in name_lower for kw in seasoning_keywords):
-                            is_seas = True
-
-                        cleaned.append({
-                            "name": name,
-                            "quantity": qty,
-                            "isSeasoning": bool(is_seas)
-                        })
-
-                    parsed["ingredients"] = cleaned
-
-                print(f"[DEBUG] Processed {len(parsed.get('ingredients', []))} ingredients")
+                    cleaned = [self.clean_ingredient(ing) for ing in flat_ingredients]
+                    parsed["ingredients"] = [ing for ing in cleaned if ing is not None]
+
+                logger.debug("Processed %s ingredients", len(parsed.get('ingredients', [])))
+                RECIPE_PARSE_PATH.labels("json").inc()
                 return parsed
             except json.JSONDecodeError as e:
-                print(f"[WARNING] Direct JSON parse failed: {e}")
+                logger.warning("Direct JSON parse failed: %s", e)
 
                 # If response has markdown code blocks, try to extract JSON
                 if "```json" in response:
-                    print(f"[DEBUG] Attempting to extract from ```json block")
+                    logger.debug("Attempting to extract from ```json block")
                     start = response.find("```json") + 7
                     end = response.find("```", start)
                     json_str = response[start:end].strip()
                     try:
                         parsed = json.loads(json_str)
-                        print(f"[SUCCESS] Extracted JSON from markdown block")
+                        logger.info("Extracted JSON from markdown block")
+                        RECIPE_PARSE_PATH.labels("json_block").inc()
                         return parsed
                     except json.JSONDecodeError as e2:
-                        print(f"[ERROR] Failed to parse extracted JSON: {e2}")
+                        logger.error("Failed to parse extracted JSON: %s", e2)
                 elif "```" in response:
-                    print(f"[DEBUG] Attempting to extract from ``` block")
+                    logger.debug("Attempting to extract from ``` block")
                     start = response.find("```") + 3
                     end = response.find("```", start)
                     json_str = response[start:end].strip()
                     try:
                         parsed = json.loads(json_str)
-                        print(f"[SUCCESS] Extracted JSON from code block")
+                        logger.info("Extracted JSON from code block")
+                        RECIPE_PARSE_PATH.labels("code_block").inc()
                         return parsed
                     except json.JSONDecodeError as e2:
-                        print(f"[ERROR] Failed to parse extracted JSON: {e2}")
+                        logger.error("Failed to parse extracted JSON: %s", e2)
 
-                print(f"[ERROR] Could not extract valid JSON. Full response:")
-                print(response)
+                logger.error("Could not extract valid JSON from the response")
+                payload_log.debug("Full response: %s", response)
+                RECIPE_PARSE_PATH.labels("failed").inc()
                 return None
 
         return None
@@ -0,0 +1,168 @@
+"""
+Rate Limiter - Request/token budgets and a priority queue in front of OpenAI
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+QUEUE_DEPTH = Gauge(
+    "openai_queue_depth", "OpenAI calls waiting for rate-limit capacity", ["priority"],
+    multiprocess_mode="livesum")
+QUEUE_WAIT = Histogram(
+    "openai_queue_wait_seconds", "Time OpenAI calls spent waiting for rate-limit capacity", ["priority"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60))
+QUEUE_REJECTED = Counter(
+    "openai_queue_rejected_total", "OpenAI calls that gave up waiting for capacity", ["priority"])
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call could not get capacity within its maximum wait"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Budget of `per_minute` units, refilled continuously; bursts up to one minute's worth"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)"""
+        self._refill()
+        missing = min(amount, self.capacity) - self._level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self._level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float):
+        """Return over-estimated units (e.g. when actual token usage was lower)"""
+        self._refill()
+        self._level = min(self.capacity, self._level + amount)
+
+
+class RateLimiter:
+    """
+    Scheduler that admits OpenAI calls within per-minute request and token budgets
+
+    Callers that cannot be admitted right away wait in a priority queue
+    (INTERACTIVE before BULK, FIFO within a priority) for at most max_wait
+    seconds, after which RateLimitTimeout is raised. All methods except
+    queue_depth() must run on one event loop (the OpenAI client's background
+    loop); queue_depth() reads a snapshot and is safe from any thread.
+    """
+
+    INTERACTIVE = 0
+    BULK = 1
+    PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk"}
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_wait: dict = None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_wait = max_wait or {self.INTERACTIVE: 15.0, self.BULK: 60.0}
+        self._waiters = []  # heap of (priority, seq, tokens, future)
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._depth_lock = threading.Lock()
+        self._depth = {}
+        self._update_depth()
+
+    async def acquire(self, tokens: int, priority: int = BULK, max_wait: float = None):
+        """Wait until one request and `tokens` tokens fit in the budget, then consume them"""
+        name = self.PRIORITY_NAMES[priority]
+        max_wait = self.max_wait[priority] if max_wait is None else max_wait
+        start = time.monotonic()
+
+        if not self._waiters and self._delay_for(tokens) == 0:
+            self._take(tokens)
+            QUEUE_WAIT.labels(name).observe(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self._update_depth()
+        self._dispatch()
+        try:
+            await asyncio.wait_for(future, max_wait)
+        except asyncio.CancelledError:
+            self._refund_if_admitted(future, tokens)
+            raise
+        except asyncio.TimeoutError:
+            self._refund_if_admitted(future, tokens)
+            QUEUE_REJECTED.labels(name).inc()
+            raise RateLimitTimeout(
+                f"OpenAI rate limit: no capacity within {max_wait:.0f}s",
+                retry_after=self._delay_for(tokens) or 1.0,
+            ) from None
+        finally:
+            # Cancelled/timed-out entries are skipped and dropped by _dispatch
+            self._dispatch()
+            QUEUE_WAIT.labels(name).observe(time.monotonic() - start)
+
+    def release_unused(self, tokens: int):
+        """Give back tokens that were reserved but not used by the completion"""
+        if tokens > 0:
+            self.tokens.give_back(tokens)
+            self._dispatch()
+
+    def queue_depth(self) -> int:
+        """Calls currently waiting for capacity (snapshot; callable from any thread)"""
+        with self._depth_lock:
+            return sum(self._depth.values())
+
+    def _refund_if_admitted(self, future: asyncio.Future, tokens: int):
+        """Return the budget of an entry _dispatch admitted just before its waiter gave up"""
+        if future.done() and not future.cancelled():
+            self.requests.give_back(1)
+            self.tokens.give_back(tokens)
+
+    def _delay_for(self, tokens: int) -> float:
+        return max(self.requests.delay_for(1), self.tokens.delay_for(tokens))
+
+    def _take(self, tokens: int):
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+    def _dispatch(self):
+        """Admit waiters from the head of the queue; re-arm a timer for the next one"""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        while self._waiters:
+            priority, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            delay = self._delay_for(tokens)
+            if delay > 0:
+                # Strict priority: nobody overtakes the head of the queue
+                self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                break
+            heapq.heappop(self._waiters)
+            self._take(tokens)
+            future.set_result(None)
+        self._update_depth()
+
+    def _update_depth(self):
+        depth = {priority: sum(1 for p, _, _, f in self._waiters if p == priority and not f.done())
+                 for priority in self.PRIORITY_NAMES}
+        with self._depth_lock:
+            self._depth = depth
+        for priority, name in self.PRIORITY_NAMES.items():
+            QUEUE_DEPTH.labels(name).set(depth[priority])
@@ -0,0 +1,152 @@
+"""
+Retry Policy - Jittered exponential backoff and hedged requests for LLM calls
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import openai
+
+# Transient by definition; any other 4xx is the caller's fault and fails fast
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an OpenAI call that raised `error` is worth repeating"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, openai.APIConnectionError)):
+        # APITimeoutError is a subclass of APIConnectionError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def error_class(error: BaseException) -> str:
+    """Coarse class of a failed OpenAI call, for metrics labels"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, openai.APITimeoutError)):
+        return "timeout"
+    if isinstance(error, openai.APIConnectionError):
+        return "connection"
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code == 429:
+            return "rate_limited"
+        return "server_error" if error.status_code >= 500 else "client_error"
+    return "other"
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Server-provided Retry-After (seconds), if the error carries one"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies, used to pick the hedge delay"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th percentile (0-100) or None until enough samples were seen"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class RetryPolicy:
+    """
+    Run an async call with retries on transient errors
+
+    Delays grow exponentially from base_delay up to max_delay with full jitter
+    (or follow the server's Retry-After), and no retry is started that could
+    not finish before the deadline. Each attempt is also capped at
+    attempt_timeout so a hung connection is retried instead of eating the
+    whole deadline.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 8.0,
+                 attempt_timeout: float = 45.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+
+    def backoff(self, attempt: int, error: BaseException = None) -> float:
+        """Delay before retry number `attempt` (1-based)"""
+        server_hint = retry_after_seconds(error) if error is not None else None
+        if server_hint is not None:
+            return min(server_hint, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    async def run(self, call: Callable[[], Awaitable], deadline: float,
+                  hedge_after: Optional[float] = None, on_retry: Callable = None):
+        """
+        Args:
+            call: Zero-argument coroutine factory; invoked once per attempt
+            deadline: Absolute time.monotonic() by which the call must be done
+            hedge_after: If set, each attempt sends a duplicate after this many
+                         seconds and keeps whichever answer arrives first
+            on_retry: Optional callback(attempt, error, delay) for logging
+
+        Raises:
+            The last error once attempts, time or retryability run out
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("Deadline exceeded before attempt")
+            timeout = min(self.attempt_timeout, remaining)
+            try:
+                if hedge_after is not None and hedge_after < timeout:
+                    return await asyncio.wait_for(hedged(call, hedge_after), timeout)
+                return await asyncio.wait_for(call(), timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt, e)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                await asyncio.sleep(delay)
+
+
+async def hedged(call: Callable[[], Awaitable], hedge_after: float):
+    """
+    Start `call`; if it has not finished after hedge_after seconds, start a
+    second copy and return the first successful result (the loser is cancelled)
+    """
+    tasks = {asyncio.ensure_future(call())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            tasks.add(asyncio.ensure_future(call()))
+
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,101 @@
+"""
+Single Flight - Coalesce identical in-flight calls into one execution
+"""
+import threading
+from collections import OrderedDict
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe call coalescing (Go's singleflight)
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it runs wait and get the same result (or exception)
+    instead of running it again. Nothing is kept once the call returns - this
+    is not a cache.
+
+    Per-label statistics count calls and executions; calls - executions is
+    how many were saved.
+    """
+
+    def __init__(self, stats_maxsize: int = 1024):
+        self.stats_maxsize = stats_maxsize
+        self._calls = {}  # key -> _Call
+        self._stats = OrderedDict()  # label -> {"calls", "executions", "max_waiters"}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, label=None):
+        """
+        Run fn() once for all concurrent callers with this key
+
+        Args:
+            key: Hashable identity of the call
+            fn: Zero-argument callable
+            label: Name to aggregate statistics under (defaults to str(key))
+
+        Returns:
+            (result, shared) - shared is True when another caller's execution
+            was reused
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+            self._record_locked(label if label is not None else str(key), leader, call.waiters)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def _record_locked(self, label, leader: bool, waiters: int):
+        entry = self._stats.get(label)
+        if entry is None:
+            entry = self._stats[label] = {"calls": 0, "executions": 0, "max_waiters": 0}
+            while len(self._stats) > self.stats_maxsize:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(label)
+        entry["calls"] += 1
+        if leader:
+            entry["executions"] += 1
+        entry["max_waiters"] = max(entry["max_waiters"], waiters)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        """label -> {"calls", "executions", "saved", "max_waiters"}"""
+        with self._lock:
+            return {label: dict(entry, saved=entry["calls"] - entry["executions"])
+                    for label, entry in self._stats.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
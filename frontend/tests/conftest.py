@@ -0,0 +1,7 @@
+"""
+Unit tests import the frontend modules directly, like the app does
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,146 @@
+"""
+Tests for the incremental cookability engine, checked against a from-scratch
+Kahn's-algorithm computation after every fridge change
+"""
+import random
+from collections import deque
+
+import pytest
+
+from cookability import CookabilityEngine
+
+
+def _supplies(fridge, aliases):
+    """Names the fridge provides: each item and its canonical form"""
+    tokens = set()
+    for item in fridge:
+        tokens.add(item)
+        tokens.add(aliases.get(item.strip().lower(), item.strip()))
+    return tokens
+
+
+def _kahn_cookable(recipes, supplies):
+    """Recipes cookable from supplies, where cookable recipes count as available ingredients"""
+    missing = {name: sum(1 for i in ingredients if i not in supplies) for name, ingredients in recipes.items()}
+    used_by = {}
+    for name, ingredients in recipes.items():
+        for ingredient in ingredients:
+            used_by.setdefault(ingredient, []).append(name)
+    queue = deque(name for name, count in missing.items() if count == 0)
+    cookable = set()
+    while queue:
+        recipe = queue.popleft()
+        cookable.add(recipe)
+        if recipe in supplies:
+            continue  # already counted as available
+        for user in used_by.get(recipe, ()):
+            missing[user] -= 1
+            if missing[user] == 0:
+                queue.append(user)
+    return cookable
+
+
+def _expected(recipes, aliases, fridge, max_missing):
+    supplies = _supplies(fridge, aliases)
+    cookable = _kahn_cookable(recipes, supplies)
+    groups = {}
+    for name in sorted(recipes):
+        missing = sum(1 for i in recipes[name] if i not in supplies)
+        if name not in cookable and 1 <= missing <= max_missing:
+            groups.setdefault(missing, []).append(name)
+    return (sorted(r for r in cookable if r not in supplies),
+            {missing: (len(names), names) for missing, names in groups.items()})
+
+
+def _assert_matches(engine, recipes, aliases, fridge, max_missing=3):
+    cookable, by_missing = _expected(recipes, aliases, fridge, max_missing)
+    assert engine.cookable() == cookable
+    assert engine.recipes_by_missing(max_missing) == by_missing
+
+
+def _engine(recipes, aliases=None, fridge=()):
+    engine = CookabilityEngine()
+    engine.set_fridge(fridge)
+    engine.load(recipes, aliases or {})
+    return engine
+
+
+def test_recipe_cycle_needs_a_fridge_copy():
+    recipes = {"a": ["b", "x"], "b": ["a", "y"]}
+    engine = _engine(recipes, fridge=["x", "y"])
+    assert engine.cookable() == []
+    assert engine.recipes_by_missing(2) == {1: (2, ["a", "b"])}
+
+    engine.add_item("a")
+    assert engine.cookable() == ["b"]  # a is cookable too, but already in the fridge
+    assert engine.is_cookable("a")
+
+    # a was only cookable through its own fridge copy
+    engine.remove_item("a")
+    assert engine.cookable() == []
+    assert not engine.is_cookable("a")
+    assert engine.missing_ingredients("a") == ["b"]
+
+
+def test_cookable_recipe_counts_as_an_ingredient():
+    recipes = {"dough": ["flour", "water"], "pizza": ["dough", "cheese"]}
+    engine = _engine(recipes, fridge=["flour", "water", "cheese"])
+    assert engine.cookable() == ["dough", "pizza"]
+
+    engine.remove_item("water")
+    assert engine.cookable() == []
+    assert engine.missing_ingredients("pizza") == ["dough"]
+    assert engine.missing_from_fridge("pizza") == ["dough"]
+
+
+def test_aliases_map_to_one_canonical_name():
+    recipes = {"salad": ["green onion", "tomato"]}
+    aliases = {"scallion": "green onion", "spring onion": "green onion"}
+    engine = _engine(recipes, aliases, fridge=["tomato", "scallion", "spring onion"])
+    assert engine.cookable() == ["salad"]
+
+    # The other alias still supplies the canonical name
+    engine.remove_item("scallion")
+    assert engine.cookable() == ["salad"]
+
+    engine.remove_item("spring onion")
+    assert engine.cookable() == []
+    assert engine.recipes_by_missing(1) == {1: (1, ["salad"])}
+
+
+def test_add_and_remove_report_whether_they_changed_the_fridge():
+    engine = _engine({"toast": ["bread"]})
+    assert engine.add_item("bread")
+    assert not engine.add_item("bread")
+    assert engine.remove_item("bread")
+    assert not engine.remove_item("bread")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_updates_match_a_full_recomputation(seed):
+    rng = random.Random(seed)
+    pantry = [f"item {i}" for i in range(15)]
+    names = [f"recipe {i}" for i in range(25)]
+    # Recipes may use other recipes (cycles included) as well as pantry items
+    recipes = {name: rng.sample(pantry, rng.randint(1, 4)) + rng.sample(names, rng.randint(0, 2))
+               for name in names}
+    aliases = {f"alias {i}": rng.choice(pantry) for i in range(6)}
+    candidates = pantry + list(aliases) + names
+    fridge = set(rng.sample(pantry, 5))
+
+    engine = _engine(recipes, aliases, fridge)
+    _assert_matches(engine, recipes, aliases, fridge)
+    for _ in range(60):
+        item = rng.choice(candidates)
+        if item in fridge:
+            fridge.discard(item)
+            engine.remove_item(item)
+        else:
+            fridge.add(item)
+            engine.add_item(item)
+        _assert_matches(engine, recipes, aliases, fridge)
+
+    # A full listing is applied as a difference
+    fridge = set(rng.sample(candidates, 10))
+    engine.set_fridge(fridge)
+    _assert_matches(engine, recipes, aliases, fridge)
@@ -0,0 +1,44 @@
+"""
+Tests for the rule-based recipe parser (local fast path before the LLM)
+"""
+from local_recipe_parser import UNTITLED_MAX_CONFIDENCE, parse_recipe_text
+
+DEFAULT_MIN_CONFIDENCE = 0.8  # LOCAL_PARSER_MIN_CONFIDENCE default
+
+PANCAKES = """Fluffy Pancakes
+Cuisine: American
+
+Ingredients:
+- flour
+- milk
+- eggs
+- butter
+
+Instructions:
+1. Whisk everything together
+2. Fry in a hot pan
+"""
+
+
+def test_structured_recipe_is_trusted():
+    recipe, confidence = parse_recipe_text(PANCAKES)
+
+    assert recipe["name"] == "Fluffy Pancakes"
+    assert recipe["cuisine"] == "AMERICAN"
+    assert [ing["name"] for ing in recipe["ingredients"]] == ["flour", "milk", "eggs", "butter"]
+    assert recipe["instructions"] == ["Whisk everything together", "Fry in a hot pan"]
+    assert confidence >= DEFAULT_MIN_CONFIDENCE
+
+
+def test_untitled_recipe_is_left_to_the_llm():
+    untitled = PANCAKES.split("\n", 2)[2]  # drop the title and cuisine lines
+
+    recipe, confidence = parse_recipe_text(untitled)
+
+    assert recipe["name"] == ""
+    assert len(recipe["ingredients"]) == 4
+    assert confidence <= UNTITLED_MAX_CONFIDENCE < DEFAULT_MIN_CONFIDENCE
+
+
+def test_text_without_ingredient_section_is_not_parsed():
+    assert parse_recipe_text("Just a story about my grandmother's kitchen.") == (None, 0.0)
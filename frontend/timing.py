@@ -0,0 +1,154 @@
+"""
+Timing - Per-rerun timeline of backend calls for the developer overlay
+
+Recording is off unless a rerun started a timeline (the sidebar's developer
+toggle does); then every @timed API function and every HTTP request made
+through http_client lands in it with its offset, duration, status and size.
+"""
+import contextvars
+import functools
+import html
+import time
+from collections import Counter
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import streamlit as st
+
+# Calls of the same function per rerun above which the overlay flags a likely N+1
+REPEATED_CALL_WARNING = 3
+
+_timeline = contextvars.ContextVar("timing_timeline", default=None)
+_current_call = contextvars.ContextVar("timing_current_call", default=None)
+
+
+def start_timeline() -> Dict:
+    """Begin recording for this script run"""
+    timeline = {"started": time.perf_counter(), "calls": []}
+    _timeline.set(timeline)
+    return timeline
+
+
+def stop_timeline():
+    _timeline.set(None)
+
+
+def current_timeline() -> Optional[Dict]:
+    return _timeline.get()
+
+
+def timed(func):
+    """Record each call of func (and the HTTP requests it makes) in the active timeline"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timeline = _timeline.get()
+        if timeline is None:
+            return func(*args, **kwargs)
+
+        # parent is the enclosing @timed call, e.g. load_page_data for the
+        # loaders it fans out to the pool (the copied context carries it)
+        entry = {"name": func.__name__, "requests": [], "error": None, "parent": _current_call.get()}
+        token = _current_call.set(entry)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            entry["error"] = type(e).__name__
+            raise
+        finally:
+            entry["start"] = started - timeline["started"]
+            entry["duration"] = time.perf_counter() - started
+            _current_call.reset(token)
+            timeline["calls"].append(entry)
+
+    return wrapper
+
+
+def record_request(method: str, url: str, started: float, status, size: Optional[int]):
+    """Called by http_client after every request; no-op unless a timeline is active"""
+    timeline = _timeline.get()
+    if timeline is None:
+        return
+    request = {
+        "method": method,
+        "path": urlsplit(url).path,
+        "status": status,
+        "bytes": size,
+        "start": started - timeline["started"],
+        "duration": time.perf_counter() - started,
+    }
+    call = _current_call.get()
+    if call is not None:
+        call["requests"].append(request)
+    else:
+        # Request made outside any @timed function: show it as its own row
+        timeline["calls"].append({"name": f"{method} {request['path']}", "requests": [request], "error": None,
+                                  "parent": None, "start": request["start"], "duration": request["duration"]})
+
+
+def _format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return "-"
+    return f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} B"
+
+
+def render_sidebar_waterfall(timeline: Dict):
+    """Waterfall of this rerun's calls plus total render time, in the sidebar"""
+    total = time.perf_counter() - timeline["started"]
+    calls = sorted(timeline["calls"], key=lambda c: c["start"])
+    # Nested calls overlap their parent (and, when fanned out, each other)
+    backend_time = sum(c["duration"] for c in calls if c["parent"] is None)
+    parents = {id(c["parent"]) for c in calls if c["parent"] is not None}
+    requests = sum(len(c["requests"]) for c in calls)
+
+    with st.sidebar.expander("⏱️ Timings (this rerun)", expanded=True):
+        st.caption(f"Render {total * 1000:.0f} ms · {len(calls)} calls · {requests} HTTP requests · "
+                   f"{backend_time * 1000:.0f} ms in calls")
+
+        repeated = [name for name, count in Counter(c["name"] for c in calls).items()
+                    if count > REPEATED_CALL_WARNING]
+        for name in repeated:
+            count = sum(1 for c in calls if c["name"] == name)
+            st.warning(f"`{name}` called {count}× in one rerun - N+1?")
+
+        rows = []
+        scale = max(total, 1e-6)
+        for call in calls:
+            left = 100 * call["start"] / scale
+            width = max(0.5, 100 * call["duration"] / scale)
+            statuses = ", ".join(str(r["status"]) for r in call["requests"]) or (
+                "-" if id(call) in parents else "cached")
+            sizes = [r["bytes"] for r in call["requests"] if r["bytes"] is not None]
+            color = "#e74c3c" if call["error"] or any(
+                not isinstance(r["status"], int) or r["status"] >= 400 for r in call["requests"]) else "#3498db"
+            tooltip = "\n".join(f"{r['method']} {r['path']} → {r['status']} "
+                                f"({r['duration'] * 1000:.0f} ms, {_format_bytes(r['bytes'])})"
+                                for r in call["requests"])
+            rows.append(
+                f'<div title="{html.escape(tooltip)}" style="font-size:0.75rem;margin-bottom:4px">'
+                f'<div style="display:flex;justify-content:space-between">'
+                f'<span>{"↳ " if call["parent"] is not None else ""}{html.escape(call["name"])}</span>'
+                f'<span>{call["duration"] * 1000:.0f} ms · {html.escape(statuses)} · '
+                f'{_format_bytes(sum(sizes) if sizes else None)}</span></div>'
+                f'<div style="background:#eee;height:6px;position:relative">'
+                f'<div style="position:absolute;left:{left:.1f}%;width:{width:.1f}%;height:6px;'
+                f'background:{color}"></div></div></div>'
+            )
+        if rows:
+            st.markdown("".join(rows), unsafe_allow_html=True)
+        else:
+            st.caption("No backend calls this rerun")
+
+
+def render_coalescing_stats(stats: Dict, limit: int = 10):
+    """Table of the GETs http_client coalesced most, in the sidebar"""
+    rows = sorted(stats.items(), key=lambda item: item[1]["saved"], reverse=True)[:limit]
+    saved = sum(entry["saved"] for entry in stats.values())
+    calls = sum(entry["calls"] for entry in stats.values())
+    with st.sidebar.expander("🔀 Coalesced GETs (all sessions)", expanded=False):
+        st.caption(f"{saved} of {calls} GETs shared an in-flight request")
+        if rows:
+            st.dataframe([{"request": label, "calls": entry["calls"], "sent": entry["executions"],
+                           "saved": entry["saved"], "max waiting": entry["max_waiters"]}
+                          for label, entry in rows], hide_index=True)
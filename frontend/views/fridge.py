@@ -1,9 +1,13 @@
 """Fridge page module"""
 import streamlit as st
 from api import add_to_fridge, remove_from_fridge, update_item_count
+from ingredient_normalizer import normalize_name
 
+# Fridge contents are refreshed by app.py on every rerun; nothing else to load
+PAGE_DATA = {}
 
-def render():
+
+def render(data=None):
     """Render the Fridge page"""
     st.markdown('<p class="section-header">🧊 My Fridge</p>', unsafe_allow_html=True)
     
@@ -16,7 +20,7 @@ def render():
         
         if st.button("➕ Add to Fridge", type="primary", use_container_width=True):
             if new_item.strip():
-                item_lower = new_item.strip().lower()
+                item_lower = normalize_name(new_item)
                 result = add_to_fridge(item_lower, item_count)
                 if result == "exists":
                     st.toast(f"'{new_item}' already in fridge! Added {item_count} more.")
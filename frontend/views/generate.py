@@ -2,19 +2,36 @@
 import streamlit as st
 from api import (
     generate_cookable_recipes, 
-    fetch_recipe_details,
+    fetch_recipe_details_many,
     search_recipes_semantic,
     hybrid_search_recipes,
     index_all_recipes,
     seed_ingredient_aliases,
     get_search_stats,
     get_almost_cookable_recipes,
-    get_substitution_suggestions
+    get_substitution_suggestions,
+    ensure_cookability_engine,
+    load_page_data
 )
+from cookability import cookability_engine
+from ingredient_normalizer import normalize_names
 
+# Data this page needs before it renders, loaded concurrently by app.py
+PAGE_DATA = {
+    'search_stats': get_search_stats,
+    'cookability_ready': ensure_cookability_engine,
+}
 
-def render():
+# Almost-cookable slider range and how many recipes to list per missing count
+MAX_MISSING_LIMIT = 5
+DEFAULT_MAX_MISSING = 2
+ALMOST_COOKABLE_SHOWN = 20
+
+
+def render(data=None):
     """Render the Generate Recipes page with hybrid search"""
+    if data is None:
+        data = load_page_data(PAGE_DATA)
     st.markdown('<p class="section-header">🍳 What Can I Cook?</p>', unsafe_allow_html=True)
     
     # Sync button at the top (does all admin work)
@@ -28,8 +45,9 @@ def render():
                     st.error(result['error'])
                 else:
                     st.success(f"✅ Indexed {result.get('count', 0)} recipes!")
+                    data['search_stats'] = get_search_stats()
     with col_status:
-        stats = get_search_stats()
+        stats = data['search_stats']
         if stats.get('initialized'):
             st.caption(f"📊 {stats.get('pointsCount', 0)} recipes indexed | Search: ✅ Ready")
         else:
@@ -37,6 +55,10 @@ def render():
     
     st.divider()
     
+    # The local engine follows every fridge change, so the answer is always current
+    if data['cookability_ready']:
+        st.session_state.cookable_recipes = cookability_engine.cookable()
+    
     # Tabs for different search modes
     tab1, tab2, tab3 = st.tabs(["🥗 Exact Match", "🔍 Semantic Search", "🔗 Hybrid Search"])
     
@@ -58,7 +80,7 @@ def _render_exact_match_tab():
         # Button at top
         if st.button("🔍 Find Cookable Recipes", type="primary", use_container_width=True, 
                     disabled=not st.session_state.fridge_items, key="exact_search_btn"):
-            if generate_cookable_recipes():
+            if generate_cookable_recipes(refresh=True):
                 if st.session_state.cookable_recipes:
                     st.success(f"Found {len(st.session_state.cookable_recipes)} recipes!")
                 else:
@@ -85,25 +107,41 @@ def _render_exact_match_tab():
         
         st.divider()
         
-        # Almost cookable recipes section - NOW WITH BUTTON
+        # Almost cookable recipes section - live as the slider moves
         st.markdown("### 🟡 Almost Cookable")
-        st.caption("Recipes you're just 1-2 ingredients away from cooking!")
+        max_missing = st.slider("Max missing ingredients", min_value=0, max_value=MAX_MISSING_LIMIT,
+                                value=DEFAULT_MAX_MISSING, key="almost_cookable_max_missing")
+        if max_missing == 0:
+            st.caption("Move the slider to see recipes you're a few ingredients away from.")
+            return
         
-        # Button to find almost-cookable recipes
-        if st.button("🔍 Find Almost-Cookable Recipes", key="almost_cookable_btn", use_container_width=True):
-            with st.spinner("Finding recipes close to cookable..."):
-                almost_cookable_data = get_almost_cookable_recipes(max_missing=2)
-                st.session_state.almost_cookable_recipes = almost_cookable_data.get('recipes', {})
-            st.rerun()
+        groups = _almost_cookable_groups(max_missing)
+        if not groups:
+            st.info("💡 No almost-cookable recipes found. All recipes either need too many ingredients or are already cookable!")
+            return
         
-        # Display results if available
-        if 'almost_cookable_recipes' in st.session_state and st.session_state.almost_cookable_recipes:
-            almost_cookable = st.session_state.almost_cookable_recipes
-            st.markdown(f"**{len(almost_cookable)} recipe(s) close to cookable:**")
+        st.markdown(f"**{sum(total for total, _ in groups.values())} recipe(s) close to cookable:**")
+        for missing_count, (total, almost_cookable) in groups.items():
+            st.markdown(f"#### Missing {missing_count} · {total} recipe(s)")
             _display_almost_cookable_recipes(almost_cookable)
-        elif 'almost_cookable_recipes' in st.session_state:
-            # Button was clicked but no results
-            st.info("💡 No almost-cookable recipes found. All recipes either need too many ingredients or are already cookable!")
+            if total > len(almost_cookable):
+                st.caption(f"...and {total - len(almost_cookable)} more")
+
+
+def _almost_cookable_groups(max_missing):
+    """Missing count -> (recipes in group, {recipe: missing ingredients} for the first ALMOST_COOKABLE_SHOWN)"""
+    if cookability_engine.loaded:
+        groups = cookability_engine.recipes_by_missing(max_missing, limit=ALMOST_COOKABLE_SHOWN)
+        return {missing_count: (total, {name: cookability_engine.missing_from_fridge(name) for name in names})
+                for missing_count, (total, names) in groups.items()}
+    
+    # No cookability snapshot: ask the backend
+    recipes = get_almost_cookable_recipes(max_missing=max_missing).get('recipes', {})
+    by_count = {}
+    for name, missing_ingredients in sorted(recipes.items()):
+        by_count.setdefault(len(missing_ingredients), {})[name] = missing_ingredients
+    return {missing_count: (len(group), dict(list(group.items())[:ALMOST_COOKABLE_SHOWN]))
+            for missing_count, group in sorted(by_count.items())}
 
 
 def _display_almost_cookable_recipes(almost_cookable):
@@ -249,7 +287,7 @@ def _render_hybrid_search_tab():
             )
     
     if st.button("🔗 Hybrid Search", key="hybrid_search_btn", type="primary", use_container_width=True):
-        ingredients = [i.strip() for i in ingredients_input.split('\n') if i.strip()]
+        ingredients = normalize_names(ingredients_input.split('\n'))
         
         if ingredients or query:
             with st.spinner("Searching..."):
@@ -274,11 +312,12 @@ def _render_hybrid_search_tab():
 
 def _display_recipe_list(recipes):
     """Display a list of recipe names with expandable details"""
+    all_details = fetch_recipe_details_many(recipes)
     for recipe_name in recipes:
         with st.container():
             st.markdown(f'<div class="cookable-recipe">{recipe_name}</div>', unsafe_allow_html=True)
             
-            details = fetch_recipe_details(recipe_name)
+            details = all_details.get(recipe_name)
             if details:
                 with st.expander("View recipe details"):
                     ingredients = details.get('ingredients', [])
@@ -298,6 +337,7 @@ def _display_recipe_list(recipes):
 
 def _display_search_results(results):
     """Display search results with scores"""
+    all_details = fetch_recipe_details_many([r.get('recipeName') for r in results])
     for result in results:
         recipe_name = result.get('recipeName', 'Unknown')
         score = result.get('score', 0)
@@ -319,7 +359,7 @@ def _display_search_results(results):
             match_emoji = "🔗"
         
         with st.expander(f"{match_emoji} **{recipe_name}** — {score_pct} match"):
-            details = fetch_recipe_details(recipe_name)
+            details = all_details.get(recipe_name)
             if details:
                 col1, col2 = st.columns(2)
                 with col1:
@@ -1,14 +1,21 @@
 """AI Recipe Parser page module"""
+import hashlib
+import json
+import logging
 import os
 import streamlit as st
 import requests
-from api import add_recipe
+from api import add_recipe, load_page_data, parse_recipe_via_ai_service
+from bulk_import import BulkImporter, sources_from_text
+from config import AI_SERVICE_URL
+from http_client import http_client
+from ingredient_normalizer import normalize_name, normalize_names
+from timing import timed
 
-# AI service URL - use environment variable in Docker, fallback to localhost
-AI_SERVICE_URL = os.environ.get("AI_SERVICE_URL", "http://localhost:5001")
+logger = logging.getLogger(__name__)
 
 
-def render():
+def render(data=None):
     """Render the AI Recipe Parser page"""
     st.markdown('<p class="section-header">🤖 AI Recipe Parser</p>', unsafe_allow_html=True)
     
@@ -18,7 +25,9 @@ def render():
     """)
     
     # Check if AI service is available
-    ai_available = check_ai_service()
+    if data is None:
+        data = load_page_data(PAGE_DATA)
+    ai_available = data['ai_available']
     
     if not ai_available:
         st.error("""
@@ -35,7 +44,7 @@ def render():
         return
     
     # Tab selection
-    tab1, tab2 = st.tabs(["📝 Paste Recipe Text", "ℹ️ How to Use"])
+    tab1, tab_bulk, tab2 = st.tabs(["📝 Paste Recipe Text", "📦 Bulk Import", "ℹ️ How to Use"])
     
     with tab1:
         # Recipe text input
@@ -79,12 +88,12 @@ Instructions:
                 st.rerun()
         
         if parse_button and recipe_text.strip():
-            with st.spinner("🤖 AI is analyzing the recipe... ⏱️ First run may take 1-2 minutes..."):
+            with st.spinner("🤖 AI is analyzing the recipe..."):
                 import time
                 start_time = time.time()
                 
-                # Call Flask AI service (OpenAI-powered)
-                parsed = parse_recipe_via_ai_service(recipe_text)
+                # Call Flask AI service (OpenAI-powered), showing fields as they stream in
+                parsed = render_streaming_parse(recipe_text)
                 
                 elapsed = time.time() - start_time
                 
@@ -96,6 +105,9 @@ Instructions:
                     st.error(f"❌ Failed to parse recipe after {elapsed:.1f} seconds. Please try again.")
                     st.info("💡 If this keeps failing, try:\n- Restarting the AI service\n- Using a simpler recipe format\n- Checking the AI service terminal for error details")
     
+    with tab_bulk:
+        render_bulk_import()
+    
     with tab2:
         st.markdown("""
         ### 📖 How to Use
@@ -127,42 +139,153 @@ Instructions:
         display_parsed_recipe()
 
 
+def render_bulk_import():
+    """Bulk import: parse many uploaded recipes concurrently and save them in batches"""
+    st.markdown("""
+    Upload recipe files to import many recipes at once:
+    - **.txt / .md** - one recipe per file, or many separated by `---` lines
+    - **.jsonl** - one `{"text": "..."}` (or an already parsed recipe) per line
+    
+    Recipes that already exist in your book are skipped. If the import is
+    interrupted, uploading the same files again resumes where it stopped.
+    """)
+    
+    uploads = st.file_uploader(
+        "Recipe files",
+        type=["txt", "md", "jsonl"],
+        accept_multiple_files=True,
+        key="bulk_files"
+    )
+    workers = st.slider("Recipes parsed in parallel", min_value=1, max_value=16, value=4, key="bulk_workers")
+    
+    if st.button("📦 Import All", type="primary", disabled=not uploads):
+        sources = []
+        for upload in uploads:
+            sources.extend(sources_from_text(upload.getvalue().decode("utf-8", errors="replace"), upload.name))
+        
+        # Same uploads -> same checkpoint, so a re-run resumes
+        digest = hashlib.sha256()
+        for upload in uploads:
+            digest.update(upload.name.encode("utf-8"))
+            digest.update(upload.getvalue())
+        checkpoint_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      ".cache", "bulk_import")
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        checkpoint = os.path.join(checkpoint_dir, f"{digest.hexdigest()[:16]}.jsonl")
+        
+        progress_bar = st.progress(0.0)
+        status = st.empty()
+        
+        def progress(stats):
+            progress_bar.progress(stats["done"] / max(stats["total"], 1))
+            status.caption(f"{stats['done']}/{stats['total']} processed - ✅ {stats['saved']} saved, "
+                           f"🔁 {stats['duplicate']} duplicates, ❌ {stats['failed']} failed")
+        
+        stats = BulkImporter(checkpoint_path=checkpoint, max_workers=workers, progress=progress).run(sources)
+        
+        st.success(f"✅ Imported {stats['saved']} recipes ({stats['duplicate']} duplicates skipped, "
+                   f"{stats['resumed']} already done in a previous run).")
+        if stats["failed"]:
+            st.warning(f"⚠️ {stats['failed']} recipes failed. Click **Import All** again to retry them.")
+
+
+@timed
 def check_ai_service():
     """Check if AI service is available"""
     try:
-        response = requests.get(f"{AI_SERVICE_URL}/health", timeout=2)
+        response = http_client.get(f"{AI_SERVICE_URL}/health", timeout=2, retry=False)
         return response.status_code == 200
     except:
         return False
 
 
-def parse_recipe_via_ai_service(recipe_text):
-    """Call Flask AI service to parse recipe"""
+# Data this page needs before it renders, loaded concurrently by app.py
+PAGE_DATA = {
+    'ai_available': check_ai_service,
+}
+
+
+def parse_recipe_stream_via_ai_service(recipe_text):
+    """
+    Call the streaming parse endpoint
+    
+    Yields (event, data) pairs from the server-sent events: name, cuisine,
+    ingredient, instruction, then done (or error).
+    """
     try:
-        response = requests.post(
-            f"{AI_SERVICE_URL}/ai/parse-recipe",
+        response = http_client.post(
+            f"{AI_SERVICE_URL}/ai/parse-recipe/stream",
             json={"recipeText": recipe_text},
-            timeout=180  # 3 minutes for first run
+            timeout=180,  # applies between events, not to the whole stream
+            retry=False,
+            stream=True
         )
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success"):
-                return data.get("recipe")
-        
-        # Log error if available
-        if response.status_code != 200:
-            print(f"[ERROR] AI service returned status {response.status_code}")
-            try:
-                error_data = response.json()
-                print(f"[ERROR] {error_data.get('error', 'Unknown error')}")
-            except:
-                pass
-        
+        with response:
+            if response.status_code == 404:
+                # Older AI service without the streaming route
+                parsed = parse_recipe_via_ai_service(recipe_text)
+                yield ("done", {"success": True, "recipe": parsed}) if parsed else ("error", {})
+                return
+            
+            if response.status_code != 200:
+                logger.error("AI service returned status %s", response.status_code)
+                try:
+                    yield "error", response.json()
+                except ValueError:
+                    yield "error", {}
+                return
+            
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:") and event:
+                    yield event, json.loads(line[len("data:"):].strip())
+                elif not line:
+                    event = None
+    
     except requests.Timeout:
-        print("[ERROR] AI service request timed out")
+        logger.error("AI service request timed out")
+        yield "error", {"error": "AI service request timed out"}
     except Exception as e:
-        print(f"[ERROR] Failed to call AI service: {e}")
+        logger.error("Failed to call AI service: %s", e)
+        yield "error", {"error": str(e)}
+
+
+@timed
+def render_streaming_parse(recipe_text):
+    """Render recipe fields as the AI service streams them; return the final recipe or None"""
+    name_placeholder = st.empty()
+    cuisine_placeholder = st.empty()
+    ingredients_placeholder = st.empty()
+    instructions_placeholder = st.empty()
+    ingredients = []
+    instructions = []
+    
+    for event, data in parse_recipe_stream_via_ai_service(recipe_text):
+        if event == "name":
+            name_placeholder.markdown(f"### 📋 {data}")
+        elif event == "cuisine":
+            cuisine_placeholder.caption(f"🌍 {data}")
+        elif event == "ingredient":
+            ingredients.append(data)
+            ingredients_placeholder.markdown("**🥘 Ingredients**\n" + "\n".join(
+                f"- {'🧂 ' if ing.get('isSeasoning') else ''}{ing.get('name', '')}" for ing in ingredients
+            ))
+        elif event == "instruction":
+            instructions.append(data)
+            instructions_placeholder.markdown("**📝 Instructions**\n" + "\n".join(
+                f"{i + 1}. {step}" for i, step in enumerate(instructions)
+            ))
+        elif event == "done":
+            return data.get("recipe")
+        elif event == "error":
+            if data.get("error"):
+                logger.error("Streaming parse failed: %s", data['error'])
+                if data.get("retryAfter"):
+                    st.warning(f"⏳ AI service is busy, try again in {data['retryAfter']} seconds.")
+            return None
     
     return None
 
@@ -378,24 +501,20 @@ def display_parsed_recipe():
             # Get all existing recipe names (flatten the dict values)
             existing_names = []
             for cuisine_recipes in all_recipes.values():
-                existing_names.extend([r["name"].lower() for r in cuisine_recipes])
+                existing_names.extend([normalize_name(r["name"]) for r in cuisine_recipes])
             
-            if recipe_name.lower() in existing_names:
+            if normalize_name(recipe_name) in existing_names:
                 st.error(f"❌ Recipe '{recipe_name}' already exists in your recipe book!")
                 st.info("💡 Try editing the recipe name or delete the old one first.")
             else:
                 # Separate ingredients from seasonings
-                main_ingredients = [
-                    ing["name"].lower() 
-                    for ing in ingredients 
-                    if ing["name"].strip() and not ing.get("isSeasoning", False)
-                ]
+                main_ingredients = normalize_names(
+                    ing["name"] for ing in ingredients if not ing.get("isSeasoning", False)
+                )
                 
-                seasoning_list = [
-                    ing["name"].lower()
-                    for ing in ingredients
-                    if ing["name"].strip() and ing.get("isSeasoning", False)
-                ]
+                seasoning_list = normalize_names(
+                    ing["name"] for ing in ingredients if ing.get("isSeasoning", False)
+                )
                 
                 if not main_ingredients:
                     st.warning("⚠️ No main ingredients found! Please add at least one non-seasoning ingredient.")
@@ -411,7 +530,7 @@ def display_parsed_recipe():
                     
                     # Save recipe with separate ingredients and seasonings
                     success = add_recipe(
-                        name=recipe_name.lower(),
+                        name=normalize_name(recipe_name),
                         ingredients=main_ingredients,
                         cuisine_type=cuisine_type,
                         instructions=instructions_final,
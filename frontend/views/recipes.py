@@ -1,13 +1,30 @@
 """Recipe Book page module"""
 import streamlit as st
-from api import fetch_recipes_by_cuisine, fetch_cuisines, fetch_recipe_details, add_recipe, delete_recipe
+from api import (
+    fetch_recipe_counts, fetch_recipes_page, fetch_cuisines, fetch_recipe_details, add_recipe, delete_recipe,
+    load_page_data
+)
+from cookability import cookability_engine
+from ingredient_normalizer import normalize_name, normalize_names
 
+# Data this page needs before it renders, loaded concurrently by app.py.
+# Only the per-cuisine counts - recipes are fetched page by page when a
+# cuisine section is opened.
+PAGE_DATA = {
+    'recipe_counts': fetch_recipe_counts,
+    'cuisines': fetch_cuisines,
+}
 
-def render():
+PAGE_SIZES = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+
+
+def render(data=None):
     """Render the Recipe Book page"""
-    # Fetch data
-    recipes_by_cuisine = fetch_recipes_by_cuisine()
-    cuisines = fetch_cuisines()
+    if data is None:
+        data = load_page_data(PAGE_DATA)
+    recipe_counts = data['recipe_counts']
+    cuisines = data['cuisines']
     
     # Sidebar for cuisine filter
     st.sidebar.divider()
@@ -20,7 +37,7 @@ def render():
     for cuisine in cuisines:
         cuisine_name = cuisine.get('name', '')
         display_name = cuisine.get('displayName', cuisine_name)
-        recipe_count = len(recipes_by_cuisine.get(cuisine_name, []))
+        recipe_count = recipe_counts.get(cuisine_name, 0)
         
         if st.sidebar.button(f"{display_name} ({recipe_count})", use_container_width=True, 
                             type="primary" if st.session_state.selected_cuisine == cuisine_name else "secondary",
@@ -31,6 +48,9 @@ def render():
     # Initialize edit state
     if 'editing_recipe' not in st.session_state:
         st.session_state.editing_recipe = None
+    # Cuisine -> number of pages the user has loaded in its section
+    if 'recipe_pages_shown' not in st.session_state:
+        st.session_state.recipe_pages_shown = {}
     
     # Main content with tabs
     if st.session_state.editing_recipe:
@@ -39,84 +59,122 @@ def render():
         tab1, tab2 = st.tabs(["📖 Browse Recipes", "➕ Add New Recipe"])
         
         with tab1:
-            _render_browse_tab(recipes_by_cuisine, cuisines)
+            _render_browse_tab(recipe_counts)
         
         with tab2:
             _render_add_tab(cuisines)
 
 
-def _render_browse_tab(recipes_by_cuisine, cuisines):
-    """Render the Browse Recipes tab"""
+def _reset_recipe_pages():
+    st.session_state.recipe_pages_shown = {}
+
+
+def _render_browse_tab(recipe_counts):
+    """Render the Browse Recipes tab: one lazily loaded, paginated section per cuisine"""
     st.markdown('<p class="section-header">📖 Recipe Book</p>', unsafe_allow_html=True)
     
+    if not recipe_counts:
+        st.info("No recipes available. Add some recipes using the 'Add New Recipe' tab!")
+        return
+    
+    selected = st.session_state.selected_cuisine
+    col_info, col_size = st.columns([3, 1])
+    with col_size:
+        page_size = st.selectbox("Recipes per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                 key="recipe_page_size", on_change=_reset_recipe_pages)
+    
     # Filter recipes based on selected cuisine
-    if st.session_state.selected_cuisine:
-        filtered_recipes = {st.session_state.selected_cuisine: recipes_by_cuisine.get(st.session_state.selected_cuisine, [])}
-        st.info(f"Showing recipes for: **{st.session_state.selected_cuisine}**")
+    if selected:
+        sections = [selected] if recipe_counts.get(selected) else []
+        with col_info:
+            st.info(f"Showing recipes for: **{selected}**")
     else:
-        filtered_recipes = recipes_by_cuisine
+        sections = [cuisine for cuisine, count in recipe_counts.items() if count]
     
-    if filtered_recipes:
-        for cuisine, recipes in filtered_recipes.items():
-            if recipes:
-                st.markdown(f"### {cuisine}")
-                for recipe in recipes:
-                    recipe_name = recipe.get('name', 'Unknown')
-                    ingredients = recipe.get('ingredients', [])
-                    seasonings = recipe.get('seasonings', [])
-                    
-                    is_cookable = recipe_name in st.session_state.cookable_recipes
-                    
-                    with st.expander(f"{'✅ ' if is_cookable else ''}{recipe_name}", expanded=False):
-                        # Display main ingredients
-                        if ingredients:
-                            st.markdown("**Ingredients:**")
-                            ingredient_html = " ".join([
-                                f'<span class="ingredient-chip">{ing}</span>' 
-                                for ing in ingredients
-                            ])
-                            st.markdown(ingredient_html, unsafe_allow_html=True)
-                        
-                        # Display seasonings separately
-                        if seasonings:
-                            st.markdown("**Seasonings:**")
-                            seasoning_html = " ".join([
-                                f'<span class="ingredient-chip" style="opacity: 0.7;">{ing}</span>' 
-                                for ing in seasonings
-                            ])
-                            st.markdown(seasoning_html, unsafe_allow_html=True)
-                        
-                        col_details, col_edit, col_delete = st.columns([2, 1, 1])
-                        with col_details:
-                            if st.button(f"View Details", key=f"details_{cuisine}_{recipe_name}"):
-                                details = fetch_recipe_details(recipe_name)
-                                if details:
-                                    st.markdown("---")
-                                    st.markdown("**Instructions:**")
-                                    # Split instructions by newline and display as numbered list
-                                    instructions_text = details.get('instructions', 'No instructions available.')
-                                    if instructions_text and instructions_text != 'No instructions available.':
-                                        steps = [step.strip() for step in instructions_text.split('\n') if step.strip()]
-                                        for i, step in enumerate(steps, 1):
-                                            st.markdown(f"{i}. {step}")
-                                    else:
-                                        st.markdown(instructions_text)
-                                    
-                                    if details.get('imageUrl'):
-                                        st.image(details['imageUrl'], caption=recipe_name)
-                        with col_edit:
-                            if st.button("✏️ Edit", key=f"edit_{cuisine}_{recipe_name}", type="secondary"):
-                                st.session_state.editing_recipe = recipe_name
-                                st.rerun()
-                        with col_delete:
-                            if st.button("🗑️ Delete", key=f"delete_{cuisine}_{recipe_name}", type="secondary"):
-                                if delete_recipe(recipe_name):
-                                    st.success(f"Deleted '{recipe_name}'!")
-                                    st.rerun()
-                                else:
-                                    st.error("Failed to delete recipe.")
-    else:
-        st.info("No recipes available. Add some recipes using the 'Add New Recipe' tab!")
+    cookable = set(cookability_engine.cookable() if cookability_engine.loaded else st.session_state.cookable_recipes)
+    for cuisine in sections:
+        count = recipe_counts[cuisine]
+        st.markdown(f"### {cuisine}")
+        # The filtered cuisine is always open; otherwise nothing is fetched until its section is
+        if selected or st.toggle(f"Show {count} recipe(s)", key=f"open_section_{cuisine}"):
+            _render_cuisine_section(cuisine, count, page_size, cookable)
+
+
+def _render_cuisine_section(cuisine, count, page_size, cookable):
+    """Render the loaded pages of one cuisine plus a "load more" button"""
+    pages_shown = st.session_state.recipe_pages_shown.get(cuisine, 1)
+    after = None
+    shown = 0
+    for _ in range(pages_shown):
+        recipes, after = fetch_recipes_page(cuisine, after, page_size)
+        for recipe in recipes:
+            _render_recipe(cuisine, recipe, cookable)
+        shown += len(recipes)
+        if after is None:
+            break
+    
+    if after is not None:
+        if st.button(f"⬇️ Load more ({shown} of {count} shown)", key=f"more_{cuisine}"):
+            st.session_state.recipe_pages_shown[cuisine] = pages_shown + 1
+            st.rerun()
+
+
+def _render_recipe(cuisine, recipe, cookable):
+    """Render one recipe as an expander with details, edit and delete actions"""
+    recipe_name = recipe.get('name', 'Unknown')
+    ingredients = recipe.get('ingredients', [])
+    seasonings = recipe.get('seasonings', [])
+    
+    is_cookable = recipe_name in cookable
+
+    with st.expander(f"{'✅ ' if is_cookable else ''}{recipe_name}", expanded=False):
+        # Display main ingredients
+        if ingredients:
+            st.markdown("**Ingredients:**")
+            ingredient_html = " ".join([
+                f'<span class="ingredient-chip">{ing}</span>' 
+                for ing in ingredients
+            ])
+            st.markdown(ingredient_html, unsafe_allow_html=True)
+
+        # Display seasonings separately
+        if seasonings:
+            st.markdown("**Seasonings:**")
+            seasoning_html = " ".join([
+                f'<span class="ingredient-chip" style="opacity: 0.7;">{ing}</span>' 
+                for ing in seasonings
+            ])
+            st.markdown(seasoning_html, unsafe_allow_html=True)
+
+        col_details, col_edit, col_delete = st.columns([2, 1, 1])
+        with col_details:
+            if st.button(f"View Details", key=f"details_{cuisine}_{recipe_name}"):
+                details = fetch_recipe_details(recipe_name)
+                if details:
+                    st.markdown("---")
+                    st.markdown("**Instructions:**")
+                    # Split instructions by newline and display as numbered list
+                    instructions_text = details.get('instructions', 'No instructions available.')
+                    if instructions_text and instructions_text != 'No instructions available.':
+                        steps = [step.strip() for step in instructions_text.split('\n') if step.strip()]
+                        for i, step in enumerate(steps, 1):
+                            st.markdown(f"{i}. {step}")
+                    else:
+                        st.markdown(instructions_text)
+
+                    if details.get('imageUrl'):
+                        st.image(details['imageUrl'], caption=recipe_name)
+        with col_edit:
+            if st.button("✏️ Edit", key=f"edit_{cuisine}_{recipe_name}", type="secondary"):
+                st.session_state.editing_recipe = recipe_name
+                st.rerun()
+        with col_delete:
+            if st.button("🗑️ Delete", key=f"delete_{cuisine}_{recipe_name}", type="secondary"):
+                if delete_recipe(recipe_name):
+                    st.success(f"Deleted '{recipe_name}'!")
+                    st.rerun()
+                else:
+                    st.error("Failed to delete recipe.")
 
 
 def _render_edit_mode(cuisines):
@@ -190,8 +248,8 @@ def _render_edit_mode(cuisines):
         
         if submitted:
             # Parse ingredients and seasonings
-            ingredients = [ing.strip().lower() for ing in ingredients_text.strip().split('\n') if ing.strip()]
-            seasonings = [s.strip().lower() for s in seasonings_text.strip().split('\n') if s.strip()] if seasonings_text.strip() else []
+            ingredients = normalize_names(ingredients_text.split('\n'))
+            seasonings = normalize_names(seasonings_text.split('\n'))
             
             if not ingredients:
                 st.error("Please enter at least one ingredient.")
@@ -249,10 +307,10 @@ def _render_add_tab(cuisines):
                 st.error("Please enter at least one ingredient.")
             else:
                 # Parse ingredients and seasonings
-                ingredients = [ing.strip().lower() for ing in ingredients_text.strip().split('\n') if ing.strip()]
-                seasonings = [s.strip().lower() for s in seasonings_text.strip().split('\n') if s.strip()] if seasonings_text.strip() else []
+                ingredients = normalize_names(ingredients_text.split('\n'))
+                seasonings = normalize_names(seasonings_text.split('\n'))
                 
-                if add_recipe(recipe_name.strip().lower(), ingredients, selected_cuisine, instructions.strip(), seasonings=seasonings):
+                if add_recipe(normalize_name(recipe_name), ingredients, selected_cuisine, instructions.strip(), seasonings=seasonings):
                     st.success(f"Recipe '{recipe_name}' added with {len(ingredients)} ingredients and {len(seasonings)} seasonings!")
                     st.rerun()
                 else:
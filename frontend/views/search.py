@@ -5,13 +5,14 @@ import streamlit as st
 from api import (
     search_recipes_semantic, 
     hybrid_search_recipes, 
-    fetch_recipe_details,
+    fetch_recipe_details_many,
     get_search_stats,
     index_all_recipes,
     seed_ingredient_aliases,
     get_ingredient_aliases,
     generate_ingredient_aliases
 )
+from ingredient_normalizer import normalize_names
 
 
 def render():
@@ -94,7 +95,7 @@ def _render_hybrid_search():
         )
     
     if st.button("🔍 Hybrid Search", key="hybrid_search_btn", type="primary"):
-        ingredients = [i.strip() for i in ingredients_input.split('\n') if i.strip()]
+        ingredients = normalize_names(ingredients_input.split('\n'))
         
         if ingredients or query:
             with st.spinner("Searching..."):
@@ -118,6 +119,7 @@ def _render_hybrid_search():
 
 def _display_search_results(results):
     """Display search results with expandable details"""
+    all_details = fetch_recipe_details_many([r.get('recipeName') for r in results])
     for i, result in enumerate(results):
         recipe_name = result.get('recipeName', 'Unknown')
         score = result.get('score', 0)
@@ -140,8 +142,8 @@ def _display_search_results(results):
             match_badge = "🔗"
         
         with st.expander(f"{match_badge} **{recipe_name}** - {score_pct} match ({cuisine})"):
-            # Fetch and display recipe details
-            details = fetch_recipe_details(recipe_name)
+            # Details were fetched for all results up front
+            details = all_details.get(recipe_name)
             if details:
                 col1, col2 = st.columns(2)
                 with col1:
@@ -0,0 +1,104 @@
+"""
+Write-behind queue that coalesces fridge count edits into bulk updates
+"""
+import atexit
+import threading
+import time
+
+
+class CountUpdateQueue:
+    """
+    Process-wide write-behind queue for fridge item counts
+
+    Edits made within one debounce window are coalesced (last write per item
+    wins) and sent together by a single call to flush_fn. flush_fn receives a
+    dict of item -> count and returns a dict of item -> error message for the
+    items that failed; if it raises, the whole batch is re-queued and retried
+    with exponential backoff (up to max_retry_delay seconds).
+    """
+
+    def __init__(self, flush_fn, delay: float = 0.5, max_retry_delay: float = 30.0):
+        self._flush_fn = flush_fn
+        self.delay = delay
+        self.max_retry_delay = max_retry_delay
+        self._retry_delay = 0.0
+        self._pending = {}  # item -> count
+        self._window_started = None
+        self._failures = {}  # item -> error message
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def enqueue(self, item: str, count: int):
+        """Record a new count for item; it is sent when the current window closes"""
+        with self._lock:
+            self._pending[item] = count
+            self._failures.pop(item, None)
+            if self._window_started is None:
+                self._window_started = time.monotonic()
+                self._schedule_locked(self.delay)
+
+    def discard(self, item: str):
+        """Drop a queued update, e.g. because the item was removed"""
+        with self._lock:
+            self._pending.pop(item, None)
+            self._failures.pop(item, None)
+
+    def pending(self) -> dict:
+        """Counts that are queued but not yet confirmed by the backend"""
+        with self._lock:
+            return dict(self._pending)
+
+    def pop_failures(self) -> dict:
+        """Return and clear per-item failures from previous flushes"""
+        with self._lock:
+            failures, self._failures = self._failures, {}
+            return failures
+
+    def flush_due(self):
+        """Flush now if the current window has already closed (timer fallback)"""
+        with self._lock:
+            due = (self._window_started is not None
+                   and time.monotonic() - self._window_started >= self.delay)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Send every queued update as one bulk request"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._window_started = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return
+
+            try:
+                failed = self._flush_fn(batch) or {}
+            except Exception as e:
+                with self._lock:
+                    # Newer edits made during the flush win over the failed batch
+                    for item, count in batch.items():
+                        self._pending.setdefault(item, count)
+                        self._failures[item] = f"Could not sync count: {e}"
+                    if self._window_started is None:
+                        self._window_started = time.monotonic()
+                    # enqueue() only arms a timer for a new window, so the retry needs its own
+                    self._retry_delay = min(max(self._retry_delay * 2, self.delay), self.max_retry_delay)
+                    if self._timer is None:
+                        self._schedule_locked(self._retry_delay)
+                return
+
+            with self._lock:
+                self._retry_delay = 0.0
+                for item in batch:
+                    self._failures.pop(item, None)  # stale errors from earlier attempts
+                self._failures.update(failed)
+
+    def _schedule_locked(self, delay: float):
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
@@ -3,6 +3,7 @@ package com.smartfridge.controller;
 import com.smartfridge.model.CuisineType;
 import com.smartfridge.model.MissingIngredientsResponse;
 import com.smartfridge.model.RecipeDetails;
+import com.smartfridge.model.RecipeImport;
 import com.smartfridge.model.RecipeRequest;
 import com.smartfridge.model.RecipeResponse;
 import com.smartfridge.model.RecipeSimple;
@@ -12,12 +13,17 @@ import com.smartfridge.service.IngredientResolver;
 import com.smartfridge.service.IngredientSubstitutionService;
 import com.smartfridge.service.VectorSearchService;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.http.HttpStatus;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
 
+import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
+import java.util.Set;
 import java.util.stream.Collectors;
 
 @RestController
@@ -25,6 +31,10 @@ import java.util.stream.Collectors;
 @CrossOrigin(origins = "*") // Allow frontend to call API
 public class RecipeController {
 
+    private static final int MAX_BATCH_DETAILS = 200;
+    private static final int MAX_BATCH_RECIPES = 100;
+    private static final int MAX_PAGE_SIZE = 200;
+
     @Autowired
     private RecipeService recipeService;
 
@@ -70,6 +80,24 @@ public class RecipeController {
         return ResponseEntity.ok(new RecipeResponse(cookableRecipes));
     }
 
+    /**
+     * Recipe graph and alias table for client-side cookability
+     * 
+     * GET /api/cookability/snapshot
+     * 
+     * Response:
+     * {
+     * "recipes": {"pancakes": ["flour", "milk", "egg"], ...},
+     * "aliases": {"roma tomato": "tomato", "tomato": "tomato", ...}
+     * }
+     * Recipe ingredients exclude seasonings and are already canonical; alias
+     * keys are lower-case.
+     */
+    @GetMapping("/cookability/snapshot")
+    public ResponseEntity<?> getCookabilitySnapshot() {
+        return ResponseEntity.ok(recipeService.getCookabilitySnapshot());
+    }
+
     /**
      * Validate request input
      */
@@ -182,6 +210,35 @@ public class RecipeController {
         return ResponseEntity.ok(details);
     }
 
+    /**
+     * Get detailed recipe information for several recipes in one round trip
+     * 
+     * POST /api/recipes/details
+     * Request body: { "names": ["pancakes", "omelette", ...] }
+     * 
+     * Response: { "recipes": { "pancakes": {...}, ... } } (unknown names are
+     * omitted)
+     */
+    @PostMapping("/recipes/details")
+    public ResponseEntity<?> getRecipeDetailsBatch(@RequestBody Map<String, List<String>> request) {
+        List<String> names = request.get("names");
+        if (names == null) {
+            return ResponseEntity.badRequest().body(Map.of("error", "names list is required"));
+        }
+        if (names.size() > MAX_BATCH_DETAILS) {
+            return ResponseEntity.badRequest()
+                    .body(Map.of("error", "At most " + MAX_BATCH_DETAILS + " names per request"));
+        }
+
+        List<String> trimmed = names.stream()
+                .filter(n -> n != null && !n.trim().isEmpty())
+                .map(String::trim)
+                .collect(Collectors.toList());
+
+        Map<String, RecipeDetails> details = recipeService.getRecipeDetailsBatch(trimmed);
+        return ResponseEntity.ok(Map.of("recipes", details));
+    }
+
     /**
      * Get all recipes grouped by cuisine type
      * 
@@ -200,6 +257,57 @@ public class RecipeController {
         return ResponseEntity.ok(recipesByCuisine);
     }
 
+    /**
+     * Get one page of recipes, ordered by name
+     * 
+     * GET /api/recipes/page?cuisine=ITALIAN&after=lasagna&limit=50
+     * (cuisine and after are optional; pass the previous nextCursor as after)
+     * 
+     * Response:
+     * {
+     * "recipes": [{"name": "pizza", "ingredients": [...], "seasonings": [...]}, ...],
+     * "nextCursor": "risotto" (null on the last page)
+     * }
+     */
+    @GetMapping("/recipes/page")
+    public ResponseEntity<?> getRecipesPage(
+            @RequestParam(required = false) String cuisine,
+            @RequestParam(required = false) String after,
+            @RequestParam(defaultValue = "50") int limit) {
+        if (limit < 1 || limit > MAX_PAGE_SIZE) {
+            return ResponseEntity.badRequest()
+                    .body(Map.of("error", "limit must be between 1 and " + MAX_PAGE_SIZE));
+        }
+        String cuisineType = cuisine != null && !cuisine.trim().isEmpty() ? cuisine.trim().toUpperCase() : null;
+
+        // Fetch one extra row to learn whether another page follows
+        List<RecipeSimple> recipes = recipeService.getRecipesPage(cuisineType, after, limit + 1);
+        String nextCursor = null;
+        if (recipes.size() > limit) {
+            recipes = recipes.subList(0, limit);
+            nextCursor = recipes.get(limit - 1).getName();
+        }
+
+        // Map.of() rejects the null nextCursor of the last page
+        Map<String, Object> response = new LinkedHashMap<>();
+        response.put("recipes", recipes);
+        response.put("nextCursor", nextCursor);
+        return ResponseEntity.ok(response);
+    }
+
+    /**
+     * Get the number of recipes per cuisine type (cheap alternative to GET
+     * /api/recipes for counts)
+     * 
+     * GET /api/recipes/counts
+     * 
+     * Response: { "AMERICAN": 12, "ITALIAN": 30, ... }
+     */
+    @GetMapping("/recipes/counts")
+    public ResponseEntity<?> getRecipeCounts() {
+        return ResponseEntity.ok(recipeService.countRecipesByCuisine());
+    }
+
     /**
      * Add a new recipe
      * 
@@ -250,6 +358,72 @@ public class RecipeController {
         }
     }
 
+    /**
+     * Add many recipes in one transaction (used by bulk import)
+     * 
+     * POST /api/recipes/batch
+     * Request body: { "recipes": [ { "name": "...", "ingredients": [...],
+     * "seasonings": [...], "cuisineType": "...", "instructions": "..." }, ... ] }
+     * 
+     * Response: { "saved": [...], "skipped": [...already existing or repeated],
+     * "failed": { "name": "error", ... } }
+     */
+    @PostMapping("/recipes/batch")
+    public ResponseEntity<?> addRecipesBatch(@RequestBody Map<String, List<RecipeImport>> request) {
+        List<RecipeImport> recipes = request.get("recipes");
+        if (recipes == null) {
+            return ResponseEntity.badRequest().body(Map.of("error", "recipes list is required"));
+        }
+        if (recipes.size() > MAX_BATCH_RECIPES) {
+            return ResponseEntity.badRequest()
+                    .body(Map.of("error", "At most " + MAX_BATCH_RECIPES + " recipes per request"));
+        }
+
+        // Same validation as POST /recipes; invalid entries fail individually
+        List<RecipeImport> valid = new ArrayList<>();
+        Map<String, String> failed = new LinkedHashMap<>();
+        for (int i = 0; i < recipes.size(); i++) {
+            RecipeImport recipe = recipes.get(i);
+            String name = recipe == null ? null : recipe.getName();
+            if (name == null || name.trim().isEmpty()) {
+                failed.put("#" + i, "Recipe name is required");
+            } else if (recipe.getIngredients() == null || recipe.getIngredients().isEmpty()) {
+                failed.put(name.trim(), "Ingredients list is required");
+            } else {
+                recipe.setName(name.trim());
+                valid.add(recipe);
+            }
+        }
+
+        List<String> saved;
+        try {
+            saved = recipeService.addRecipesBatch(valid);
+        } catch (Exception e) {
+            return ResponseEntity.internalServerError()
+                    .body(Map.of("error", "Failed to add recipes: " + e.getMessage()));
+        }
+
+        // Everything not saved (existing names and repeats within the batch) is skipped
+        Set<String> savedSet = new HashSet<>(saved);
+        List<String> skipped = new ArrayList<>();
+        for (RecipeImport recipe : valid) {
+            if (!savedSet.remove(recipe.getName())) {
+                skipped.add(recipe.getName());
+            }
+        }
+
+        // Index the new recipes for semantic search
+        for (String name : saved) {
+            try {
+                vectorSearchService.indexRecipe(name);
+            } catch (Exception e) {
+                System.err.println("Warning: Failed to index recipe for semantic search: " + e.getMessage());
+            }
+        }
+
+        return ResponseEntity.ok(Map.of("saved", saved, "skipped", skipped, "failed", failed));
+    }
+
     /**
      * Delete a recipe
      * 
@@ -297,11 +471,20 @@ public class RecipeController {
      * Get current fridge supplies with quantities and sort order
      * 
      * GET /api/fridge
+     * Supports conditional requests: send the last ETag in If-None-Match to get
+     * 304 Not Modified when nothing changed.
      */
     @GetMapping("/fridge")
-    public ResponseEntity<?> getFridgeSupplies() {
+    public ResponseEntity<?> getFridgeSupplies(
+            @RequestHeader(value = "If-None-Match", required = false) String ifNoneMatch) {
+        // Read the ETag before the data so the body is never older than its ETag
+        String etag = recipeService.getFridgeETag();
+        if (etag.equals(ifNoneMatch)) {
+            return ResponseEntity.status(HttpStatus.NOT_MODIFIED).eTag(etag).build();
+        }
+
         List<Map<String, Object>> supplies = recipeService.getFridgeSuppliesWithDetails();
-        return ResponseEntity.ok(Map.of("supplies", supplies));
+        return ResponseEntity.ok().eTag(etag).body(Map.of("supplies", supplies));
     }
 
     /**
@@ -316,24 +499,86 @@ public class RecipeController {
         if (items == null || items.isEmpty()) {
             return ResponseEntity.badRequest().body(Map.of("error", "items list is required"));
         }
-        recipeService.updateFridgeSuppliesOrder(items);
-        return ResponseEntity.ok(Map.of("message", "Order updated successfully"));
+        long version = recipeService.updateFridgeSuppliesOrder(items);
+        return ResponseEntity.ok(Map.of("message", "Order updated successfully",
+                "etag", recipeService.fridgeETag(version),
+                "previousEtag", recipeService.fridgeETag(version - 1)));
     }
 
     /**
      * Update fridge supplies
      * 
      * PUT /api/fridge
-     * Request body: { "supplies": ["bread", "ham", "cheese"] }
+     * Request body: { "supplies": ["bread", "ham", "cheese"] } replaces all
+     * supplies, or { "counts": { "bread": 2, "ham": 1 } } updates several item
+     * counts in one transaction and reports failures per item.
      */
     @PutMapping("/fridge")
-    public ResponseEntity<?> updateFridgeSupplies(@RequestBody Map<String, List<String>> request) {
-        List<String> supplies = request.get("supplies");
-        if (supplies == null) {
-            return ResponseEntity.badRequest().body(Map.of("error", "supplies list is required"));
+    public ResponseEntity<?> updateFridgeSupplies(@RequestBody Map<String, Object> request) {
+        Object countsObj = request.get("counts");
+        if (countsObj instanceof Map) {
+            @SuppressWarnings("unchecked")
+            Map<String, Object> counts = (Map<String, Object>) countsObj;
+            return updateFridgeItemCounts(counts);
+        }
+
+        Object suppliesObj = request.get("supplies");
+        if (!(suppliesObj instanceof List)) {
+            return ResponseEntity.badRequest().body(Map.of("error", "supplies list or counts map is required"));
+        }
+        @SuppressWarnings("unchecked")
+        List<String> supplies = (List<String>) suppliesObj;
+        long version = recipeService.updateFridgeSupplies(supplies);
+        return ResponseEntity.ok(Map.of("message", "Fridge updated successfully", "supplies", supplies,
+                "etag", recipeService.fridgeETag(version),
+                "previousEtag", recipeService.fridgeETag(version - 1)));
+    }
+
+    /**
+     * Apply a bulk count update, validating each item separately
+     */
+    private ResponseEntity<?> updateFridgeItemCounts(Map<String, Object> counts) {
+        Map<String, Integer> valid = new LinkedHashMap<>();
+        Map<String, String> failed = new LinkedHashMap<>();
+
+        for (Map.Entry<String, Object> entry : counts.entrySet()) {
+            String item = entry.getKey() != null ? entry.getKey().trim() : "";
+            Object countObj = entry.getValue();
+            if (item.isEmpty()) {
+                failed.put(String.valueOf(entry.getKey()), "Item name is required");
+            } else if (!(countObj instanceof Number) || ((Number) countObj).intValue() < 1) {
+                failed.put(item, "Count must be at least 1");
+            } else {
+                valid.put(item, ((Number) countObj).intValue());
+            }
         }
-        recipeService.updateFridgeSupplies(supplies);
-        return ResponseEntity.ok(Map.of("message", "Fridge updated successfully", "supplies", supplies));
+
+        String etag;
+        String previousEtag;
+        if (valid.isEmpty()) {
+            etag = previousEtag = recipeService.getFridgeETag();
+        } else {
+            Map<String, Object> result = recipeService.updateFridgeItemCounts(valid);
+            @SuppressWarnings("unchecked")
+            Set<String> notFound = (Set<String>) result.get("notFound");
+            for (String item : notFound) {
+                valid.remove(item);
+                failed.put(item, "Item not in fridge");
+            }
+            Long version = (Long) result.get("version");
+            if (version != null) {
+                etag = recipeService.fridgeETag(version);
+                previousEtag = recipeService.fridgeETag(version - 1);
+            } else {
+                etag = previousEtag = recipeService.getFridgeETag();
+            }
+        }
+
+        return ResponseEntity.ok(Map.of(
+                "updated", new ArrayList<>(valid.keySet()),
+                "failed", failed,
+                "etag", etag,
+                "previousEtag", previousEtag));
     }
 
     /**
@@ -350,8 +595,10 @@ public class RecipeController {
         if (count < 1) {
             return ResponseEntity.badRequest().body(Map.of("error", "Count must be at least 1"));
         }
-        recipeService.addToFridge(item.trim(), count);
-        return ResponseEntity.ok(Map.of("message", "Added " + count + " " + item + " to fridge"));
+        long version = recipeService.addToFridge(item.trim(), count);
+        return ResponseEntity.ok(Map.of("message", "Added " + count + " " + item + " to fridge",
+                "etag", recipeService.fridgeETag(version),
+                "previousEtag", recipeService.fridgeETag(version - 1)));
     }
 
     /**
@@ -370,8 +617,10 @@ public class RecipeController {
         if (count == null || count < 1) {
             return ResponseEntity.badRequest().body(Map.of("error", "Count must be at least 1"));
         }
-        recipeService.updateFridgeItemCount(item.trim(), count);
-        return ResponseEntity.ok(Map.of("message", "Updated " + item + " count to " + count));
+        long version = recipeService.updateFridgeItemCount(item.trim(), count);
+        return ResponseEntity.ok(Map.of("message", "Updated " + item + " count to " + count,
+                "etag", recipeService.fridgeETag(version),
+                "previousEtag", recipeService.fridgeETag(version - 1)));
     }
 
     /**
@@ -384,8 +633,10 @@ public class RecipeController {
         if (item == null || item.trim().isEmpty()) {
             return ResponseEntity.badRequest().body(Map.of("error", "Item name is required"));
         }
-        recipeService.removeFromFridge(item.trim());
-        return ResponseEntity.ok(Map.of("message", "Removed " + item + " from fridge"));
+        long version = recipeService.removeFromFridge(item.trim());
+        return ResponseEntity.ok(Map.of("message", "Removed " + item + " from fridge",
+                "etag", recipeService.fridgeETag(version),
+                "previousEtag", recipeService.fridgeETag(version - 1)));
     }
 
     // ==================== Ingredient Alias Endpoints ====================
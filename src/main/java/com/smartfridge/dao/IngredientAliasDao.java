@@ -106,6 +106,35 @@ public class IngredientAliasDao {
         }
     }
 
+    /**
+     * Get the whole alias table as lower-case name -> canonical name, with the
+     * same precedence as resolveToCanonical: a canonical name resolves to
+     * itself, otherwise the highest-confidence alias wins.
+     */
+    public Map<String, String> getResolutionMap() {
+        Map<String, String> resolution = new HashMap<>();
+        String sql = "SELECT canonical_name, alias FROM ingredient_aliases ORDER BY confidence ASC";
+
+        try (Connection conn = dataSource.getConnection();
+                Statement stmt = conn.createStatement();
+                ResultSet rs = stmt.executeQuery(sql)) {
+            Set<String> canonicalNames = new HashSet<>();
+            while (rs.next()) {
+                String canonical = rs.getString("canonical_name");
+                // Ascending confidence: later (more confident) rows overwrite earlier ones
+                resolution.put(rs.getString("alias").toLowerCase(), canonical);
+                canonicalNames.add(canonical);
+            }
+            for (String canonical : canonicalNames) {
+                resolution.put(canonical.toLowerCase(), canonical);
+            }
+        } catch (SQLException e) {
+            System.err.println("Error loading alias table: " + e.getMessage());
+        }
+
+        return resolution;
+    }
+
     /**
      * Get all canonical names in the system
      */
@@ -2,6 +2,7 @@ package com.smartfridge.dao;
 
 import com.smartfridge.model.CuisineType;
 import com.smartfridge.model.RecipeDetails;
+import com.smartfridge.model.RecipeImport;
 import com.smartfridge.model.RecipeSimple;
 import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.stereotype.Repository;
@@ -16,6 +17,8 @@ import java.util.*;
 @Repository
 public class RecipeDao {
 
+    private static final int BATCH_QUERY_CHUNK_SIZE = 500;
+
     @Autowired
     private DataSource dataSource;
 
@@ -89,6 +92,70 @@ public class RecipeDao {
         return null;
     }
 
+    /**
+     * Get recipe details for several recipes in one query.
+     * Names that don't exist are omitted; result preserves request order.
+     */
+    public Map<String, RecipeDetails> getRecipeDetailsBatch(List<String> recipeNames) {
+        Map<String, RecipeDetails> result = new LinkedHashMap<>();
+        if (recipeNames == null || recipeNames.isEmpty()) {
+            return result;
+        }
+
+        List<String> uniqueNames = new ArrayList<>(new LinkedHashSet<>(recipeNames));
+        Map<String, String[]> detailsByName = new HashMap<>();
+        Map<String, List<String>> ingredientsByName = new HashMap<>();
+
+        try (Connection conn = dataSource.getConnection()) {
+            // Chunk to stay well under SQLite's bound-parameter limit
+            for (int from = 0; from < uniqueNames.size(); from += BATCH_QUERY_CHUNK_SIZE) {
+                List<String> chunk = uniqueNames.subList(from,
+                        Math.min(from + BATCH_QUERY_CHUNK_SIZE, uniqueNames.size()));
+                String placeholders = String.join(", ", Collections.nCopies(chunk.size(), "?"));
+                String sql = """
+                        SELECT rd.recipe_name, rd.cuisine_type, rd.instructions, rd.image_url,
+                               dep.ingredient_name
+                        FROM recipe_details rd
+                        LEFT JOIN recipe_dependencies dep ON rd.recipe_name = dep.recipe_name
+                        WHERE rd.recipe_name IN (%s)
+                        """.formatted(placeholders);
+
+                try (PreparedStatement pstmt = conn.prepareStatement(sql)) {
+                    for (int i = 0; i < chunk.size(); i++) {
+                        pstmt.setString(i + 1, chunk.get(i));
+                    }
+
+                    try (ResultSet rs = pstmt.executeQuery()) {
+                        while (rs.next()) {
+                            String recipeName = rs.getString("recipe_name");
+                            if (!detailsByName.containsKey(recipeName)) {
+                                detailsByName.put(recipeName, new String[] { rs.getString("cuisine_type"),
+                                        rs.getString("instructions"), rs.getString("image_url") });
+                            }
+                            String ingredient = rs.getString("ingredient_name");
+                            if (ingredient != null) {
+                                ingredientsByName.computeIfAbsent(recipeName, k -> new ArrayList<>()).add(ingredient);
+                            }
+                        }
+                    }
+                }
+            }
+        } catch (SQLException e) {
+            throw new RuntimeException("Failed to get recipe details batch", e);
+        }
+
+        for (String recipeName : uniqueNames) {
+            String[] details = detailsByName.get(recipeName);
+            List<String> ingredients = ingredientsByName.get(recipeName);
+            // Same rule as getRecipeDetails: a recipe without ingredients is not returned
+            if (details != null && ingredients != null && !ingredients.isEmpty()) {
+                result.put(recipeName, new RecipeDetails(recipeName, ingredients,
+                        parseCuisineType(details[0]), details[1], details[2]));
+            }
+        }
+        return result;
+    }
+
     /**
      * Get only non-seasoning ingredients for a recipe
      */
@@ -246,6 +313,103 @@ public class RecipeDao {
         }
     }
 
+    /**
+     * Of the given names, return those that already exist as recipes
+     */
+    public Set<String> findExistingRecipeNames(Collection<String> recipeNames) {
+        Set<String> existing = new HashSet<>();
+        if (recipeNames == null || recipeNames.isEmpty()) {
+            return existing;
+        }
+
+        List<String> uniqueNames = new ArrayList<>(new LinkedHashSet<>(recipeNames));
+        try (Connection conn = dataSource.getConnection()) {
+            for (int from = 0; from < uniqueNames.size(); from += BATCH_QUERY_CHUNK_SIZE) {
+                List<String> chunk = uniqueNames.subList(from,
+                        Math.min(from + BATCH_QUERY_CHUNK_SIZE, uniqueNames.size()));
+                String placeholders = String.join(", ", Collections.nCopies(chunk.size(), "?"));
+                String sql = "SELECT DISTINCT recipe_name FROM recipe_dependencies WHERE recipe_name IN (%s)"
+                        .formatted(placeholders);
+
+                try (PreparedStatement pstmt = conn.prepareStatement(sql)) {
+                    for (int i = 0; i < chunk.size(); i++) {
+                        pstmt.setString(i + 1, chunk.get(i));
+                    }
+                    try (ResultSet rs = pstmt.executeQuery()) {
+                        while (rs.next()) {
+                            existing.add(rs.getString("recipe_name"));
+                        }
+                    }
+                }
+            }
+        } catch (SQLException e) {
+            throw new RuntimeException("Failed to look up existing recipes", e);
+        }
+        return existing;
+    }
+
+    /**
+     * Save many recipes (with separate seasonings) in one transaction, reusing
+     * the same batched statements for all of them
+     */
+    public void saveRecipesBatch(List<RecipeImport> recipes) {
+        if (recipes == null || recipes.isEmpty()) {
+            return;
+        }
+
+        try (Connection conn = dataSource.getConnection()) {
+            conn.setAutoCommit(false);
+
+            try (PreparedStatement insertFood = conn.prepareStatement(
+                    "INSERT OR IGNORE INTO food_items (name) VALUES (?)");
+                    PreparedStatement insertDep = conn.prepareStatement(
+                            "INSERT OR IGNORE INTO recipe_dependencies (recipe_name, ingredient_name, is_seasoning) VALUES (?, ?, ?)");
+                    PreparedStatement insertDetails = conn.prepareStatement(
+                            "INSERT OR REPLACE INTO recipe_details (recipe_name, cuisine_type, instructions, image_url) VALUES (?, ?, ?, ?)")) {
+
+                for (RecipeImport recipe : recipes) {
+                    List<String> seasonings = recipe.getSeasonings() != null ? recipe.getSeasonings()
+                            : Collections.emptyList();
+
+                    insertFood.setString(1, recipe.getName());
+                    insertFood.addBatch();
+                    for (String ingredient : recipe.getIngredients()) {
+                        insertFood.setString(1, ingredient);
+                        insertFood.addBatch();
+                        insertDep.setString(1, recipe.getName());
+                        insertDep.setString(2, ingredient);
+                        insertDep.setInt(3, 0);
+                        insertDep.addBatch();
+                    }
+                    for (String seasoning : seasonings) {
+                        insertFood.setString(1, seasoning);
+                        insertFood.addBatch();
+                        insertDep.setString(1, recipe.getName());
+                        insertDep.setString(2, seasoning);
+                        insertDep.setInt(3, 1);
+                        insertDep.addBatch();
+                    }
+
+                    insertDetails.setString(1, recipe.getName());
+                    insertDetails.setString(2, recipe.getCuisineType() != null ? recipe.getCuisineType() : "OTHER");
+                    insertDetails.setString(3, recipe.getInstructions());
+                    insertDetails.setString(4, recipe.getImageUrl());
+                    insertDetails.addBatch();
+                }
+
+                insertFood.executeBatch();
+                insertDep.executeBatch();
+                insertDetails.executeBatch();
+                conn.commit();
+            } catch (SQLException e) {
+                conn.rollback();
+                throw e;
+            }
+        } catch (SQLException e) {
+            throw new RuntimeException("Failed to save recipe batch of " + recipes.size(), e);
+        }
+    }
+
     /**
      * Delete a recipe
      */
@@ -276,6 +440,107 @@ public class RecipeDao {
         }
     }
 
+    /**
+     * Get one page of recipes ordered by name (keyset pagination).
+     * Like getAllRecipesByCuisine, recipes without main ingredients are
+     * skipped.
+     *
+     * @param cuisineType only this cuisine, or null for all
+     * @param after       return names strictly after this one, or null to start
+     * @param limit       maximum number of recipes
+     */
+    public List<RecipeSimple> getRecipesPage(String cuisineType, String after, int limit) {
+        // Separate statements so the cuisine filter can use idx_recipe_details_cuisine
+        String sql = """
+                SELECT rd.recipe_name
+                FROM recipe_details rd
+                WHERE %s rd.recipe_name > ?
+                  AND EXISTS (SELECT 1 FROM recipe_dependencies dep
+                              WHERE dep.recipe_name = rd.recipe_name AND dep.is_seasoning = 0)
+                ORDER BY rd.recipe_name
+                LIMIT ?
+                """.formatted(cuisineType != null ? "rd.cuisine_type = ? AND" : "");
+
+        List<String> names = new ArrayList<>();
+        Map<String, List<String>> ingredientsByName = new HashMap<>();
+        Map<String, List<String>> seasoningsByName = new HashMap<>();
+
+        try (Connection conn = dataSource.getConnection()) {
+            try (PreparedStatement pstmt = conn.prepareStatement(sql)) {
+                int index = 1;
+                if (cuisineType != null) {
+                    pstmt.setString(index++, cuisineType);
+                }
+                pstmt.setString(index++, after != null ? after : "");
+                pstmt.setInt(index, limit);
+                try (ResultSet rs = pstmt.executeQuery()) {
+                    while (rs.next()) {
+                        names.add(rs.getString("recipe_name"));
+                    }
+                }
+            }
+            if (names.isEmpty()) {
+                return new ArrayList<>();
+            }
+
+            String placeholders = String.join(", ", Collections.nCopies(names.size(), "?"));
+            String depSql = """
+                    SELECT recipe_name, ingredient_name, is_seasoning
+                    FROM recipe_dependencies
+                    WHERE recipe_name IN (%s)
+                    """.formatted(placeholders);
+            try (PreparedStatement pstmt = conn.prepareStatement(depSql)) {
+                for (int i = 0; i < names.size(); i++) {
+                    pstmt.setString(i + 1, names.get(i));
+                }
+                try (ResultSet rs = pstmt.executeQuery()) {
+                    while (rs.next()) {
+                        Map<String, List<String>> target = rs.getInt("is_seasoning") == 1 ? seasoningsByName
+                                : ingredientsByName;
+                        target.computeIfAbsent(rs.getString("recipe_name"), k -> new ArrayList<>())
+                                .add(rs.getString("ingredient_name"));
+                    }
+                }
+            }
+        } catch (SQLException e) {
+            throw new RuntimeException("Failed to get recipe page", e);
+        }
+
+        List<RecipeSimple> page = new ArrayList<>(names.size());
+        for (String recipeName : names) {
+            page.add(new RecipeSimple(recipeName, ingredientsByName.getOrDefault(recipeName, new ArrayList<>()),
+                    seasoningsByName.getOrDefault(recipeName, new ArrayList<>())));
+        }
+        return page;
+    }
+
+    /**
+     * Count recipes per cuisine type (same recipes getAllRecipesByCuisine lists)
+     */
+    public Map<String, Integer> countRecipesByCuisine() {
+        Map<String, Integer> counts = new LinkedHashMap<>();
+        String sql = """
+                SELECT rd.cuisine_type, COUNT(*) AS recipe_count
+                FROM recipe_details rd
+                WHERE EXISTS (SELECT 1 FROM recipe_dependencies dep
+                              WHERE dep.recipe_name = rd.recipe_name AND dep.is_seasoning = 0)
+                GROUP BY rd.cuisine_type
+                ORDER BY rd.cuisine_type
+                """;
+
+        try (Connection conn = dataSource.getConnection();
+                Statement stmt = conn.createStatement();
+                ResultSet rs = stmt.executeQuery(sql)) {
+            while (rs.next()) {
+                String cuisineType = rs.getString("cuisine_type");
+                counts.merge(cuisineType != null ? cuisineType : "OTHER", rs.getInt("recipe_count"), Integer::sum);
+            }
+        } catch (SQLException e) {
+            throw new RuntimeException("Failed to count recipes by cuisine", e);
+        }
+        return counts;
+    }
+
     /**
      * Get all recipes grouped by cuisine type
      */
@@ -180,6 +180,47 @@ public class SupplyDao {
         }
     }
 
+    /**
+     * Update quantities for several supply items in one transaction
+     * 
+     * @return names of items that are not in the fridge (nothing was updated)
+     */
+    public Set<String> updateSupplyCounts(Map<String, Integer> counts) {
+        Set<String> notFound = new LinkedHashSet<>();
+        if (counts.isEmpty()) {
+            return notFound;
+        }
+
+        try (Connection conn = dataSource.getConnection()) {
+            conn.setAutoCommit(false);
+
+            try {
+                String sql = "UPDATE supplies SET quantity = ? WHERE name = ?";
+                List<String> items = new ArrayList<>(counts.keySet());
+                try (PreparedStatement pstmt = conn.prepareStatement(sql)) {
+                    for (String item : items) {
+                        pstmt.setInt(1, counts.get(item));
+                        pstmt.setString(2, item);
+                        pstmt.addBatch();
+                    }
+                    int[] results = pstmt.executeBatch();
+                    for (int i = 0; i < results.length; i++) {
+                        if (results[i] == 0) {
+                            notFound.add(items.get(i));
+                        }
+                    }
+                }
+                conn.commit();
+            } catch (SQLException e) {
+                conn.rollback();
+                throw e;
+            }
+        } catch (SQLException e) {
+            throw new RuntimeException("Failed to update supply counts", e);
+        }
+        return notFound;
+    }
+
     /**
      * Update sort order for supplies
      */
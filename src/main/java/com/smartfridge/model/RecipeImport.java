@@ -0,0 +1,85 @@
+package com.smartfridge.model;
+
+import java.util.List;
+
+/**
+ * One recipe in a POST /api/recipes/batch request
+ * Example:
+ * {
+ * "name": "pancakes",
+ * "ingredients": ["flour", "milk", "egg"],
+ * "seasonings": ["salt", "sugar"],
+ * "cuisineType": "AMERICAN",
+ * "instructions": "Mix\nFry"
+ * }
+ */
+public class RecipeImport {
+
+    private String name;
+    private List<String> ingredients;
+    private List<String> seasonings;
+    private String cuisineType;
+    private String instructions;
+    private String imageUrl;
+
+    public RecipeImport() {
+    }
+
+    public RecipeImport(String name, List<String> ingredients, List<String> seasonings, String cuisineType,
+            String instructions, String imageUrl) {
+        this.name = name;
+        this.ingredients = ingredients;
+        this.seasonings = seasonings;
+        this.cuisineType = cuisineType;
+        this.instructions = instructions;
+        this.imageUrl = imageUrl;
+    }
+
+    public String getName() {
+        return name;
+    }
+
+    public void setName(String name) {
+        this.name = name;
+    }
+
+    public List<String> getIngredients() {
+        return ingredients;
+    }
+
+    public void setIngredients(List<String> ingredients) {
+        this.ingredients = ingredients;
+    }
+
+    public List<String> getSeasonings() {
+        return seasonings;
+    }
+
+    public void setSeasonings(List<String> seasonings) {
+        this.seasonings = seasonings;
+    }
+
+    public String getCuisineType() {
+        return cuisineType;
+    }
+
+    public void setCuisineType(String cuisineType) {
+        this.cuisineType = cuisineType;
+    }
+
+    public String getInstructions() {
+        return instructions;
+    }
+
+    public void setInstructions(String instructions) {
+        this.instructions = instructions;
+    }
+
+    public String getImageUrl() {
+        return imageUrl;
+    }
+
+    public void setImageUrl(String imageUrl) {
+        this.imageUrl = imageUrl;
+    }
+}
@@ -46,6 +46,26 @@ public class IngredientResolver {
         return aliasDao.resolveToCanonical(ingredient.trim());
     }
 
+    /**
+     * The alias table as lower-case name -> canonical name, for resolving many
+     * names in memory (see resolveWith)
+     */
+    public Map<String, String> getResolutionMap() {
+        return aliasDao.getResolutionMap();
+    }
+
+    /**
+     * Resolve an ingredient against a map from getResolutionMap() - same result
+     * as resolve() without a database round trip per name
+     */
+    public static String resolveWith(Map<String, String> resolution, String ingredient) {
+        if (ingredient == null || ingredient.trim().isEmpty()) {
+            return ingredient;
+        }
+        String trimmed = ingredient.trim();
+        return resolution.getOrDefault(trimmed.toLowerCase(), trimmed);
+    }
+
     /**
      * Resolve multiple ingredients to their canonical forms.
      */
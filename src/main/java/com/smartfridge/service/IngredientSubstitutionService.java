@@ -12,6 +12,7 @@ import org.springframework.http.HttpHeaders;
 import org.springframework.http.MediaType;
 import org.springframework.http.ResponseEntity;
 import org.springframework.stereotype.Service;
+import org.springframework.web.client.HttpStatusCodeException;
 import org.springframework.web.client.RestTemplate;
 
 import java.util.*;
@@ -105,7 +106,20 @@ public class IngredientSubstitutionService {
         RecipeDetails recipe = recipeDao.getRecipeDetails(recipeName);
         Set<String> fridgeSupplies = supplyDao.getSupplies();
 
-        // Map to store substitutions for each missing ingredient
+        // One AI call for all missing ingredients
+        Map<String, List<SubstitutionSuggestion>> batchSubstitutions = requestBatchSubstitutionsFromAI(
+                recipeName,
+                missingIngredients,
+                recipe.getCuisineType().name(),
+                recipe.getIngredients(),
+                fridgeSupplies);
+        if (batchSubstitutions != null) {
+            return batchSubstitutions;
+        }
+
+        // Fall back to one request per ingredient only for an older AI service
+        // without the batch endpoint
+        System.out.println("[DEBUG] Batch substitution endpoint not available, falling back to per-ingredient requests");
         Map<String, List<SubstitutionSuggestion>> allSubstitutions = new LinkedHashMap<>();
 
         // Request substitutions from AI service for each missing ingredient
@@ -181,6 +195,85 @@ public class IngredientSubstitutionService {
         return Collections.emptyList();
     }
 
+    /**
+     * Request substitution suggestions for all missing ingredients from the
+     * Python AI service in a single call
+     * 
+     * @return suggestions per missing ingredient (empty lists if the call
+     *         failed), or null if the AI service has no batch endpoint
+     */
+    private Map<String, List<SubstitutionSuggestion>> requestBatchSubstitutionsFromAI(
+            String recipeName,
+            List<String> missingIngredients,
+            String cuisineType,
+            List<String> recipeIngredients,
+            Set<String> fridgeSupplies) {
+
+        try {
+            Map<String, Object> requestBody = new HashMap<>();
+            requestBody.put("recipeName", recipeName);
+            requestBody.put("missingIngredients", missingIngredients);
+            requestBody.put("cuisine", cuisineType);
+            requestBody.put("recipeIngredients", recipeIngredients);
+            requestBody.put("fridgeSupplies", new ArrayList<>(fridgeSupplies));
+
+            HttpHeaders headers = new HttpHeaders();
+            headers.setContentType(MediaType.APPLICATION_JSON);
+            HttpEntity<Map<String, Object>> request = new HttpEntity<>(requestBody, headers);
+
+            String url = aiServiceUrl + "/ai/substitutions/batch";
+            System.out.println("[DEBUG] Sending POST request to: " + url);
+
+            @SuppressWarnings("rawtypes")
+            ResponseEntity<Map> response = restTemplate.postForEntity(url, request, Map.class);
+
+            if (!response.getStatusCode().is2xxSuccessful() || response.getBody() == null) {
+                System.err.println("[ERROR] AI service batch call returned status: " + response.getStatusCode());
+                return emptySubstitutions(missingIngredients);
+            }
+
+            Object substitutionsObj = response.getBody().get("substitutions");
+            if (!(substitutionsObj instanceof Map)) {
+                System.err.println("[ERROR] AI service batch call returned no substitutions map");
+                return emptySubstitutions(missingIngredients);
+            }
+            @SuppressWarnings("unchecked")
+            Map<String, Object> substitutions = (Map<String, Object>) substitutionsObj;
+
+            Map<String, List<SubstitutionSuggestion>> result = new LinkedHashMap<>();
+            for (String missingIngredient : missingIngredients) {
+                Map<String, Object> perIngredient = new HashMap<>();
+                perIngredient.put("substitutes", substitutions.get(missingIngredient));
+                result.put(missingIngredient,
+                        parseSubstitutionsResponse(perIngredient, missingIngredient, fridgeSupplies));
+            }
+            return result;
+        } catch (HttpStatusCodeException e) {
+            int status = e.getStatusCode().value();
+            if (status == 404 || status == 405) {
+                return null;
+            }
+            // Overloaded or rate-limited: per-ingredient calls would only add load
+            System.err.println("[ERROR] AI service batch call returned status: " + status);
+            return emptySubstitutions(missingIngredients);
+        } catch (Exception e) {
+            System.err.println("[ERROR] Error calling AI service batch endpoint at " + aiServiceUrl + ": "
+                    + e.getMessage());
+            return emptySubstitutions(missingIngredients);
+        }
+    }
+
+    /**
+     * No suggestions for any of the missing ingredients
+     */
+    private Map<String, List<SubstitutionSuggestion>> emptySubstitutions(List<String> missingIngredients) {
+        Map<String, List<SubstitutionSuggestion>> result = new LinkedHashMap<>();
+        for (String missingIngredient : missingIngredients) {
+            result.put(missingIngredient, Collections.emptyList());
+        }
+        return result;
+    }
+
     /**
      * Parse AI service response into SubstitutionSuggestion objects
      */
@@ -3,11 +3,13 @@ package com.smartfridge.service;
 import com.smartfridge.dao.RecipeDao;
 import com.smartfridge.dao.SupplyDao;
 import com.smartfridge.model.RecipeDetails;
+import com.smartfridge.model.RecipeImport;
 import com.smartfridge.model.RecipeSimple;
 import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.stereotype.Service;
 
 import java.util.*;
+import java.util.concurrent.atomic.AtomicLong;
 
 @Service
 public class RecipeService {
@@ -21,6 +23,11 @@ public class RecipeService {
     @Autowired
     private IngredientResolver ingredientResolver;
 
+    // Fridge version for conditional GETs. The epoch keeps ETags from a previous
+    // run from matching after a restart, since the counter starts over.
+    private final long fridgeEpoch = System.currentTimeMillis();
+    private final AtomicLong fridgeVersion = new AtomicLong();
+
     /**
      * Find all cookable recipes using Kahn's algorithm (topological sorting)
      */
@@ -95,6 +102,29 @@ public class RecipeService {
         return kahnAlgorithm(graph, inDegree, suppliesList);
     }
 
+    /**
+     * Everything a client needs to compute cookability itself: each recipe's
+     * main ingredients (already resolved to canonical names) and the alias
+     * table for resolving fridge items the same way findCookableRecipesFromFridge
+     * does.
+     */
+    public Map<String, Object> getCookabilitySnapshot() {
+        Map<String, String> resolution = ingredientResolver.getResolutionMap();
+        Map<String, List<String>> recipes = new LinkedHashMap<>();
+        for (Map.Entry<String, List<String>> entry : recipeDao.loadRecipeGraph().entrySet()) {
+            Set<String> resolved = new LinkedHashSet<>();
+            for (String ingredient : entry.getValue()) {
+                resolved.add(IngredientResolver.resolveWith(resolution, ingredient));
+            }
+            recipes.put(entry.getKey(), new ArrayList<>(resolved));
+        }
+
+        Map<String, Object> snapshot = new LinkedHashMap<>();
+        snapshot.put("recipes", recipes);
+        snapshot.put("aliases", resolution);
+        return snapshot;
+    }
+
     /**
      * Kahn's algorithm for topological sorting
      */
@@ -136,6 +166,13 @@ public class RecipeService {
         return recipeDao.getRecipeDetails(recipeName);
     }
 
+    /**
+     * Get detailed recipe information for several recipes at once
+     */
+    public Map<String, RecipeDetails> getRecipeDetailsBatch(List<String> recipeNames) {
+        return recipeDao.getRecipeDetailsBatch(recipeNames);
+    }
+
     /**
      * Get all recipes grouped by cuisine type
      */
@@ -143,6 +180,42 @@ public class RecipeService {
         return recipeDao.getAllRecipesByCuisine();
     }
 
+    /**
+     * Get one page of recipes (optionally of one cuisine) after the given name
+     */
+    public List<RecipeSimple> getRecipesPage(String cuisineType, String after, int limit) {
+        return recipeDao.getRecipesPage(cuisineType, after, limit);
+    }
+
+    /**
+     * Get the number of recipes per cuisine type
+     */
+    public Map<String, Integer> countRecipesByCuisine() {
+        return recipeDao.countRecipesByCuisine();
+    }
+
+    /**
+     * Get the ETag describing the current fridge version
+     */
+    public String getFridgeETag() {
+        return fridgeETag(fridgeVersion.get());
+    }
+
+    /**
+     * Build the ETag for a given fridge version
+     */
+    public String fridgeETag(long version) {
+        return "\"" + fridgeEpoch + "-" + version + "\"";
+    }
+
+    /**
+     * Bump the fridge version. Must run after the write it describes, so a
+     * client can never hold an ETag newer than the data it has seen.
+     */
+    private long markFridgeChanged() {
+        return fridgeVersion.incrementAndGet();
+    }
+
     /**
      * Get current fridge supplies with full details (quantity, sortOrder)
      */
@@ -166,44 +239,75 @@ public class RecipeService {
 
     /**
      * Update fridge supplies order
+     * 
+     * @return the new fridge version
      */
-    public void updateFridgeSuppliesOrder(List<String> orderedItems) {
+    public long updateFridgeSuppliesOrder(List<String> orderedItems) {
         supplyDao.updateSuppliesOrder(orderedItems);
+        return markFridgeChanged();
     }
 
     /**
      * Update fridge supplies (replace all)
+     * 
+     * @return the new fridge version
      */
-    public void updateFridgeSupplies(List<String> supplies) {
+    public long updateFridgeSupplies(List<String> supplies) {
         supplyDao.updateSupplies(supplies);
+        return markFridgeChanged();
     }
 
     /**
      * Add single item to fridge with quantity
+     * 
+     * @return the new fridge version
      */
-    public void addToFridge(String item, int count) {
+    public long addToFridge(String item, int count) {
         supplyDao.addSupply(item, count);
+        return markFridgeChanged();
     }
 
     /**
      * Add single item to fridge with default quantity
+     * 
+     * @return the new fridge version
      */
-    public void addToFridge(String item) {
-        supplyDao.addSupply(item, 1);
+    public long addToFridge(String item) {
+        return addToFridge(item, 1);
     }
 
     /**
      * Update item count in fridge
+     * 
+     * @return the new fridge version
      */
-    public void updateFridgeItemCount(String item, int count) {
+    public long updateFridgeItemCount(String item, int count) {
         supplyDao.updateSupplyCount(item, count);
+        return markFridgeChanged();
+    }
+
+    /**
+     * Update counts for several fridge items at once
+     * 
+     * @return map with "notFound" (items not in the fridge) and "version" (the
+     *         new fridge version, or null if nothing changed)
+     */
+    public Map<String, Object> updateFridgeItemCounts(Map<String, Integer> counts) {
+        Set<String> notFound = supplyDao.updateSupplyCounts(counts);
+        Map<String, Object> result = new HashMap<>();
+        result.put("notFound", notFound);
+        result.put("version", notFound.size() < counts.size() ? markFridgeChanged() : null);
+        return result;
     }
 
     /**
      * Remove single item from fridge
+     * 
+     * @return the new fridge version
      */
-    public void removeFromFridge(String item) {
+    public long removeFromFridge(String item) {
         supplyDao.removeSupply(item);
+        return markFridgeChanged();
     }
 
     /**
@@ -222,6 +326,28 @@ public class RecipeService {
         recipeDao.saveRecipeWithSeparateSeasonings(name, ingredients, seasonings, cuisineType, instructions, imageUrl);
     }
 
+    /**
+     * Add many recipes at once, skipping names that already exist (or repeat
+     * within the batch)
+     * 
+     * @return the names of the recipes that were saved, in request order
+     */
+    public List<String> addRecipesBatch(List<RecipeImport> recipes) {
+        Set<String> existing = recipeDao.findExistingRecipeNames(
+                recipes.stream().map(RecipeImport::getName).toList());
+
+        List<RecipeImport> toSave = new ArrayList<>();
+        Set<String> seen = new HashSet<>(existing);
+        for (RecipeImport recipe : recipes) {
+            if (seen.add(recipe.getName())) {
+                toSave.add(recipe);
+            }
+        }
+
+        recipeDao.saveRecipesBatch(toSave);
+        return toSave.stream().map(RecipeImport::getName).toList();
+    }
+
     /**
      * Delete a recipe
      */
@@ -38,6 +38,7 @@ CREATE TABLE IF NOT EXISTS supplies (
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_recipe_deps_recipe ON recipe_dependencies(recipe_name);
 CREATE INDEX IF NOT EXISTS idx_recipe_deps_ingredient ON recipe_dependencies(ingredient_name);
+CREATE INDEX IF NOT EXISTS idx_recipe_details_cuisine ON recipe_details(cuisine_type, recipe_name);
 
 -- Canonical ingredient names with AI-generated aliases
 -- Used for auto-mapping variants (e.g., "roma tomato" -> "tomato")